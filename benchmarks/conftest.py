@@ -0,0 +1,107 @@
+import os
+import time
+import tracemalloc
+
+import pytest
+
+from rhesis import config
+from rhesis.client import close_session, get_response_cache
+
+from .fake_api import FakeRhesisAPI, make_tests
+
+DEFAULT_SIZES = "1000,100000"
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--test-set-sizes",
+        default=DEFAULT_SIZES,
+        help=(
+            "Comma-separated numbers of tests for the test set benchmarks "
+            f"(default: {DEFAULT_SIZES}, add 1000000 for the large run)"
+        ),
+    )
+
+
+def pytest_generate_tests(metafunc):
+    if "size" in metafunc.fixturenames:
+        sizes = metafunc.config.getoption("--test-set-sizes")
+        values = [int(size) for size in sizes.split(",") if size]
+        metafunc.parametrize("size", values, ids=[f"{v:_}" for v in values])
+
+
+@pytest.fixture(scope="session")
+def api(tmp_path_factory):
+    """Fixture that points the SDK at an in-process fake Rhesis API"""
+    server = FakeRhesisAPI().start()
+    previous = {
+        name: os.environ.get(name) for name in ("RHESIS_API_KEY", "RHESIS_BASE_URL")
+    }
+    os.environ["RHESIS_API_KEY"] = "benchmark-key"
+    os.environ["RHESIS_BASE_URL"] = server.url
+    previous_cache_dir = config.cache_dir
+    config.cache_dir = str(tmp_path_factory.mktemp("cache"))
+    close_session()
+    yield server
+    close_session()
+    get_response_cache().clear()
+    config.cache_dir = previous_cache_dir
+    for name, value in previous.items():
+        if value is None:
+            os.environ.pop(name, None)
+        else:
+            os.environ[name] = value
+    server.stop()
+
+
+@pytest.fixture(scope="session")
+def test_sets(api):
+    """Fixture that creates test sets on the fake API, one per size"""
+    created = {}
+
+    def get(size):
+        if size not in created:
+            created[size] = (api.add_test_set(make_tests(size)), make_tests(size))
+        return created[size]
+
+    return get
+
+
+def rounds_for(size):
+    """Number of benchmark rounds that keeps each benchmark within seconds"""
+    return max(1, min(10, 100_000 // size))
+
+
+def traced_peak_mb(func, setup=None):
+    """Peak memory traced by tracemalloc during one call of func, in MB
+
+    setup is called first, untraced, and may return (args, kwargs) for func
+    like the setup of benchmark.pedantic.
+    """
+    prepared = setup() if setup is not None else None
+    args, kwargs = prepared if prepared is not None else ((), {})
+    tracemalloc.start()
+    try:
+        func(*args, **kwargs)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak / 1024**2
+
+
+def record_throughput(benchmark, items, unit="tests", func=None, setup=None):
+    """Add throughput and the traced memory peak to the saved benchmark results
+
+    If func is given, it is called once more (with setup) outside of the timed
+    rounds to measure its memory peak. Nothing is recorded if benchmarking is
+    disabled, e.g. with --benchmark-disable.
+    """
+    if benchmark.stats is None:
+        return
+    mean = benchmark.stats.stats.mean
+    benchmark.extra_info[f"{unit}_per_second"] = (
+        round(items / mean, 1) if mean else None
+    )
+    if func is not None:
+        benchmark.extra_info["peak_traced_mb"] = round(traced_peak_mb(func, setup), 1)
+    benchmark.extra_info["recorded_at"] = time.strftime("%Y-%m-%dT%H:%M:%S")
@@ -0,0 +1,247 @@
+"""In-process stand-in for the Rhesis API used by the benchmarks."""
+
+import csv
+import io
+import json
+import re
+import threading
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+BEHAVIORS = ["Reliability", "Compliance", "Robustness"]
+CATEGORIES = ["Harmless", "Harmful", "Jailbreak"]
+TOPICS = [f"Topic {i}" for i in range(20)]
+
+
+def make_tests(count: int) -> List[Dict[str, Any]]:
+    """Build a list of realistic tests."""
+    return [
+        {
+            "id": str(i),
+            "prompt": {
+                "content": f"Test prompt number {i} asking about claim {i % 97}?",
+                "language_code": "en",
+            },
+            "behavior": BEHAVIORS[i % len(BEHAVIORS)],
+            "category": CATEGORIES[i % len(CATEGORIES)],
+            "topic": TOPICS[i % len(TOPICS)],
+        }
+        for i in range(count)
+    ]
+
+
+def make_completion(content: Any) -> Dict[str, Any]:
+    """Wrap content into a chat completion response."""
+    return {"choices": [{"message": {"role": "assistant", "content": content}}]}
+
+
+class FakeRhesisAPI:
+    """A threaded HTTP server emulating the endpoints used by the SDK.
+
+    Serves behaviors (as a generic entity collection), test sets with their
+    paginated tests, test set downloads with Range support, bulk and chunked
+    uploads, and chat completions. Everything is kept in memory.
+    """
+
+    def __init__(self) -> None:
+        self.behaviors: Dict[str, Dict[str, Any]] = {}
+        self.test_sets: Dict[str, Dict[str, Any]] = {}
+        self.tests: Dict[str, List[Dict[str, Any]]] = {}
+        self.completion: Dict[str, Any] = make_completion(
+            json.dumps({"tests": make_tests(10)})
+        )
+        self._downloads: Dict[str, bytes] = {}
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakeRhesisAPI":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def add_behaviors(self, count: int) -> List[str]:
+        """Create behaviors and return their IDs."""
+        ids = []
+        for i in range(count):
+            record = {"id": str(uuid.uuid4()), "name": f"Behavior {i}"}
+            self.behaviors[record["id"]] = record
+            ids.append(record["id"])
+        return ids
+
+    def add_test_set(self, tests: List[Dict[str, Any]], **fields: Any) -> str:
+        """Create a test set with the given tests and return its ID."""
+        test_set_id = str(uuid.uuid4())
+        with self._lock:
+            self.test_sets[test_set_id] = {
+                "id": test_set_id,
+                "name": f"Benchmark test set {test_set_id[:8]}",
+                "description": "Generated for benchmarks",
+                "short_description": "Benchmark",
+                "updated_at": "2024-01-01T00:00:00",
+                **fields,
+            }
+            self.tests[test_set_id] = tests
+        return test_set_id
+
+    def download_body(self, test_set_id: str) -> bytes:
+        """Get the CSV export of a test set, built once."""
+        with self._lock:
+            body = self._downloads.get(test_set_id)
+        if body is None:
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerow(["id", "prompt", "behavior", "category", "topic"])
+            for test in self.tests[test_set_id]:
+                writer.writerow(
+                    [
+                        test.get("id"),
+                        (test.get("prompt") or {}).get("content"),
+                        test.get("behavior"),
+                        test.get("category"),
+                        test.get("topic"),
+                    ]
+                )
+            body = buffer.getvalue().encode("utf-8")
+            with self._lock:
+                self._downloads[test_set_id] = body
+        return body
+
+    def route(
+        self, method: str, path: str, query: Dict[str, str], body: bytes
+    ) -> Tuple[int, Any]:
+        """Handle a JSON request and return the status and response payload."""
+        parts = [part for part in path.split("/") if part]
+
+        if parts == ["services", "chat", "completions"] and method == "POST":
+            return 200, self.completion
+
+        if parts[:1] == ["behaviors"]:
+            if len(parts) == 1 and method == "GET":
+                return 200, self._page(list(self.behaviors.values()), query)
+            if len(parts) == 1 and method == "POST":
+                record = {"id": str(uuid.uuid4()), **json.loads(body)}
+                self.behaviors[record["id"]] = record
+                return 200, record
+            record = self.behaviors.get(parts[1])
+            if record is None:
+                return 404, {"detail": "Not found"}
+            if method == "PUT":
+                record.update(json.loads(body))
+            elif method == "DELETE":
+                del self.behaviors[parts[1]]
+            return 200, record
+
+        if parts[:1] == ["test_sets"]:
+            if parts == ["test_sets", "bulk"] and method == "POST":
+                data = json.loads(body)
+                tests = data.pop("tests", [])
+                test_set_id = self.add_test_set(tests, **data)
+                return 200, self.test_sets[test_set_id]
+            test_set = self.test_sets.get(parts[1]) if len(parts) > 1 else None
+            if test_set is None:
+                return 404, {"detail": "Not found"}
+            if parts[2:] == ["tests"] and method == "POST":
+                with self._lock:
+                    self.tests[parts[1]] = (
+                        self.tests[parts[1]] + json.loads(body)["tests"]
+                    )
+                return 200, {"id": parts[1]}
+            if parts[2:] == ["tests"]:
+                return 200, self._page(self.tests[parts[1]], query)
+            return 200, test_set
+
+        return 404, {"detail": "Not found"}
+
+    @staticmethod
+    def _page(records: List[Any], query: Dict[str, str]) -> List[Any]:
+        if "skip" not in query and "limit" not in query:
+            return records
+        skip = int(query.get("skip", 0))
+        limit = int(query.get("limit", len(records)))
+        return records[skip : skip + limit]
+
+    def _handler(self) -> type:
+        api = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body are written separately, which would otherwise
+            # stall every response on delayed ACKs
+            disable_nagle_algorithm = True
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+            def _respond(
+                self,
+                status: int,
+                body: bytes,
+                content_type: str = "application/json",
+                headers: Optional[Dict[str, str]] = None,
+            ) -> None:
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _handle(self, method: str) -> None:
+                parsed = urlparse(self.path)
+                query = {k: v[-1] for k, v in parse_qs(parsed.query).items()}
+                length = int(self.headers.get("Content-Length") or 0)
+                body = self.rfile.read(length) if length else b""
+
+                download = re.fullmatch(r"/test_sets/([^/]+)/download/?", parsed.path)
+                if download and method == "GET":
+                    self._download(download.group(1))
+                    return
+
+                status, payload = api.route(method, parsed.path, query, body)
+                self._respond(status, json.dumps(payload).encode("utf-8"))
+
+            def _download(self, test_set_id: str) -> None:
+                if test_set_id not in api.test_sets:
+                    self._respond(404, b'{"detail": "Not found"}')
+                    return
+                body = api.download_body(test_set_id)
+                headers = {"ETag": f'"{test_set_id}"', "Accept-Ranges": "bytes"}
+                match = re.fullmatch(r"bytes=(\d+)-", self.headers.get("Range", ""))
+                if match:
+                    start = int(match.group(1))
+                    if start >= len(body):
+                        self._respond(416, b"", "text/csv", headers)
+                        return
+                    headers["Content-Range"] = (
+                        f"bytes {start}-{len(body) - 1}/{len(body)}"
+                    )
+                    self._respond(206, body[start:], "text/csv", headers)
+                    return
+                self._respond(200, body, "text/csv", headers)
+
+            def do_GET(self) -> None:
+                self._handle("GET")
+
+            def do_POST(self) -> None:
+                self._handle("POST")
+
+            def do_PUT(self) -> None:
+                self._handle("PUT")
+
+            def do_DELETE(self) -> None:
+                self._handle("DELETE")
+
+        return Handler
@@ -0,0 +1,183 @@
+"""Deterministic stand-in for the LLM service used by the synthesizer benchmarks."""
+
+import hashlib
+import json
+import math
+import random
+import re
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from rhesis.services import LLMService
+
+#: Function drawing the latency of a call in seconds
+LatencyDistribution = Callable[[random.Random], float]
+
+PROMPT_PATTERN = re.compile(r"EXACTLY (\d+) test cases for this prompt")
+PARAPHRASE_PATTERN = re.compile(
+    r"EXACTLY (\d+) paraphrased versions for this prompt:\n(.*)\n"
+)
+PACKED_PATTERN = re.compile(
+    r"EXACTLY (\d+) paraphrased versions for EACH of these (\d+) prompts"
+)
+PACKED_ITEM_PATTERN = re.compile(r"^\[(\d+)\] (.*)$", re.MULTILINE)
+
+
+def constant(seconds: float) -> LatencyDistribution:
+    """Latency that is always the same."""
+    return lambda rng: seconds
+
+
+def uniform(low: float, high: float) -> LatencyDistribution:
+    """Latency drawn uniformly between low and high seconds."""
+    return lambda rng: rng.uniform(low, high)
+
+
+def lognormal(median: float, sigma: float = 0.5) -> LatencyDistribution:
+    """Right-skewed latency with the given median, like real LLM calls."""
+    mu = math.log(median)
+    return lambda rng: rng.lognormvariate(mu, sigma)
+
+
+class StubLLMService(LLMService):
+    """LLM service answering synthesizer prompts without calling the API.
+
+    Completions are built from the rendered templates: the requested number of
+    tests or paraphrases, each with unique content. Every call sleeps for a
+    latency drawn from the configured distribution, and may come back short
+    (fewer items than requested) or malformed (truncated JSON).
+
+    Outcomes are derived from the seed, the prompt and how often the prompt
+    was seen, so a scenario is reproducible regardless of thread scheduling.
+    """
+
+    def __init__(
+        self,
+        latency: Optional[LatencyDistribution] = None,
+        shortfall_rate: float = 0.0,
+        malformed_rate: float = 0.0,
+        seed: int = 0,
+    ) -> None:
+        """
+        Initialize the stub.
+
+        Args:
+            latency: Distribution of the latency of each call. Defaults to none.
+            shortfall_rate: Probability that a response has too few items.
+            malformed_rate: Probability that a response is not valid JSON.
+            seed: Seed of the outcomes.
+        """
+        super().__init__()
+        self.latency = latency or constant(0.0)
+        self.shortfall_rate = shortfall_rate
+        self.malformed_rate = malformed_rate
+        self.seed = seed
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """Reset the call statistics."""
+        with self._lock:
+            self.calls = 0
+            self.short_responses = 0
+            self.malformed_responses = 0
+            self.call_seconds: List[float] = []
+            self._occurrences: Dict[str, int] = {}
+
+    def create_completion(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float = 0.7,
+        max_tokens: int = 2000,
+        response_format: Optional[str] = None,
+        bypass_cache: bool = False,
+        **kwargs: Any,
+    ) -> Dict[str, Any]:
+        started = time.perf_counter()
+        prompt = messages[-1]["content"]
+        digest = hashlib.sha256(prompt.encode("utf-8")).hexdigest()[:12]
+        with self._lock:
+            occurrence = self._occurrences.get(digest, 0)
+            self._occurrences[digest] = occurrence + 1
+        rng = random.Random(f"{self.seed}:{digest}:{occurrence}")
+        short = rng.random() < self.shortfall_rate
+        malformed = rng.random() < self.malformed_rate
+
+        time.sleep(self.latency(rng))
+        payload = self._respond(prompt, f"{digest}-{occurrence}", short, rng)
+        content = json.dumps(payload)
+        if malformed:
+            content = content[: len(content) // 2]
+
+        with self._lock:
+            self.calls += 1
+            self.short_responses += short
+            self.malformed_responses += malformed
+            self.call_seconds.append(time.perf_counter() - started)
+        # Roughly four characters per token, like the API's usage for English
+        usage = {
+            "prompt_tokens": len(prompt) // 4,
+            "completion_tokens": len(content) // 4,
+        }
+        usage["total_tokens"] = usage["prompt_tokens"] + usage["completion_tokens"]
+        result = {
+            "choices": [{"message": {"role": "assistant", "content": content}}],
+            "usage": usage,
+        }
+        self._record_usage(0, result)
+        return result
+
+    @staticmethod
+    def _keep(count: int, short: bool, rng: random.Random) -> int:
+        """Number of requested items a response contains."""
+        return rng.randint(0, count - 1) if short and count else count
+
+    def _respond(
+        self, prompt: str, tag: str, short: bool, rng: random.Random
+    ) -> Dict[str, Any]:
+        """Build the response payload for a rendered synthesizer prompt."""
+        match = PACKED_PATTERN.search(prompt)
+        if match:
+            num_paraphrases = int(match.group(1))
+            tests = []
+            for index, original in PACKED_ITEM_PATTERN.findall(prompt):
+                for i in range(self._keep(num_paraphrases, short, rng)):
+                    tests.append(
+                        {
+                            "original_index": int(index),
+                            "prompt": {"content": f"{original} ({tag}-{i})"},
+                        }
+                    )
+            return {"tests": tests}
+
+        match = PARAPHRASE_PATTERN.search(prompt)
+        if match:
+            count, original = int(match.group(1)), match.group(2)
+            return {
+                "tests": [
+                    {"prompt": {"content": f"{original} ({tag}-{i})"}}
+                    for i in range(self._keep(count, short, rng))
+                ]
+            }
+
+        match = PROMPT_PATTERN.search(prompt)
+        if match:
+            return {
+                "tests": [
+                    {
+                        "prompt": {"content": f"Generated test {tag}-{i}"},
+                        "behavior": "Reliability",
+                        "category": "Harmless",
+                        "topic": f"Topic {i % 5}",
+                    }
+                    for i in range(self._keep(int(match.group(1)), short, rng))
+                ]
+            }
+
+        # Test set properties
+        return {
+            "name": "Benchmark test set",
+            "description": "Generated by the stub LLM service",
+            "short_description": "Benchmark",
+        }
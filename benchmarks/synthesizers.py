@@ -0,0 +1,228 @@
+"""Throughput harness for the synthesizers against StubLLMService.
+
+Runs PromptSynthesizer.generate and ParaphrasingSynthesizer.generate in each
+execution mode and reports tests per second, LLM calls per generated test,
+retry amplification (calls made over the calls a perfect LLM would need) and
+end-to-end latency. Run it with, for example:
+
+    python -m benchmarks.synthesizers --latency-ms 800 --shortfall-rate 0.1
+"""
+
+import argparse
+import math
+import os
+import statistics
+import time
+from typing import Any, Dict, List, Optional
+
+from .stub_llm import StubLLMService, lognormal
+
+#: Synthesizer settings of each execution mode
+MODES: Dict[str, Dict[str, Any]] = {
+    "prompt-sequential": {"synthesizer": "prompt", "max_concurrency": 1},
+    "prompt-concurrent": {"synthesizer": "prompt", "max_concurrency": 8},
+    "paraphrase-sequential": {"synthesizer": "paraphrase", "max_concurrency": 1},
+    "paraphrase-concurrent": {"synthesizer": "paraphrase", "max_concurrency": 8},
+    "paraphrase-packed": {
+        "synthesizer": "paraphrase",
+        "max_concurrency": 1,
+        "packed": True,
+    },
+    "paraphrase-packed-concurrent": {
+        "synthesizer": "paraphrase",
+        "max_concurrency": 8,
+        "packed": True,
+    },
+}
+
+
+def ideal_calls(mode: str, num_tests: int, batch_size: int) -> int:
+    """Number of LLM calls a mode needs if every response is complete.
+
+    Includes the call generating the test set properties.
+    """
+    settings = MODES[mode]
+    if settings["synthesizer"] == "prompt" or settings.get("packed"):
+        return math.ceil(num_tests / batch_size) + 1
+    return num_tests + 1
+
+
+def run_mode(
+    mode: str,
+    llm_service: StubLLMService,
+    num_tests: int = 50,
+    num_paraphrases: int = 2,
+    batch_size: int = 5,
+) -> Dict[str, Any]:
+    """Run one generation in a mode and measure it.
+
+    Args:
+        mode: One of MODES.
+        llm_service: The stub answering the synthesizer.
+        num_tests: Number of tests to generate, or of originals to paraphrase.
+        num_paraphrases: Number of paraphrases per original.
+        batch_size: Batch size of the synthesizer.
+
+    Returns:
+        Dict[str, Any]: The measurements. Failed runs have an "error".
+    """
+    from rhesis.entities.test_set import TestSet
+    from rhesis.synthesizers import ParaphrasingSynthesizer, PromptSynthesizer
+
+    settings = MODES[mode]
+    llm_service.reset()
+    generated = 0
+    error = None
+    started = time.perf_counter()
+    try:
+        if settings["synthesizer"] == "prompt":
+            prompt_synthesizer = PromptSynthesizer(
+                "Insurance claims chatbot",
+                batch_size=batch_size,
+                max_concurrency=settings["max_concurrency"],
+                llm_service=llm_service,
+            )
+            result = prompt_synthesizer.generate(num_tests=num_tests)
+            generated = len(result.tests or [])
+        else:
+            originals = TestSet(
+                tests=[
+                    {"id": str(i), "prompt": {"content": f"Original prompt {i}"}}
+                    for i in range(num_tests)
+                ]
+            )
+            paraphrasing_synthesizer = ParaphrasingSynthesizer(
+                originals,
+                batch_size=batch_size,
+                max_concurrency=settings["max_concurrency"],
+                packed=settings.get("packed", False),
+                llm_service=llm_service,
+            )
+            result = paraphrasing_synthesizer.generate(num_paraphrases=num_paraphrases)
+            generated = len(result.tests or []) - num_tests
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+    seconds = time.perf_counter() - started
+
+    calls = llm_service.calls
+    ideal = ideal_calls(mode, num_tests, batch_size)
+    call_seconds = sorted(llm_service.call_seconds) or [0.0]
+    return {
+        "mode": mode,
+        "seconds": seconds,
+        "generated": generated,
+        "calls": calls,
+        "ideal_calls": ideal,
+        "tests_per_second": generated / seconds if seconds else 0.0,
+        "calls_per_test": calls / generated if generated else None,
+        "retry_amplification": calls / ideal,
+        "short_responses": llm_service.short_responses,
+        "malformed_responses": llm_service.malformed_responses,
+        "call_p50_seconds": _percentile(call_seconds, 50),
+        "call_p95_seconds": _percentile(call_seconds, 95),
+        "error": error,
+    }
+
+
+def _percentile(values: List[float], percent: float) -> float:
+    """Nearest-rank percentile of sorted values."""
+    index = max(0, math.ceil(percent / 100 * len(values)) - 1)
+    return values[index]
+
+
+def summarize(runs: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Aggregate the repeated runs of a mode.
+
+    Args:
+        runs: The results of run_mode() for one mode.
+
+    Returns:
+        Dict[str, Any]: Means over successful runs, end-to-end latency
+            percentiles and the number of failed runs.
+    """
+    succeeded = [run for run in runs if run["error"] is None]
+    seconds = sorted(run["seconds"] for run in succeeded) or [0.0]
+
+    def mean(key: str) -> Optional[float]:
+        values = [run[key] for run in succeeded if run[key] is not None]
+        return statistics.mean(values) if values else None
+
+    return {
+        "mode": runs[0]["mode"],
+        "runs": len(runs),
+        "failed": len(runs) - len(succeeded),
+        "tests_per_second": mean("tests_per_second"),
+        "calls_per_test": mean("calls_per_test"),
+        "retry_amplification": mean("retry_amplification"),
+        "p50_seconds": _percentile(seconds, 50),
+        "p95_seconds": _percentile(seconds, 95),
+        "errors": sorted({run["error"] for run in runs if run["error"]}),
+    }
+
+
+def _format(value: Optional[float], digits: int = 2) -> str:
+    return "-" if value is None else f"{value:.{digits}f}"
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Compare synthesizer execution modes against a stub LLM"
+    )
+    parser.add_argument("--modes", nargs="*", default=list(MODES), choices=MODES)
+    parser.add_argument("--num-tests", type=int, default=50)
+    parser.add_argument("--num-paraphrases", type=int, default=2)
+    parser.add_argument("--batch-size", type=int, default=5)
+    parser.add_argument(
+        "--latency-ms", type=float, default=200, help="Median LLM call latency"
+    )
+    parser.add_argument(
+        "--latency-sigma",
+        type=float,
+        default=0.5,
+        help="Spread of the log-normal latency distribution",
+    )
+    parser.add_argument("--shortfall-rate", type=float, default=0.0)
+    parser.add_argument("--malformed-rate", type=float, default=0.0)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    os.environ.setdefault("RHESIS_API_KEY", "benchmark-key")
+    os.environ.setdefault("TQDM_DISABLE", "1")
+
+    print(
+        f"{'mode':<30} {'runs':>5} {'failed':>6} {'tests/s':>9} {'calls/test':>10} "
+        f"{'retry amp':>9} {'p50 s':>7} {'p95 s':>7}"
+    )
+    for mode in args.modes:
+        runs = []
+        for repeat in range(args.repeat):
+            llm_service = StubLLMService(
+                latency=lognormal(args.latency_ms / 1000, args.latency_sigma),
+                shortfall_rate=args.shortfall_rate,
+                malformed_rate=args.malformed_rate,
+                seed=args.seed + repeat,
+            )
+            runs.append(
+                run_mode(
+                    mode,
+                    llm_service,
+                    num_tests=args.num_tests,
+                    num_paraphrases=args.num_paraphrases,
+                    batch_size=args.batch_size,
+                )
+            )
+        summary = summarize(runs)
+        print(
+            f"{mode:<30} {summary['runs']:>5} {summary['failed']:>6} "
+            f"{_format(summary['tests_per_second'], 1):>9} "
+            f"{_format(summary['calls_per_test']):>10} "
+            f"{_format(summary['retry_amplification']):>9} "
+            f"{_format(summary['p50_seconds']):>7} {_format(summary['p95_seconds']):>7}"
+        )
+        for error in summary["errors"]:
+            print(f"    {error}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+import pytest
+
+from rhesis.client import get_response_cache
+from rhesis.entities import Behavior
+
+from .conftest import record_throughput
+
+BEHAVIOR_COUNT = 1000
+
+
+@pytest.fixture(scope="module")
+def behavior_ids(api):
+    return api.add_behaviors(BEHAVIOR_COUNT)
+
+
+def test_all(benchmark, behavior_ids):
+    records = benchmark(Behavior.all)
+    assert len(records) >= BEHAVIOR_COUNT
+    record_throughput(benchmark, len(records), unit="records", func=Behavior.all)
+
+
+def test_from_id(benchmark, behavior_ids):
+    # Measure full responses, not 304s served from the response cache
+    entity = benchmark.pedantic(
+        Behavior.from_id,
+        args=(behavior_ids[0],),
+        setup=get_response_cache().clear,
+        rounds=200,
+    )
+    assert entity.fields["id"] == behavior_ids[0]
+
+
+def test_from_ids(benchmark, behavior_ids):
+    def from_ids():
+        return Behavior.from_ids(behavior_ids)
+
+    entities = benchmark.pedantic(from_ids, setup=get_response_cache().clear, rounds=5)
+    assert len(entities) == BEHAVIOR_COUNT
+    record_throughput(
+        benchmark,
+        BEHAVIOR_COUNT,
+        unit="records",
+        func=from_ids,
+        setup=get_response_cache().clear,
+    )
+
+
+def test_save(benchmark, api):
+    record = benchmark(Behavior(name="Benchmark", description="Created").save)
+    assert record["id"] in api.behaviors
@@ -0,0 +1,48 @@
+import subprocess
+import sys
+
+import pytest
+
+STATEMENTS = [
+    "import rhesis",
+    "import rhesis.entities",
+    "from rhesis.entities import TestSet",
+    "from rhesis.synthesizers import PromptSynthesizer",
+    "import rhesis.cli",
+]
+
+
+def import_time_us(statement):
+    """Import in a fresh interpreter and return the cumulative import time in µs
+
+    The time is summed over the top-level modules reported by -X importtime,
+    so interpreter startup is excluded.
+    """
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stderr
+    total = 0
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        # Nested imports are indented below the module that imported them
+        if not name[1:].startswith(" "):
+            total += int(cumulative)
+    return total
+
+
+@pytest.mark.parametrize("statement", STATEMENTS)
+def test_import_time(benchmark, statement):
+    # Cold starts include bytecode compilation, so warm the cache first
+    baseline = import_time_us("pass")
+    import_time_us(statement)
+
+    times = []
+    benchmark.pedantic(
+        lambda: times.append(import_time_us(statement) - baseline), rounds=5
+    )
+    benchmark.extra_info["import_ms"] = min(times) / 1000
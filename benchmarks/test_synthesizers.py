@@ -0,0 +1,35 @@
+import pytest
+
+from .stub_llm import StubLLMService, constant
+from .synthesizers import MODES, run_mode
+
+NUM_TESTS = 50
+
+
+@pytest.fixture(autouse=True)
+def quiet(monkeypatch):
+    monkeypatch.setenv("RHESIS_API_KEY", "benchmark-key")
+    monkeypatch.setenv("TQDM_DISABLE", "1")
+
+
+@pytest.mark.parametrize("mode", list(MODES))
+def test_generate(benchmark, mode):
+    llm_service = StubLLMService(latency=constant(0.005), shortfall_rate=0.1, seed=1)
+
+    result = benchmark.pedantic(
+        run_mode, args=(mode, llm_service), kwargs={"num_tests": NUM_TESTS}, rounds=3
+    )
+
+    assert result["error"] is None
+    benchmark.extra_info.update(
+        {
+            key: result[key]
+            for key in (
+                "tests_per_second",
+                "calls_per_test",
+                "retry_amplification",
+                "calls",
+                "ideal_calls",
+            )
+        }
+    )
@@ -0,0 +1,88 @@
+import os
+
+from rhesis.client import get_response_cache
+from rhesis.entities import test_set as test_set_module
+
+from .conftest import record_throughput, rounds_for
+
+
+def run(benchmark, size, func, setup=None):
+    """Benchmark func over size tests and record its throughput"""
+    result = benchmark.pedantic(func, setup=setup, rounds=rounds_for(size))
+    record_throughput(benchmark, size, func=func, setup=setup)
+    return result
+
+
+def test_get_tests(benchmark, test_sets, size):
+    test_set_id, _ = test_sets(size)
+    tests = run(
+        benchmark,
+        size,
+        lambda: test_set_module.TestSet(id=test_set_id).get_tests(),
+        setup=get_response_cache().clear,
+    )
+    assert len(tests) == size
+
+
+def test_iter_tests(benchmark, test_sets, size):
+    test_set_id, _ = test_sets(size)
+
+    def consume():
+        test_set = test_set_module.TestSet(id=test_set_id)
+        return sum(1 for _ in test_set.iter_tests(page_size=1000))
+
+    assert run(benchmark, size, consume) == size
+
+
+def test_load_pandas(benchmark, test_sets, size):
+    test_set_id, _ = test_sets(size)
+    df = run(
+        benchmark,
+        size,
+        lambda: test_set_module.TestSet(id=test_set_id).load(format="pandas"),
+        setup=get_response_cache().clear,
+    )
+    assert len(df) == size
+
+
+def test_load_arrow(benchmark, test_sets, size):
+    test_set_id, _ = test_sets(size)
+    table = run(
+        benchmark,
+        size,
+        lambda: test_set_module.TestSet(id=test_set_id).load(
+            format="arrow", page_size=1000
+        ),
+    )
+    assert table.num_rows == size
+
+
+def test_to_parquet(benchmark, test_sets, size, tmp_path):
+    _, tests = test_sets(size)
+    path = str(tmp_path / "tests.parquet")
+    test_set = test_set_module.TestSet(id="local", tests=tests)
+    run(benchmark, size, lambda: test_set.to_parquet(path))
+    assert os.path.getsize(path) > 0
+
+
+def test_upload(benchmark, test_sets, size):
+    _, tests = test_sets(size)
+
+    def setup():
+        test_set = test_set_module.TestSet(name="Upload", tests=tests)
+        return (test_set,), {"chunk_size": 10_000}
+
+    def upload(test_set, **kwargs):
+        test_set.upload(**kwargs)
+        return test_set
+
+    result = benchmark.pedantic(upload, setup=setup, rounds=rounds_for(size))
+    record_throughput(benchmark, size, func=upload, setup=setup)
+    assert result.id is not None
+
+
+def test_download(benchmark, test_sets, size, tmp_path):
+    test_set_id, _ = test_sets(size)
+    test_set = test_set_module.TestSet(id=test_set_id)
+    assert run(benchmark, size, lambda: test_set.download(path=str(tmp_path)))
+    assert os.path.getsize(tmp_path / f"test_set_{test_set_id}.csv") > 0
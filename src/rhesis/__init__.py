@@ -1,8 +1,18 @@
-from rhesis.config import api_key, base_url
-import importlib.metadata
+from typing import Any
 
-# Get version from pyproject.toml via package metadata
-__version__ = importlib.metadata.version("rhesis-sdk")
+from rhesis.config import api_key, base_url
 
 # Make these variables available at the module level
 __all__ = ["api_key", "base_url", "__version__"]
+
+
+def __getattr__(name: str) -> Any:
+    """Look up the package version on first access, keeping imports fast."""
+    if name == "__version__":
+        import importlib.metadata
+
+        # Get version from pyproject.toml via package metadata
+        version = importlib.metadata.version("rhesis-sdk")
+        globals()["__version__"] = version
+        return version
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,25 +1,94 @@
 import argparse
 import sys
-from rhesis import __version__
+from typing import Any, List, Optional
 
 
-def main() -> None:
+class _VersionAction(argparse.Action):
+    """Print the SDK version and exit, looking it up only when requested."""
+
+    def __init__(
+        self,
+        option_strings: List[str],
+        dest: str = argparse.SUPPRESS,
+        default: Any = argparse.SUPPRESS,
+        help: str = "show program's version number and exit",
+    ) -> None:
+        super().__init__(
+            option_strings=option_strings,
+            dest=dest,
+            default=default,
+            nargs=0,
+            help=help,
+        )
+
+    def __call__(
+        self,
+        parser: argparse.ArgumentParser,
+        namespace: argparse.Namespace,
+        values: Any,
+        option_string: Optional[str] = None,
+    ) -> None:
+        from rhesis import __version__
+
+        print(f"rhesis-sdk {__version__}")
+        parser.exit()
+
+
+def prewarm(args: argparse.Namespace) -> None:
+    """Download tokenizer encodings into the local cache directory."""
+    from rhesis import config
+    from rhesis.utils import prewarm_encodings
+
+    if args.cache_dir:
+        config.tokenizer_cache_dir = args.cache_dir
+
+    try:
+        cache_dir = prewarm_encodings(args.encodings)
+    except Exception as e:
+        print(f"✗ Failed to download encodings: {e}", file=sys.stderr)
+        sys.exit(1)
+    print(f"☑️ Cached {', '.join(args.encodings)} in {cache_dir}")
+
+
+def main(argv: Optional[List[str]] = None) -> None:
     parser = argparse.ArgumentParser(
         description="Rhesis SDK - Testing and validation tools for GenAI applications"
     )
 
-    parser.add_argument(
-        "--version", action="version", version=f"rhesis-sdk {__version__}"
+    parser.add_argument("--version", action=_VersionAction)
+
+    subparsers = parser.add_subparsers(dest="command")
+    prewarm_parser = subparsers.add_parser(
+        "prewarm",
+        help="Download tokenizer encodings for offline use",
+        description=(
+            "Download tokenizer encodings into the tokenizer cache directory. "
+            "Copy the directory to machines without network access and point "
+            "TIKTOKEN_CACHE_DIR at it."
+        ),
+    )
+    prewarm_parser.add_argument(
+        "encodings",
+        nargs="*",
+        default=["cl100k_base", "o200k_base"],
+        help="Encodings to download (default: cl100k_base o200k_base)",
     )
+    prewarm_parser.add_argument(
+        "--cache-dir",
+        help="Directory to store the encodings in (default: the tokenizer cache directory)",
+    )
+    prewarm_parser.set_defaults(handler=prewarm)
 
-    # Since we only have --help and --version,
-    # if no arguments are provided, show help
-    if len(sys.argv) == 1:
+    # If no arguments are provided, show help
+    if not (sys.argv[1:] if argv is None else argv):
         parser.print_help()
         sys.exit(0)
 
-    # Parse arguments but don't store them since we don't use them
-    parser.parse_args()
+    args = parser.parse_args(argv)
+    if getattr(args, "handler", None) is None:
+        parser.print_help()
+        sys.exit(0)
+    args.handler(args)
 
 
 if __name__ == "__main__":
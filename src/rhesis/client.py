@@ -1,26 +1,598 @@
+import asyncio
+import hashlib
+import http.cookiejar
+import json
+import logging
+import os
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from typing import TYPE_CHECKING, Any, Dict, List, Mapping, Optional, Sequence, Tuple
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
 from rhesis.config import get_api_key, get_base_url
-from typing import Optional
+from rhesis.instrumentation import RequestEvent, RequestHooks, endpoint_template
+from rhesis.rate_limit import RateLimiter
+from rhesis.retry import RetryPolicy
+
+if TYPE_CHECKING:
+    import httpx
+
+# Default connection pool settings for the shared HTTP session
+DEFAULT_POOL_CONNECTIONS = 10
+DEFAULT_POOL_MAXSIZE = 20
+DEFAULT_POOL_BLOCK = False
+
+# Default connection limits for the shared asynchronous HTTP session
+DEFAULT_ASYNC_MAX_CONNECTIONS = 100
+DEFAULT_ASYNC_MAX_KEEPALIVE_CONNECTIONS = 20
+DEFAULT_ASYNC_KEEPALIVE_EXPIRY = 5.0
+
+# Process-wide session shared by every Client instance, and the ID of the
+# process that created it
+_session: Optional[requests.Session] = None
+_session_pid: Optional[int] = None
+_session_lock = threading.Lock()
+
+# Asynchronous sessions are bound to an event loop, so there is one per loop
+_async_sessions: "weakref.WeakKeyDictionary[Any, httpx.AsyncClient]" = (
+    weakref.WeakKeyDictionary()
+)
+_async_session_options: Dict[str, Any] = {}
+
+# Retry policy used by clients that were not given their own
+_retry_policy = RetryPolicy()
+
+# Hooks called for the requests of every client
+_request_hooks: List[RequestHooks] = []
+
+# Default number of responses kept for conditional GET requests
+DEFAULT_RESPONSE_CACHE_ENTRIES = 256
+
+# Default limits on the bytes of responses kept for conditional GET requests
+DEFAULT_RESPONSE_CACHE_BYTES = 32 * 1024 * 1024
+DEFAULT_RESPONSE_CACHE_BODY_BYTES = 1024 * 1024
+
+logger = logging.getLogger(__name__)
+
+
+def set_retry_policy(policy: RetryPolicy) -> None:
+    """
+    Set the process-wide default retry policy for API requests.
+
+    Args:
+        policy: The policy used by every client without its own retry policy.
+            Use RetryPolicy(max_attempts=1) to disable retries.
+    """
+    global _retry_policy
+    _retry_policy = policy
+
+
+def get_retry_policy() -> RetryPolicy:
+    """Get the process-wide default retry policy."""
+    return _retry_policy
+
+
+def add_request_hooks(*hooks: RequestHooks) -> None:
+    """
+    Register hooks called for the requests of every client.
+
+    Args:
+        *hooks: The hooks, e.g. a rhesis.instrumentation.MetricsCollector.
+    """
+    for hook in hooks:
+        if hook not in _request_hooks:
+            _request_hooks.append(hook)
+
+
+def remove_request_hooks(*hooks: RequestHooks) -> None:
+    """
+    Unregister hooks added with add_request_hooks().
+
+    Args:
+        *hooks: The hooks to remove. Hooks that are not registered are ignored.
+    """
+    for hook in hooks:
+        if hook in _request_hooks:
+            _request_hooks.remove(hook)
+
+
+def get_request_hooks() -> Tuple[RequestHooks, ...]:
+    """Get the hooks registered for every client."""
+    return tuple(_request_hooks)
+
+
+def _call_hooks(hooks: Sequence[RequestHooks], name: str, event: RequestEvent) -> None:
+    """Call a method of every hook, logging instead of raising its errors."""
+    for hook in hooks:
+        try:
+            getattr(hook, name)(event)
+        except Exception:
+            logger.warning(f"Request hook {hook!r} failed in {name}", exc_info=True)
+
+
+def _content_length(headers: Optional[Mapping[str, str]]) -> Optional[int]:
+    """Get the Content-Length of request or response headers, if known."""
+    value = (headers or {}).get("Content-Length")
+    return int(value) if value is not None and value.isdigit() else None
+
+
+def _release_when_done(
+    response: Any, rate_limiter: RateLimiter, latency: float, stream: Any
+) -> None:
+    """Release a rate limiter slot now, or when a streamed response is closed.
+
+    The latency reported to the limiter is the time until the headers arrived
+    in both cases. Closing a streamed response more than once releases the
+    slot only once.
+    """
+    if not stream:
+        rate_limiter.release(response.status_code, latency)
+        return
+
+    released = threading.Lock()
+
+    def release() -> None:
+        if released.acquire(blocking=False):
+            rate_limiter.release(response.status_code, latency)
+
+    close = response.close
+
+    def close_and_release() -> None:
+        try:
+            close()
+        finally:
+            release()
+
+    response.close = close_and_release
+    if hasattr(response, "aclose"):
+        aclose = response.aclose
+
+        async def aclose_and_release() -> None:
+            try:
+                await aclose()
+            finally:
+                release()
+
+        response.aclose = aclose_and_release
+
+
+class _RejectCookiesPolicy(http.cookiejar.DefaultCookiePolicy):
+    """Cookie policy that never stores cookies set by responses.
+
+    The shared session serves clients with different API keys and base URLs,
+    so cookies must not carry over from one client's requests to another's.
+    """
+
+    def set_ok(self, cookie: http.cookiejar.Cookie, request: Any) -> bool:
+        return False
+
+
+def _build_session(
+    pool_connections: int, pool_maxsize: int, pool_block: bool
+) -> requests.Session:
+    """Build a keep-alive session with a pooled adapter for HTTP and HTTPS."""
+    session = requests.Session()
+    session.cookies.set_policy(_RejectCookiesPolicy())
+    adapter = HTTPAdapter(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        pool_block=pool_block,
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def configure_session(
+    pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+    pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+    pool_block: bool = DEFAULT_POOL_BLOCK,
+) -> requests.Session:
+    """
+    Create (or replace) the process-wide pooled HTTP session.
+
+    Connections are kept alive and reused across all entities and services.
+    Calling this again closes the previous session and its pooled connections.
+    The session does not store cookies, since it is shared by clients with
+    different credentials.
+
+    Args:
+        pool_connections: Number of per-host connection pools to cache.
+        pool_maxsize: Maximum number of connections kept alive per host.
+        pool_block: Whether to block when a host's pool has no free connection
+                    instead of opening an extra, non-pooled connection.
+
+    Returns:
+        requests.Session: The new shared session.
+    """
+    global _session, _session_pid
+
+    session = _build_session(pool_connections, pool_maxsize, pool_block)
+    with _session_lock:
+        previous, _session = _session, session
+        owned = _session_pid == os.getpid()
+        _session_pid = os.getpid()
+    if previous is not None and owned:
+        previous.close()
+    return session
+
+
+def get_session() -> requests.Session:
+    """
+    Get the process-wide pooled HTTP session, creating it on first use.
+
+    A forked child process gets a new session instead of sharing the pooled
+    connections of its parent.
+
+    Returns:
+        requests.Session: The shared session.
+    """
+    global _session, _session_pid
+
+    session = _session
+    if session is None or _session_pid != os.getpid():
+        with _session_lock:
+            if _session is None or _session_pid != os.getpid():
+                # The parent's session is dropped rather than closed, since
+                # its connections belong to the parent
+                _session = _build_session(
+                    DEFAULT_POOL_CONNECTIONS, DEFAULT_POOL_MAXSIZE, DEFAULT_POOL_BLOCK
+                )
+                _session_pid = os.getpid()
+            session = _session
+    return session
+
+
+def close_session() -> None:
+    """Close the process-wide HTTP session and release its pooled connections."""
+    global _session
+
+    with _session_lock:
+        previous, _session = _session, None
+        owned = _session_pid == os.getpid()
+    if previous is not None and owned:
+        previous.close()
+
+
+def _import_httpx() -> Any:
+    """Import httpx, which is only required for the asynchronous client."""
+    try:
+        import httpx
+    except ImportError:
+        raise ImportError(
+            "httpx is required for async support. "
+            "Install it with: pip install rhesis-sdk[async]"
+        )
+    return httpx
+
+
+def configure_async_session(
+    max_connections: int = DEFAULT_ASYNC_MAX_CONNECTIONS,
+    max_keepalive_connections: int = DEFAULT_ASYNC_MAX_KEEPALIVE_CONNECTIONS,
+    keepalive_expiry: float = DEFAULT_ASYNC_KEEPALIVE_EXPIRY,
+    **client_kwargs: Any,
+) -> None:
+    """
+    Configure the pooled asynchronous HTTP sessions.
+
+    The settings apply to sessions created after this call. Existing sessions
+    are dropped from the registry; close them with close_async_session() from
+    their event loop to release their connections.
+
+    Args:
+        max_connections: Maximum number of concurrent connections.
+        max_keepalive_connections: Maximum number of idle connections kept alive.
+        keepalive_expiry: Seconds an idle connection is kept alive.
+        **client_kwargs: Additional arguments passed to httpx.AsyncClient.
+    """
+    _async_session_options.clear()
+    _async_session_options.update(
+        max_connections=max_connections,
+        max_keepalive_connections=max_keepalive_connections,
+        keepalive_expiry=keepalive_expiry,
+        client_kwargs=client_kwargs,
+    )
+    _async_sessions.clear()
+
+
+def get_async_session() -> "httpx.AsyncClient":
+    """
+    Get the pooled asynchronous HTTP session for the running event loop.
+
+    Returns:
+        httpx.AsyncClient: The session shared by every AsyncClient on this loop.
+
+    Raises:
+        RuntimeError: If called outside of a running event loop.
+        ImportError: If httpx is not installed.
+    """
+    loop = asyncio.get_running_loop()
+    session = _async_sessions.get(loop)
+    if session is None or session.is_closed:
+        httpx = _import_httpx()
+        limits = httpx.Limits(
+            max_connections=_async_session_options.get(
+                "max_connections", DEFAULT_ASYNC_MAX_CONNECTIONS
+            ),
+            max_keepalive_connections=_async_session_options.get(
+                "max_keepalive_connections", DEFAULT_ASYNC_MAX_KEEPALIVE_CONNECTIONS
+            ),
+            keepalive_expiry=_async_session_options.get(
+                "keepalive_expiry", DEFAULT_ASYNC_KEEPALIVE_EXPIRY
+            ),
+        )
+        # Match requests, which follows redirects (e.g. trailing slashes) by default
+        client_kwargs = {
+            "follow_redirects": True,
+            **_async_session_options.get("client_kwargs", {}),
+        }
+        session = httpx.AsyncClient(limits=limits, **client_kwargs)
+        _async_sessions[loop] = session
+    return session
+
+
+async def close_async_session() -> None:
+    """Close the asynchronous HTTP session of the running event loop."""
+    session = _async_sessions.pop(asyncio.get_running_loop(), None)
+    if session is not None:
+        await session.aclose()
+
+
+class ResponseCache:
+    """In-memory cache of GET responses for conditional requests.
+
+    For each URL (and query parameters and API key) the cache keeps the raw
+    body of the last response together with its validators: the ETag and
+    Last-Modified headers, or the updated_at field of the payload if the server
+    sends neither. Later requests send them as If-None-Match and
+    If-Modified-Since, and a 304 Not Modified response is served from the
+    cached body. Bodies larger than max_body_bytes are not cached, and least
+    recently used entries are evicted beyond max_entries or max_size_bytes.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_RESPONSE_CACHE_ENTRIES,
+        max_size_bytes: int = DEFAULT_RESPONSE_CACHE_BYTES,
+        max_body_bytes: int = DEFAULT_RESPONSE_CACHE_BODY_BYTES,
+    ) -> None:
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of cached responses.
+            max_size_bytes: Maximum total size of the cached bodies in bytes.
+            max_body_bytes: Maximum size in bytes of a body to be cached.
+        """
+        self.max_entries = max_entries
+        self.max_size_bytes = max_size_bytes
+        self.max_body_bytes = max_body_bytes
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Tuple[Dict[str, str], bytes]]" = OrderedDict()
+        self._size = 0
+
+    @staticmethod
+    def make_key(
+        api_key: Optional[str], url: str, params: Optional[Mapping[str, Any]] = None
+    ) -> str:
+        """
+        Build the cache key for a GET request.
+
+        Args:
+            api_key: The API key of the request, so that users never share entries
+            url: The request URL
+            params: The query parameters of the request
+
+        Returns:
+            str: A SHA-256 hex digest of the request
+        """
+        payload = json.dumps(
+            [api_key, url, dict(params or {})], sort_keys=True, default=str
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def headers(self, key: str) -> Dict[str, str]:
+        """
+        Get the conditional request headers for a cached response.
+
+        Args:
+            key: The cache key from make_key()
+
+        Returns:
+            Dict[str, str]: The If-None-Match and If-Modified-Since headers,
+                empty if nothing is cached
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return {}
+            self._entries.move_to_end(key)
+            return dict(entry[0])
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Get the payload of a cached response.
+
+        Args:
+            key: The cache key from make_key()
+
+        Returns:
+            Optional[Any]: A fresh copy of the parsed JSON body, or None on a miss
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None:
+            return None
+        return json.loads(entry[1])
 
+    def set(self, key: str, response: Any, payload: Any) -> None:
+        """
+        Store a response if it has validators and its body is small enough.
 
-class Client:
-    def __init__(self, api_key: Optional[str] = None, base_url: Optional[str] = None):
+        Args:
+            key: The cache key from make_key()
+            response: The requests or httpx response
+            payload: The parsed JSON body of the response
+        """
+        validators = self._validators(response.headers, payload)
+        content = response.content
+        with self._lock:
+            self._remove(key)
+            if not validators or len(content) > self.max_body_bytes:
+                return
+            self._entries[key] = (validators, content)
+            self._size += len(content)
+            while self._entries and (
+                len(self._entries) > self.max_entries
+                or self._size > self.max_size_bytes
+            ):
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+
+    def clear(self) -> None:
+        """Remove all cached responses."""
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    @property
+    def size_bytes(self) -> int:
+        """Get the total size of the cached bodies in bytes."""
+        with self._lock:
+            return self._size
+
+    def _remove(self, key: str) -> None:
+        """Remove an entry; the caller holds the lock."""
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._size -= len(entry[1])
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    @staticmethod
+    def _validators(headers: Mapping[str, str], payload: Any) -> Dict[str, str]:
+        """Build the conditional request headers for a response."""
+        validators = {}
+        etag = headers.get("ETag")
+        if etag:
+            validators["If-None-Match"] = etag
+        last_modified = headers.get("Last-Modified")
+        if not last_modified and isinstance(payload, dict):
+            last_modified = _http_date(payload.get("updated_at"))
+        if last_modified:
+            validators["If-Modified-Since"] = last_modified
+        return validators
+
+
+def _http_date(value: Any) -> Optional[str]:
+    """Format an ISO timestamp as an HTTP date, or None if it cannot be parsed."""
+    if not isinstance(value, str):
+        return None
+    try:
+        timestamp = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if timestamp.tzinfo is None:
+        # The API returns naive timestamps in UTC
+        timestamp = timestamp.replace(tzinfo=timezone.utc)
+    return format_datetime(timestamp.astimezone(timezone.utc), usegmt=True)
+
+
+# Responses shared by every client for conditional GET requests
+_response_cache = ResponseCache()
+
+
+def get_response_cache() -> ResponseCache:
+    """Get the process-wide cache of responses for conditional GET requests."""
+    return _response_cache
+
+
+def configure_response_cache(
+    max_entries: int = DEFAULT_RESPONSE_CACHE_ENTRIES,
+    max_size_bytes: int = DEFAULT_RESPONSE_CACHE_BYTES,
+    max_body_bytes: int = DEFAULT_RESPONSE_CACHE_BODY_BYTES,
+) -> ResponseCache:
+    """
+    Replace the process-wide cache of responses for conditional GET requests.
+
+    Args:
+        max_entries: Maximum number of cached responses. Use 0 to disable
+            conditional requests.
+        max_size_bytes: Maximum total size of the cached bodies in bytes.
+        max_body_bytes: Maximum size in bytes of a body to be cached.
+
+    Returns:
+        ResponseCache: The new cache.
+    """
+    global _response_cache
+    _response_cache = ResponseCache(
+        max_entries=max_entries,
+        max_size_bytes=max_size_bytes,
+        max_body_bytes=max_body_bytes,
+    )
+    return _response_cache
+
+
+class BaseClient:
+    """Configuration and URL handling shared by the sync and async clients."""
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        base_url: Optional[str] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        hooks: Optional[Sequence[RequestHooks]] = None,
+    ):
         """
         Initialize the Rhesis client.
 
+        All clients share a pooled HTTP session, so creating a client is cheap
+        and does not open a new connection.
+
         Args:
             api_key: Optional API key. If not provided, will try to get it from
                     module level variable or environment variable.
             base_url: Optional base URL. If not provided, will try to get it from
                      module level variable or environment variable.
+            retry_policy: Optional retry policy. If not provided, the process-wide
+                         default policy is used.
+            hooks: Optional request hooks called in addition to the hooks
+                  registered with add_request_hooks().
         """
         self.api_key = api_key if api_key is not None else get_api_key()
         self._base_url = base_url if base_url is not None else get_base_url()
+        self._retry_policy = retry_policy
+        self.hooks: List[RequestHooks] = list(hooks or [])
+
+    @property
+    def retry_policy(self) -> RetryPolicy:
+        """Get the retry policy for this client's requests."""
+        if self._retry_policy is not None:
+            return self._retry_policy
+        return get_retry_policy()
 
     @property
     def base_url(self) -> str:
         """Get the base URL with trailing slash removed."""
         return self._base_url.rstrip("/")
 
+    @property
+    def headers(self) -> Dict[str, str]:
+        """Get the default headers for API requests."""
+        return {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json",
+        }
+
     def get_url(self, endpoint: str) -> str:
         """
         Construct a URL by combining base_url and endpoint.
@@ -34,3 +606,415 @@ class Client:
         # Remove leading slash from endpoint if present
         endpoint = endpoint.lstrip("/")
         return f"{self.base_url}/{endpoint}"
+
+    @property
+    def request_hooks(self) -> Tuple[RequestHooks, ...]:
+        """Get the process-wide hooks followed by this client's own hooks."""
+        return (*_request_hooks, *self.hooks)
+
+    def _start_attempt(
+        self, hooks: Sequence[RequestHooks], method: str, url: str, attempt: int
+    ) -> Optional[RequestEvent]:
+        """Create the event of an attempt and call on_request_start, if hooked."""
+        if not hooks:
+            return None
+        if url.startswith(self.base_url):
+            path = url[len(self.base_url) :]
+        else:
+            path = urlparse(url).path
+        event = RequestEvent(method, url, endpoint_template(path), attempt)
+        _call_hooks(hooks, "on_request_start", event)
+        return event
+
+    def _end_attempt(
+        self,
+        hooks: Sequence[RequestHooks],
+        event: Optional[RequestEvent],
+        started: float,
+        response: Any = None,
+        error: Optional[BaseException] = None,
+        stream: bool = False,
+    ) -> None:
+        """Complete the event of an attempt and call on_request_end or on_error."""
+        if event is None:
+            return
+        event.latency = time.monotonic() - started
+        if error is not None:
+            event.error = error
+            _call_hooks(hooks, "on_error", event)
+            return
+        event.status_code = response.status_code
+        try:
+            event.bytes_sent = _content_length(response.request.headers)
+        except (AttributeError, RuntimeError):
+            # Responses built without a request
+            pass
+        event.bytes_received = _content_length(response.headers)
+        if event.bytes_received is None and not stream:
+            event.bytes_received = len(response.content)
+        _call_hooks(hooks, "on_request_end", event)
+
+    def _retry_attempt(
+        self, hooks: Sequence[RequestHooks], event: Optional[RequestEvent], delay: float
+    ) -> None:
+        """Call on_retry for an attempt that will be repeated after delay seconds."""
+        if event is None:
+            return
+        event.retry_delay = delay
+        _call_hooks(hooks, "on_retry", event)
+
+
+class Client(BaseClient):
+    """Synchronous client backed by the process-wide pooled requests session."""
+
+    @property
+    def session(self) -> requests.Session:
+        """Get the shared pooled HTTP session."""
+        return get_session()
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        idempotent: Optional[bool] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        token_estimate: int = 0,
+        **kwargs: Any,
+    ) -> requests.Response:
+        """
+        Send an HTTP request through the shared pooled session.
+
+        Transient failures are retried according to the client's retry policy.
+
+        Args:
+            method: The HTTP method (GET, POST, PUT, DELETE, ...).
+            url: The complete request URL, usually built with get_url().
+            idempotent: Whether the request can safely be repeated. Defaults to
+                True for GET, HEAD, OPTIONS, PUT and DELETE and False otherwise.
+            rate_limiter: Optional rate limiter every attempt must acquire.
+            token_estimate: Estimated tokens the request consumes, for the
+                rate limiter's token budget.
+            **kwargs: Additional arguments passed to requests.Session.request.
+                Headers given here are merged over the default headers.
+
+        Returns:
+            requests.Response: The response from the API. If retries are
+                exhausted, the last failed response is returned.
+        """
+        headers = {**self.headers, **kwargs.pop("headers", {})}
+        policy = self.retry_policy
+        hooks = self.request_hooks
+        attempt = 1
+        while True:
+            event = self._start_attempt(hooks, method, url, attempt)
+            started = time.monotonic()
+            try:
+                response = self._send(
+                    method, url, rate_limiter, token_estimate, headers=headers, **kwargs
+                )
+            except requests.exceptions.RequestException as e:
+                self._end_attempt(hooks, event, started, error=e)
+                if attempt >= policy.max_attempts or not policy.should_retry_error(
+                    method, e, idempotent
+                ):
+                    raise
+                delay = policy.get_delay(attempt)
+                logger.warning(
+                    f"{method} {url} failed with {e!r}, "
+                    f"retrying in {delay:.2f}s (attempt {attempt})"
+                )
+            else:
+                self._end_attempt(
+                    hooks, event, started, response, stream=kwargs.get("stream", False)
+                )
+                if attempt >= policy.max_attempts or not policy.should_retry_status(
+                    method, response.status_code, idempotent
+                ):
+                    return response
+                delay = policy.get_delay(attempt, response.headers.get("Retry-After"))
+                logger.warning(
+                    f"{method} {url} returned {response.status_code}, "
+                    f"retrying in {delay:.2f}s (attempt {attempt})"
+                )
+                response.close()
+            self._retry_attempt(hooks, event, delay)
+            time.sleep(delay)
+            attempt += 1
+
+    def _send(
+        self,
+        method: str,
+        url: str,
+        rate_limiter: Optional[RateLimiter],
+        token_estimate: int,
+        **kwargs: Any,
+    ) -> requests.Response:
+        """Send a single attempt of a request, holding a rate limiter slot.
+
+        The slot of a streamed response is held until the response is closed.
+        """
+        if rate_limiter is None:
+            return self.session.request(method, url, **kwargs)
+
+        rate_limiter.acquire(token_estimate)
+        started = time.monotonic()
+        try:
+            response = self.session.request(method, url, **kwargs)
+        except BaseException:
+            rate_limiter.release(None, time.monotonic() - started)
+            raise
+        _release_when_done(
+            response, rate_limiter, time.monotonic() - started, kwargs.get("stream")
+        )
+        return response
+
+    def get(self, url: str, **kwargs: Any) -> requests.Response:
+        """Send a GET request through the shared session."""
+        return self.request("GET", url, **kwargs)
+
+    def get_json(
+        self,
+        url: str,
+        params: Optional[Dict[str, Any]] = None,
+        use_cache: bool = True,
+        **kwargs: Any,
+    ) -> Any:
+        """
+        Send a conditional GET request and return the parsed JSON body.
+
+        If a response for the same URL is cached, its validators are sent and
+        a 304 Not Modified response is served from the cache.
+
+        Args:
+            url: The complete request URL, usually built with get_url().
+            params: Query parameters of the request.
+            use_cache: Whether to use the response cache. Pass False for
+                large responses that are fetched once, like all tests of a
+                test set.
+            **kwargs: Additional arguments passed to request().
+
+        Returns:
+            Any: The parsed JSON body.
+
+        Raises:
+            requests.exceptions.HTTPError: If the response has an error status.
+        """
+        if not use_cache:
+            response = self.get(url, params=params, **kwargs)
+            response.raise_for_status()
+            return response.json()
+
+        cache = get_response_cache()
+        key = cache.make_key(self.api_key, url, params)
+        headers = kwargs.pop("headers", {})
+        response = self.get(
+            url, params=params, headers={**cache.headers(key), **headers}, **kwargs
+        )
+        if response.status_code == 304:
+            payload = cache.get(key)
+            if payload is not None:
+                return payload
+            # Evicted in the meantime, so fetch the full body
+            response = self.get(url, params=params, headers=headers, **kwargs)
+        response.raise_for_status()
+        payload = response.json()
+        cache.set(key, response, payload)
+        return payload
+
+    def post(self, url: str, **kwargs: Any) -> requests.Response:
+        """Send a POST request through the shared session."""
+        return self.request("POST", url, **kwargs)
+
+    def put(self, url: str, **kwargs: Any) -> requests.Response:
+        """Send a PUT request through the shared session."""
+        return self.request("PUT", url, **kwargs)
+
+    def delete(self, url: str, **kwargs: Any) -> requests.Response:
+        """Send a DELETE request through the shared session."""
+        return self.request("DELETE", url, **kwargs)
+
+
+class AsyncClient(BaseClient):
+    """Asynchronous client backed by a pooled httpx session per event loop.
+
+    Requires the optional httpx dependency (pip install rhesis-sdk[async]).
+    """
+
+    @property
+    def session(self) -> "httpx.AsyncClient":
+        """Get the pooled asynchronous HTTP session of the running event loop."""
+        return get_async_session()
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        idempotent: Optional[bool] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        token_estimate: int = 0,
+        **kwargs: Any,
+    ) -> "httpx.Response":
+        """
+        Send an HTTP request through the shared asynchronous session.
+
+        Transient failures are retried according to the client's retry policy.
+
+        Args:
+            method: The HTTP method (GET, POST, PUT, DELETE, ...).
+            url: The complete request URL, usually built with get_url().
+            idempotent: Whether the request can safely be repeated. Defaults to
+                True for GET, HEAD, OPTIONS, PUT and DELETE and False otherwise.
+            rate_limiter: Optional rate limiter every attempt must acquire.
+            token_estimate: Estimated tokens the request consumes, for the
+                rate limiter's token budget.
+            **kwargs: Additional arguments passed to httpx.AsyncClient.request.
+                Headers given here are merged over the default headers. Pass
+                stream=True to leave the response body unread.
+
+        Returns:
+            httpx.Response: The response from the API. If retries are
+                exhausted, the last failed response is returned.
+        """
+        httpx = _import_httpx()
+        headers = {**self.headers, **kwargs.pop("headers", {})}
+        policy = self.retry_policy
+        hooks = self.request_hooks
+        attempt = 1
+        while True:
+            event = self._start_attempt(hooks, method, url, attempt)
+            started = time.monotonic()
+            try:
+                response = await self._send(
+                    method, url, rate_limiter, token_estimate, headers=headers, **kwargs
+                )
+            except httpx.TransportError as e:
+                self._end_attempt(hooks, event, started, error=e)
+                if attempt >= policy.max_attempts or not policy.should_retry_error(
+                    method, e, idempotent
+                ):
+                    raise
+                delay = policy.get_delay(attempt)
+                logger.warning(
+                    f"{method} {url} failed with {e!r}, "
+                    f"retrying in {delay:.2f}s (attempt {attempt})"
+                )
+            else:
+                self._end_attempt(
+                    hooks, event, started, response, stream=kwargs.get("stream", False)
+                )
+                if attempt >= policy.max_attempts or not policy.should_retry_status(
+                    method, response.status_code, idempotent
+                ):
+                    return response
+                delay = policy.get_delay(attempt, response.headers.get("Retry-After"))
+                logger.warning(
+                    f"{method} {url} returned {response.status_code}, "
+                    f"retrying in {delay:.2f}s (attempt {attempt})"
+                )
+                await response.aclose()
+            self._retry_attempt(hooks, event, delay)
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def _send(
+        self,
+        method: str,
+        url: str,
+        rate_limiter: Optional[RateLimiter],
+        token_estimate: int,
+        **kwargs: Any,
+    ) -> "httpx.Response":
+        """Send a single attempt of a request, holding a rate limiter slot.
+
+        The slot of a streamed response is held until the response is closed.
+        """
+        if rate_limiter is None:
+            return await self._dispatch(method, url, **kwargs)
+
+        await rate_limiter.acquire_async(token_estimate)
+        started = time.monotonic()
+        try:
+            response = await self._dispatch(method, url, **kwargs)
+        except BaseException:
+            rate_limiter.release(None, time.monotonic() - started)
+            raise
+        _release_when_done(
+            response, rate_limiter, time.monotonic() - started, kwargs.get("stream")
+        )
+        return response
+
+    async def _dispatch(
+        self, method: str, url: str, stream: bool = False, **kwargs: Any
+    ) -> "httpx.Response":
+        """Send a request, leaving the body unread if stream is True.
+
+        Like with requests, a streamed response must be closed by the caller.
+        """
+        if not stream:
+            return await self.session.request(method, url, **kwargs)
+        request = self.session.build_request(method, url, **kwargs)
+        return await self.session.send(request, stream=True)
+
+    async def get(self, url: str, **kwargs: Any) -> "httpx.Response":
+        """Send a GET request through the shared asynchronous session."""
+        return await self.request("GET", url, **kwargs)
+
+    async def get_json(
+        self,
+        url: str,
+        params: Optional[Dict[str, Any]] = None,
+        use_cache: bool = True,
+        **kwargs: Any,
+    ) -> Any:
+        """
+        Send a conditional GET request and return the parsed JSON body.
+
+        Shares the response cache of the synchronous client.
+
+        Args:
+            url: The complete request URL, usually built with get_url().
+            params: Query parameters of the request.
+            use_cache: Whether to use the response cache. Pass False for
+                large responses that are fetched once, like all tests of a
+                test set.
+            **kwargs: Additional arguments passed to request().
+
+        Returns:
+            Any: The parsed JSON body.
+
+        Raises:
+            httpx.HTTPStatusError: If the response has an error status.
+        """
+        if not use_cache:
+            response = await self.get(url, params=params, **kwargs)
+            response.raise_for_status()
+            return response.json()
+
+        cache = get_response_cache()
+        key = cache.make_key(self.api_key, url, params)
+        headers = kwargs.pop("headers", {})
+        response = await self.get(
+            url, params=params, headers={**cache.headers(key), **headers}, **kwargs
+        )
+        if response.status_code == 304:
+            payload = cache.get(key)
+            if payload is not None:
+                return payload
+            # Evicted in the meantime, so fetch the full body
+            response = await self.get(url, params=params, headers=headers, **kwargs)
+        response.raise_for_status()
+        payload = response.json()
+        cache.set(key, response, payload)
+        return payload
+
+    async def post(self, url: str, **kwargs: Any) -> "httpx.Response":
+        """Send a POST request through the shared asynchronous session."""
+        return await self.request("POST", url, **kwargs)
+
+    async def put(self, url: str, **kwargs: Any) -> "httpx.Response":
+        """Send a PUT request through the shared asynchronous session."""
+        return await self.request("PUT", url, **kwargs)
+
+    async def delete(self, url: str, **kwargs: Any) -> "httpx.Response":
+        """Send a DELETE request through the shared asynchronous session."""
+        return await self.request("DELETE", url, **kwargs)
@@ -1,4 +1,5 @@
 import os
+from pathlib import Path
 from typing import Optional
 
 # Default values
@@ -7,6 +8,8 @@ DEFAULT_BASE_URL = "https://api.rhesis.com"
 # Module level variables
 api_key: Optional[str] = None
 base_url: Optional[str] = None
+cache_dir: Optional[str] = None
+tokenizer_cache_dir: Optional[str] = None
 
 
 def get_api_key() -> str:
@@ -44,3 +47,41 @@ def get_base_url() -> str:
         return env_base_url
 
     return DEFAULT_BASE_URL
+
+
+def get_cache_dir() -> Path:
+    """
+    Get the directory for local caches from module level variable or environment variable.
+    Falls back to 'rhesis' in the user cache directory if neither is set.
+    """
+    # First check module level variable
+    if cache_dir is not None:
+        return Path(cache_dir)
+
+    # Then check environment variable
+    env_cache_dir = os.getenv("RHESIS_CACHE_DIR")
+    if env_cache_dir:
+        return Path(env_cache_dir)
+
+    xdg_cache_home = os.getenv("XDG_CACHE_HOME")
+    if xdg_cache_home:
+        return Path(xdg_cache_home) / "rhesis"
+    return Path.home() / ".cache" / "rhesis"
+
+
+def get_tokenizer_cache_dir() -> Path:
+    """
+    Get the directory where tokenizer encodings are cached.
+    Checks the module level variable, then the TIKTOKEN_CACHE_DIR environment
+    variable, and falls back to 'tiktoken' in the cache directory.
+    """
+    # First check module level variable
+    if tokenizer_cache_dir is not None:
+        return Path(tokenizer_cache_dir)
+
+    # Then check tiktoken's own environment variable
+    env_cache_dir = os.getenv("TIKTOKEN_CACHE_DIR")
+    if env_cache_dir:
+        return Path(env_cache_dir)
+
+    return get_cache_dir() / "tiktoken"
@@ -2,13 +2,53 @@
 Rhesis Entities Module.
 
 This module provides the entity classes for interacting with the Rhesis API.
+Entity classes are imported on first access, so importing the package does
+not load the dependencies of entities that are not used.
 """
 
-from .base_entity import BaseEntity
-from .behavior import Behavior
-from .test_set import TestSet
-from .status import Status
-from .topic import Topic
-from .category import Category
+import importlib
+from typing import TYPE_CHECKING, Any, List
 
-__all__ = ["BaseEntity", "Behavior", "TestSet", "Status", "Topic", "Category"]
+if TYPE_CHECKING:
+    from .base_entity import BaseEntity
+    from .behavior import Behavior
+    from .test_set import TestSet
+    from .test_set_cache import TestSetCache
+    from .status import Status
+    from .topic import Topic
+    from .category import Category
+
+# Module defining each lazily imported attribute
+_LAZY_ATTRIBUTES = {
+    "BaseEntity": ".base_entity",
+    "Behavior": ".behavior",
+    "TestSet": ".test_set",
+    "TestSetCache": ".test_set_cache",
+    "Status": ".status",
+    "Topic": ".topic",
+    "Category": ".category",
+}
+
+__all__ = [
+    "BaseEntity",
+    "Behavior",
+    "TestSet",
+    "TestSetCache",
+    "Status",
+    "Topic",
+    "Category",
+]
+
+
+def __getattr__(name: str) -> Any:
+    """Import entity classes on first access."""
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted([*globals(), *_LAZY_ATTRIBUTES])
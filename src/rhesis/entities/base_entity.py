@@ -1,7 +1,24 @@
+import asyncio
 import functools
+import inspect
+import sys
 import requests
-from typing import Optional, Dict, Any, Callable, TypeVar, cast
-from rhesis.client import Client
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import (
+    Optional,
+    Dict,
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Iterable,
+    Iterator,
+    List,
+    TypeVar,
+    Union,
+    cast,
+)
+from rhesis.client import AsyncClient, Client
 from datetime import datetime
 import logging
 
@@ -10,33 +27,228 @@ T = TypeVar("T")
 logger = logging.getLogger(__name__)
 
 
+def _http_error_types() -> tuple[type[Exception], ...]:
+    """Get the HTTP status error types raised by the sync and async clients."""
+    httpx = sys.modules.get("httpx")
+    if httpx is None:
+        return (requests.exceptions.HTTPError,)
+    return (requests.exceptions.HTTPError, httpx.HTTPStatusError)
+
+
+def _log_http_error(e: Exception) -> None:
+    """Log the details of a failed request from requests or httpx."""
+    logger.error(f"HTTP error occurred: {e}")
+    response = getattr(e, "response", None)
+    if response is None:
+        return
+    # Handle potential string or bytes content
+    content = response.content
+    if isinstance(content, bytes):
+        content = content.decode()
+    logger.error(f"Response content: {content}")
+    request = response.request
+    logger.error(f"Request URL: {request.url}")
+    logger.error(f"Request method: {request.method}")
+    logger.error(f"Request headers: {request.headers}")
+    # requests exposes the body as .body, httpx as .content
+    try:
+        body = getattr(request, "body", None) or getattr(request, "content", None)
+    except Exception:
+        body = None
+    if body:
+        if isinstance(body, bytes):
+            body = body.decode()
+        logger.error(f"Request body: {body}")
+
+
 def handle_http_errors(func: Callable[..., T]) -> Callable[..., Optional[T]]:
-    """Decorator to handle HTTP errors in API requests."""
+    """Decorator to handle HTTP errors in API requests.
+
+    Works for both regular methods and coroutine methods.
+    """
+
+    if inspect.iscoroutinefunction(func):
+
+        @functools.wraps(func)
+        async def async_wrapper(self_or_cls: Any, *args: Any, **kwargs: Any) -> Any:
+            try:
+                return await func(self_or_cls, *args, **kwargs)
+            except _http_error_types() as e:
+                _log_http_error(e)
+                return None
+
+        return cast(Callable[..., Optional[T]], async_wrapper)
 
     @functools.wraps(func)
     def wrapper(self_or_cls: Any, *args: Any, **kwargs: Any) -> Optional[T]:
         try:
             return func(self_or_cls, *args, **kwargs)
-        except requests.exceptions.HTTPError as e:
-            logger.error(f"HTTP error occurred: {e}")
-            # Handle potential string or bytes content
-            content = e.response.content
-            if isinstance(content, bytes):
-                content = content.decode()
-            logger.error(f"Response content: {content}")
-            logger.error(f"Request URL: {e.response.request.url}")
-            logger.error(f"Request method: {e.response.request.method}")
-            logger.error(f"Request headers: {e.response.request.headers}")
-            if e.response.request.body:
-                body = e.response.request.body
-                if isinstance(body, bytes):
-                    body = body.decode()
-                logger.error(f"Request body: {body}")
+        except _http_error_types() as e:
+            _log_http_error(e)
             return None
 
     return wrapper
 
 
+# Default upper bound on the pages fetched by one iteration over an endpoint
+DEFAULT_MAX_PAGES = 100_000
+
+
+def _page_ids(page: list[Any]) -> Optional[tuple[Any, ...]]:
+    """Get the record IDs of a page, or None if some records have no ID."""
+    ids = tuple(
+        record.get("id") if isinstance(record, dict) else None for record in page
+    )
+    return None if None in ids else ids
+
+
+def _repeats_page(page: list[Any], previous: Optional[list[Any]]) -> bool:
+    """Check whether a page repeats the previous one.
+
+    Pages are compared by their record IDs, or by their content if some
+    records have no ID.
+    """
+    if not page or not previous:
+        return False
+    ids = _page_ids(page)
+    if ids is not None:
+        return ids == _page_ids(previous)
+    return page == previous
+
+
+def _warn_max_pages(max_pages: int) -> None:
+    """Log that an iteration stopped at its page bound."""
+    logger.warning(
+        f"Stopped paging after {max_pages} pages; pass a larger max_pages "
+        "to fetch more"
+    )
+
+
+def iter_pages(
+    fetch_page: Callable[[int, int], list[Any]],
+    page_size: int = 100,
+    prefetch: bool = True,
+    max_pages: Optional[int] = DEFAULT_MAX_PAGES,
+) -> Iterator[list[Any]]:
+    """Iterate over the pages of a skip/limit paginated endpoint.
+
+    While the caller processes a page, the next one is fetched on a background
+    thread. Iteration stops at the first page shorter than page_size. If the
+    endpoint ignores skip and limit, it stops after a page longer than
+    page_size, or before a page repeating the previous one. As a last resort,
+    it stops after max_pages pages.
+
+    Args:
+        fetch_page: Function called with (skip, limit) that returns one page.
+        page_size: Number of records per page.
+        prefetch: Whether to fetch the next page in the background.
+        max_pages: Maximum number of pages to fetch, or None for no limit.
+
+    Yields:
+        list[Any]: The non-empty pages, in order.
+    """
+    if page_size < 1:
+        raise ValueError("page_size must be at least 1")
+
+    if not prefetch:
+        skip = 0
+        previous = None
+        pages = 0
+        while True:
+            page = fetch_page(skip, page_size)
+            pages += 1
+            if _repeats_page(page, previous):
+                return
+            if page:
+                yield page
+            if len(page) != page_size:
+                return
+            if max_pages is not None and pages >= max_pages:
+                _warn_max_pages(max_pages)
+                return
+            skip += page_size
+            previous = page
+
+    executor = ThreadPoolExecutor(max_workers=1)
+    try:
+        pending: Future[list[Any]] = executor.submit(fetch_page, 0, page_size)
+        skip = 0
+        previous = None
+        pages = 0
+        while True:
+            page = pending.result()
+            pages += 1
+            if _repeats_page(page, previous):
+                return
+            if len(page) != page_size:
+                if page:
+                    yield page
+                return
+            if max_pages is not None and pages >= max_pages:
+                yield page
+                _warn_max_pages(max_pages)
+                return
+            skip += page_size
+            pending = executor.submit(fetch_page, skip, page_size)
+            yield page
+            previous = page
+    finally:
+        # Don't wait for a prefetch the caller no longer needs
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _as_list(result: Any) -> list[Any]:
+    """Wrap a single record returned by a list endpoint into a list."""
+    if isinstance(result, list):
+        return result
+    return [result] if result else []
+
+
+def _map_unique(
+    func: Callable[[str], T], keys: List[str], max_concurrency: int
+) -> List[Union[T, Exception]]:
+    """Call func once per distinct key on a thread pool.
+
+    Returns the result for each key in input order, with exceptions in place
+    of the results of failed calls.
+    """
+
+    def call(key: str) -> Union[T, Exception]:
+        try:
+            return func(key)
+        except Exception as e:
+            return e
+
+    unique = list(dict.fromkeys(keys))
+    if not unique:
+        return []
+    workers = max(1, min(max_concurrency, len(unique)))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = dict(zip(unique, executor.map(call, unique)))
+    return [results[key] for key in keys]
+
+
+async def _amap_unique(
+    func: Callable[[str], Awaitable[T]], keys: List[str], max_concurrency: int
+) -> List[Union[T, Exception]]:
+    """Await func once per distinct key with bounded concurrency.
+
+    Asynchronous variant of _map_unique().
+    """
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+    async def call(key: str) -> Union[T, Exception]:
+        async with semaphore:
+            try:
+                return await func(key)
+            except Exception as e:
+                return e
+
+    unique = list(dict.fromkeys(keys))
+    results = dict(zip(unique, await asyncio.gather(*map(call, unique))))
+    return [results[key] for key in keys]
+
+
 class BaseEntity:
     """Base class for API entity interactions.
 
@@ -59,10 +271,7 @@ class BaseEntity:
         """
         self.fields = fields
         self.client = Client()
-        self.headers = {
-            "Authorization": f"Bearer {self.client.api_key}",
-            "Content-Type": "application/json",
-        }
+        self.headers = self.client.headers
 
     @property
     def id(self) -> Optional[str]:
@@ -83,6 +292,15 @@ class BaseEntity:
         """
         return self.fields.get("id")
 
+    @property
+    def async_client(self) -> AsyncClient:
+        """Get an asynchronous client sharing this entity's credentials.
+
+        Returns:
+            AsyncClient: A client for the async variants of the CRUD methods.
+        """
+        return AsyncClient(api_key=self.client.api_key, base_url=self.client.base_url)
+
     @handle_http_errors
     def save(self) -> Optional[Dict[str, Any]]:
         """Save the entity to the database."""
@@ -92,22 +310,14 @@ class BaseEntity:
             if "id" in self.fields:
                 url = f"{self.client.get_url(self.endpoint)}/{self.fields['id']}/"
                 try:
-                    response = requests.put(
-                        url,
-                        json=data,
-                        headers=self.headers,
-                    )
+                    response = self.client.put(url, json=data)
                     response.raise_for_status()
                     return dict(response.json())
                 except requests.exceptions.RequestException:
                     raise
             else:
                 url = f"{self.client.get_url(self.endpoint)}/"
-                response = requests.post(
-                    url,
-                    json=data,
-                    headers=self.headers,
-                )
+                response = self.client.post(url, json=data)
                 response.raise_for_status()
                 return dict(response.json())
         except requests.exceptions.HTTPError:
@@ -118,23 +328,22 @@ class BaseEntity:
         """Delete the entity from the database."""
         try:
             url = f"{self.client.get_url(self.endpoint)}/{record_id}/"
-            response = requests.delete(
-                url,
-                headers=self.headers,
-            )
+            response = self.client.delete(url)
             return response.status_code in [200, 204]
         except requests.exceptions.HTTPError:
             return False
 
     @handle_http_errors
     def fetch(self) -> None:
-        """Fetch the current entity's data from the API and update local fields."""
-        response = requests.get(
-            self.client.get_url(f"{self.endpoint}/{self.fields['id']}"),
-            headers=self.headers,
+        """Fetch the current entity's data from the API and update local fields.
+
+        Unchanged entities are served from the client's response cache.
+        """
+        self.fields.update(
+            self.client.get_json(
+                self.client.get_url(f"{self.endpoint}/{self.fields['id']}")
+            )
         )
-        response.raise_for_status()
-        self.fields.update(response.json())
 
     @handle_http_errors
     def to_record(self) -> Dict[str, Any]:
@@ -150,69 +359,307 @@ class BaseEntity:
     def exists(cls, record_id: str) -> bool:
         """Check if an entity exists."""
         client = Client()
-        headers = {
-            "Authorization": f"Bearer {client.api_key}",
-            "Content-Type": "application/json",
-        }
         url = f"{client.get_url(cls.endpoint)}/{record_id}/"
         logger.debug(f"GET request to {url} for exists check")
-        response = requests.get(
-            url,
-            headers=headers,
-        )
+        response = client.get(url)
         return response.status_code == 200
 
     @classmethod
-    @handle_http_errors
-    def all(cls, **kwargs: Any) -> Optional[list[Any]]:
-        """Retrieve all records from the API."""
+    def iter_all(
+        cls,
+        page_size: int = 100,
+        prefetch: bool = True,
+        max_pages: Optional[int] = DEFAULT_MAX_PAGES,
+        **filters: Any,
+    ) -> Iterator[Any]:
+        """Iterate over all records, fetching them page by page.
+
+        Pages are requested with skip and limit, and the next page is fetched
+        while the current one is processed, so memory use stays flat for
+        large collections.
+
+        Args:
+            page_size: Number of records fetched per request.
+            prefetch: Whether to fetch the next page in the background.
+            max_pages: Maximum number of pages to fetch, or None for no limit.
+            **filters: Additional query parameters for the API request.
+                Filters set to None are not sent.
+
+        Yields:
+            Any: The records, in the order returned by the API.
+        """
         client = Client()
-        headers = {
-            "Authorization": f"Bearer {client.api_key}",
-            "Content-Type": "application/json",
-        }
         url = f"{client.get_url(cls.endpoint)}/"
+        params = {k: v for k, v in filters.items() if v is not None}
 
-        try:
-            response = requests.get(
-                url,
-                params=kwargs,
-                headers=headers,
-            )
-            if response.status_code == 200:
-                result = response.json()
-                if not isinstance(result, list):
-                    result = [result] if result else []
-                return cast(list[Any], result)
+        def fetch_page(skip: int, limit: int) -> list[Any]:
+            response = client.get(url, params={**params, "skip": skip, "limit": limit})
             response.raise_for_status()
-        except requests.exceptions.RequestException:
-            raise
+            return _as_list(response.json())
 
-        return None
+        for page in iter_pages(
+            fetch_page, page_size=page_size, prefetch=prefetch, max_pages=max_pages
+        ):
+            yield from page
+
+    @classmethod
+    @handle_http_errors
+    def all(cls, **kwargs: Any) -> Optional[list[Any]]:
+        """Retrieve all records from the API.
+
+        Records are fetched page by page with iter_all(). If skip or limit is
+        given, only that slice is fetched, with a single request.
+        """
+        if "skip" not in kwargs and "limit" not in kwargs:
+            return list(cls.iter_all(**kwargs))
+
+        client = Client()
+        url = f"{client.get_url(cls.endpoint)}/"
+        params = {k: v for k, v in kwargs.items() if v is not None}
+        response = client.get(url, params=params)
+        response.raise_for_status()
+        return _as_list(response.json())
 
     @handle_http_errors
     def first(cls, **kwargs: Any) -> Optional[Dict[str, Any]]:
         """Retrieve the first record matching the query parameters."""
-        records = cls.all(**kwargs)
-        return records[0] if records else None
+        for record in cls.iter_all(page_size=1, prefetch=False, **kwargs):
+            return cast(Dict[str, Any], record)
+        return None
 
     @classmethod
     @handle_http_errors
     def from_id(cls, record_id: str) -> Optional["BaseEntity"]:
         """Create an entity instance from a record ID."""
         client = Client()
-        headers = {
-            "Authorization": f"Bearer {client.api_key}",
-            "Content-Type": "application/json",
-        }
         url = f"{client.get_url(cls.endpoint)}/{record_id}/"
         logger.debug(f"GET request to {url} for from_id")
-        response = requests.get(
-            url,
-            headers=headers,
+        return cls(**client.get_json(url))
+
+    @handle_http_errors
+    async def asave(self) -> Optional[Dict[str, Any]]:
+        """Save the entity to the database asynchronously."""
+        client = self.async_client
+        data = {k: v for k, v in self.fields.items() if k != "id"}
+
+        if "id" in self.fields:
+            url = f"{client.get_url(self.endpoint)}/{self.fields['id']}/"
+            response = await client.put(url, json=data)
+        else:
+            url = f"{client.get_url(self.endpoint)}/"
+            response = await client.post(url, json=data)
+        response.raise_for_status()
+        return dict(response.json())
+
+    @handle_http_errors
+    async def adelete(self, record_id: str) -> bool:
+        """Delete the entity from the database asynchronously."""
+        client = self.async_client
+        url = f"{client.get_url(self.endpoint)}/{record_id}/"
+        response = await client.delete(url)
+        return response.status_code in [200, 204]
+
+    @handle_http_errors
+    async def afetch(self) -> None:
+        """Fetch the current entity's data asynchronously and update local fields."""
+        client = self.async_client
+        self.fields.update(
+            await client.get_json(
+                client.get_url(f"{self.endpoint}/{self.fields['id']}")
+            )
         )
+
+    @classmethod
+    @handle_http_errors
+    async def aexists(cls, record_id: str) -> bool:
+        """Check if an entity exists asynchronously."""
+        client = AsyncClient()
+        url = f"{client.get_url(cls.endpoint)}/{record_id}/"
+        logger.debug(f"GET request to {url} for exists check")
+        response = await client.get(url)
+        return response.status_code == 200
+
+    @classmethod
+    async def aiter_all(
+        cls,
+        page_size: int = 100,
+        prefetch: bool = True,
+        max_pages: Optional[int] = DEFAULT_MAX_PAGES,
+        **filters: Any,
+    ) -> AsyncIterator[Any]:
+        """Iterate over all records asynchronously, fetching them page by page.
+
+        Asynchronous variant of iter_all().
+        """
+        if page_size < 1:
+            raise ValueError("page_size must be at least 1")
+        client = AsyncClient()
+        url = f"{client.get_url(cls.endpoint)}/"
+        params = {k: v for k, v in filters.items() if v is not None}
+
+        async def fetch_page(skip: int) -> list[Any]:
+            response = await client.get(
+                url, params={**params, "skip": skip, "limit": page_size}
+            )
+            response.raise_for_status()
+            return _as_list(response.json())
+
+        skip = 0
+        previous = None
+        pages = 1
+        next_page: "Optional[asyncio.Future[list[Any]]]" = None
+        try:
+            page = await fetch_page(skip)
+            while True:
+                if _repeats_page(page, previous):
+                    # The endpoint ignores skip and limit and repeats a page
+                    return
+                last = len(page) != page_size
+                if not last and max_pages is not None and pages >= max_pages:
+                    _warn_max_pages(max_pages)
+                    last = True
+                if prefetch and not last:
+                    next_page = asyncio.ensure_future(fetch_page(skip + page_size))
+                for record in page:
+                    yield record
+                if last:
+                    # A short page is the last one, a longer one means the
+                    # endpoint ignores skip and limit and returned everything
+                    return
+                skip += page_size
+                pages += 1
+                previous = page
+                if next_page is None:
+                    page = await fetch_page(skip)
+                else:
+                    page, next_page = await next_page, None
+        finally:
+            if next_page is not None:
+                next_page.cancel()
+
+    @classmethod
+    @handle_http_errors
+    async def aall(cls, **kwargs: Any) -> Optional[list[Any]]:
+        """Retrieve all records from the API asynchronously.
+
+        Asynchronous variant of all().
+        """
+        if "skip" not in kwargs and "limit" not in kwargs:
+            return [record async for record in cls.aiter_all(**kwargs)]
+
+        client = AsyncClient()
+        url = f"{client.get_url(cls.endpoint)}/"
+        params = {k: v for k, v in kwargs.items() if v is not None}
+        response = await client.get(url, params=params)
         response.raise_for_status()
-        return cls(**response.json())
+        return _as_list(response.json())
+
+    @classmethod
+    @handle_http_errors
+    async def afrom_id(cls, record_id: str) -> Optional["BaseEntity"]:
+        """Create an entity instance from a record ID asynchronously."""
+        client = AsyncClient()
+        url = f"{client.get_url(cls.endpoint)}/{record_id}/"
+        logger.debug(f"GET request to {url} for from_id")
+        return cls(**await client.get_json(url))
+
+    #: :no-index: Default number of requests in flight for from_ids and exists_many
+    bulk_concurrency: int = 8
+
+    @classmethod
+    def from_ids(
+        cls, record_ids: Iterable[str], max_concurrency: Optional[int] = None
+    ) -> List[Union["BaseEntity", Exception]]:
+        """Create entity instances from many record IDs.
+
+        The records are fetched in parallel over the shared connection pool,
+        each distinct ID once.
+
+        Args:
+            record_ids: The record IDs.
+            max_concurrency: Maximum number of requests in flight. Defaults to
+                bulk_concurrency; keep it within the connection pool size.
+
+        Returns:
+            List[Union[BaseEntity, Exception]]: For each ID, in input order, the
+                entity or the exception raised fetching it, e.g. an HTTPError for
+                a missing record.
+        """
+        client = Client()
+
+        def fetch(record_id: str) -> Any:
+            return client.get_json(f"{client.get_url(cls.endpoint)}/{record_id}/")
+
+        ids = list(record_ids)
+        payloads = _map_unique(fetch, ids, max_concurrency or cls.bulk_concurrency)
+        return [
+            payload if isinstance(payload, Exception) else cls(**payload)
+            for payload in payloads
+        ]
+
+    @classmethod
+    def exists_many(
+        cls, record_ids: Iterable[str], max_concurrency: Optional[int] = None
+    ) -> List[Union[bool, Exception]]:
+        """Check for many record IDs whether the entity exists.
+
+        Args:
+            record_ids: The record IDs.
+            max_concurrency: Maximum number of requests in flight. Defaults to
+                bulk_concurrency; keep it within the connection pool size.
+
+        Returns:
+            List[Union[bool, Exception]]: For each ID, in input order, whether
+                it exists, or the exception raised checking it.
+        """
+        client = Client()
+
+        def exists(record_id: str) -> bool:
+            response = client.get(f"{client.get_url(cls.endpoint)}/{record_id}/")
+            return response.status_code == 200
+
+        return _map_unique(
+            exists, list(record_ids), max_concurrency or cls.bulk_concurrency
+        )
+
+    @classmethod
+    async def afrom_ids(
+        cls, record_ids: Iterable[str], max_concurrency: Optional[int] = None
+    ) -> List[Union["BaseEntity", Exception]]:
+        """Create entity instances from many record IDs asynchronously.
+
+        Asynchronous variant of from_ids().
+        """
+        client = AsyncClient()
+
+        async def fetch(record_id: str) -> Any:
+            return await client.get_json(f"{client.get_url(cls.endpoint)}/{record_id}/")
+
+        payloads = await _amap_unique(
+            fetch, list(record_ids), max_concurrency or cls.bulk_concurrency
+        )
+        return [
+            payload if isinstance(payload, Exception) else cls(**payload)
+            for payload in payloads
+        ]
+
+    @classmethod
+    async def aexists_many(
+        cls, record_ids: Iterable[str], max_concurrency: Optional[int] = None
+    ) -> List[Union[bool, Exception]]:
+        """Check for many record IDs whether the entity exists asynchronously.
+
+        Asynchronous variant of exists_many().
+        """
+        client = AsyncClient()
+
+        async def exists(record_id: str) -> bool:
+            response = await client.get(f"{client.get_url(cls.endpoint)}/{record_id}/")
+            return response.status_code == 200
+
+        return await _amap_unique(
+            exists, list(record_ids), max_concurrency or cls.bulk_concurrency
+        )
 
     def update(self) -> None:
         """Update entity in database."""
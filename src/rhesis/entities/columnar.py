@@ -0,0 +1,189 @@
+"""Columnar Arrow representation of test set tests.
+
+Tests are stored in an Arrow table with one column per commonly used field:
+the prompt content and language are flattened into their own columns, and the
+low-cardinality behavior, category and topic columns are dictionary encoded.
+Any other fields, and values that do not fit a column, are kept as JSON in the
+"extra" column so that tests round-trip unchanged.
+"""
+
+import json
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List
+
+if TYPE_CHECKING:
+    import pyarrow as pa
+
+#: Top-level test fields stored in dictionary-encoded columns
+CATEGORICAL_FIELDS = ("behavior", "category", "topic")
+
+#: Number of tests converted per record batch
+DEFAULT_BATCH_SIZE = 10_000
+
+
+def _import_pyarrow() -> Any:
+    """Import pyarrow, which is only needed for columnar test sets."""
+    try:
+        import pyarrow
+    except ImportError:
+        raise ImportError(
+            "pyarrow is required for columnar test sets. "
+            "Install it with: pip install pyarrow"
+        )
+    return pyarrow
+
+
+def schema() -> "pa.Schema":
+    """Get the Arrow schema of columnar tests.
+
+    Returns:
+        pa.Schema: The schema.
+    """
+    pa = _import_pyarrow()
+    categorical = pa.dictionary(pa.int32(), pa.string())
+    return pa.schema(
+        [
+            pa.field("id", pa.string()),
+            pa.field("prompt_content", pa.string()),
+            pa.field("prompt_language_code", categorical),
+            *[pa.field(name, categorical) for name in CATEGORICAL_FIELDS],
+            pa.field("extra", pa.string()),
+        ]
+    )
+
+
+def _split_test(test: Any) -> Dict[str, Any]:
+    """Split a test into its column values and the JSON of the remaining fields."""
+    if not isinstance(test, dict):
+        return {"extra": json.dumps({"__value__": test}, default=str)}
+
+    row: Dict[str, Any] = {}
+    extra = dict(test)
+
+    if isinstance(extra.get("id"), str):
+        row["id"] = extra.pop("id")
+    for name in CATEGORICAL_FIELDS:
+        if isinstance(extra.get(name), str):
+            row[name] = extra.pop(name)
+
+    prompt = extra.get("prompt")
+    if isinstance(prompt, dict):
+        prompt = dict(prompt)
+        if isinstance(prompt.get("content"), str):
+            row["prompt_content"] = prompt.pop("content")
+        if isinstance(prompt.get("language_code"), str):
+            row["prompt_language_code"] = prompt.pop("language_code")
+        if prompt or not ("prompt_content" in row or "prompt_language_code" in row):
+            extra["prompt"] = prompt
+        else:
+            # Restored from the prompt columns
+            del extra["prompt"]
+
+    row["extra"] = json.dumps(extra, default=str) if extra else None
+    return row
+
+
+def _join_test(row: Dict[str, Any]) -> Any:
+    """Rebuild a test from its column values, inverting _split_test."""
+    extra = json.loads(row["extra"]) if row.get("extra") else {}
+    if "__value__" in extra:
+        return extra["__value__"]
+
+    test: Dict[str, Any] = {}
+    if row.get("id") is not None:
+        test["id"] = row["id"]
+    prompt = extra.pop("prompt", None)
+    if prompt is None and (
+        row.get("prompt_content") is not None
+        or row.get("prompt_language_code") is not None
+    ):
+        prompt = {}
+    if isinstance(prompt, dict):
+        if row.get("prompt_content") is not None:
+            prompt["content"] = row["prompt_content"]
+        if row.get("prompt_language_code") is not None:
+            prompt["language_code"] = row["prompt_language_code"]
+        test["prompt"] = prompt
+    elif prompt is not None:
+        test["prompt"] = prompt
+    for name in CATEGORICAL_FIELDS:
+        if row.get(name) is not None:
+            test[name] = row[name]
+    test.update(extra)
+    return test
+
+
+def tests_to_record_batch(tests: List[Any]) -> "pa.RecordBatch":
+    """Convert a list of tests to an Arrow record batch.
+
+    Args:
+        tests: The tests to convert.
+
+    Returns:
+        pa.RecordBatch: The tests in the columnar schema.
+    """
+    pa = _import_pyarrow()
+    rows = [_split_test(test) for test in tests]
+    target = schema()
+    columns = [
+        pa.array([row.get(field.name) for row in rows], type=field.type)
+        for field in target
+    ]
+    return pa.RecordBatch.from_arrays(columns, schema=target)
+
+
+def tests_to_table(
+    tests: Iterable[Any], batch_size: int = DEFAULT_BATCH_SIZE
+) -> "pa.Table":
+    """Convert tests to an Arrow table, a batch at a time.
+
+    Only one batch of tests is held as Python objects at once, so the input
+    can be a lazy iterator such as TestSet.iter_tests().
+
+    Args:
+        tests: The tests to convert.
+        batch_size: Number of tests converted per record batch.
+
+    Returns:
+        pa.Table: The tests in the columnar schema.
+    """
+    pa = _import_pyarrow()
+    batches = []
+    batch: List[Any] = []
+    for test in tests:
+        batch.append(test)
+        if len(batch) == batch_size:
+            batches.append(tests_to_record_batch(batch))
+            batch = []
+    if batch or not batches:
+        batches.append(tests_to_record_batch(batch))
+    table = pa.Table.from_batches(batches, schema=schema())
+    # Give each dictionary column a single dictionary across batches
+    return table.unify_dictionaries().combine_chunks()
+
+
+def iter_table_tests(
+    table: "pa.Table", batch_size: int = DEFAULT_BATCH_SIZE
+) -> Iterator[List[Any]]:
+    """Convert an Arrow table back to tests, a batch at a time.
+
+    Args:
+        table: A table in the columnar schema.
+        batch_size: Number of tests converted per batch.
+
+    Yields:
+        List[Any]: The tests of each batch, in order.
+    """
+    for batch in table.to_batches(max_chunksize=batch_size):
+        yield [_join_test(row) for row in batch.to_pylist()]
+
+
+def table_to_tests(table: "pa.Table") -> List[Any]:
+    """Convert an Arrow table back to a list of tests.
+
+    Args:
+        table: A table in the columnar schema.
+
+    Returns:
+        List[Any]: The tests, as they were before conversion.
+    """
+    return [test for batch in iter_table_tests(table) for test in batch]
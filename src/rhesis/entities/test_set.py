@@ -1,17 +1,71 @@
+import hashlib
+import json
 import os
+import threading
 import requests
-import pandas as pd
-import tqdm
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Any, cast, Optional, Union, Dict, List
+from itertools import islice
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    cast,
+    Optional,
+    Union,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+)
 from pathlib import Path
-from jinja2 import Template
 
-from rhesis.entities import BaseEntity
-from rhesis.entities.base_entity import handle_http_errors
-from rhesis.utils import count_tokens
+from rhesis.client import _import_httpx
+from rhesis.config import get_cache_dir
+from rhesis.entities import BaseEntity, columnar
+from rhesis.entities.base_entity import handle_http_errors, iter_pages
+from rhesis.utils import count_tokens_batch
 from rhesis.services.llm import LLMService
 
+if TYPE_CHECKING:
+    import pandas as pd
+    import pyarrow as pa
+
+    from rhesis.entities.test_set_cache import TestSetCache
+
+
+class _ProgressBody:
+    """Request body that advances a progress bar as its bytes are sent.
+
+    The HTTP client reads the body in blocks, so progress is counted as the
+    upload happens rather than when the response arrives. The body has a
+    length, so it is still sent with a Content-Length header, and it can be
+    read again if the request is retried, in which case the bytes counted by
+    the previous attempt are taken back.
+    """
+
+    BLOCK_SIZE = 64 * 1024
+
+    def __init__(self, data: bytes, pbar: Any, lock: threading.Lock) -> None:
+        self.data = data
+        self.pbar = pbar
+        self.lock = lock
+        self.sent = 0
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def __iter__(self) -> Iterator[bytes]:
+        with self.lock:
+            if self.sent:
+                self.pbar.update(-self.sent)
+                self.sent = 0
+        for start in range(0, len(self.data), self.BLOCK_SIZE):
+            block = self.data[start : start + self.BLOCK_SIZE]
+            yield block
+            with self.lock:
+                self.pbar.update(len(block))
+                self.sent += len(block)
+
 
 class TestSet(BaseEntity):
     """A class representing a test set in the API.
@@ -41,6 +95,8 @@ class TestSet(BaseEntity):
 
     #: :no-index: Cached list of tests for the test set
     tests: Optional[list[Any]] = None
+    #: :no-index: Columnar store of the tests, used when tests is None
+    table: Optional["pa.Table"] = None
     categories: Optional[list[str]] = None
     topics: Optional[list[str]] = None
     test_count: Optional[int] = None
@@ -60,13 +116,16 @@ class TestSet(BaseEntity):
         self.metadata = fields.get("metadata", None)
 
     @handle_http_errors
-    def get_tests(self, **kwargs: Any) -> list[Any]:
+    def get_tests(self, use_cache: bool = False, **kwargs: Any) -> list[Any]:
         """Retrieve tests for the test set from the API.
 
         If tests are already cached, returns the cached version.
         Otherwise, fetches tests from the API.
 
         Args:
+            use_cache: Whether to send a conditional request and keep the
+                response in the in-memory response cache. Off by default, since
+                the tests of a large test set would take up most of the cache.
             **kwargs: Additional query parameters for the API request.
 
         Returns:
@@ -74,43 +133,243 @@ class TestSet(BaseEntity):
         """
         if self.tests is not None:
             return self.tests
+        if self.table is not None:
+            return columnar.table_to_tests(self.table)
+
+        return cast(
+            list[Any],
+            self.client.get_json(
+                self.client.get_url(f"{self.endpoint}/{self.id}/tests"),
+                params=kwargs,
+                use_cache=use_cache,
+            ),
+        )
+
+    @handle_http_errors
+    async def aget_tests(self, use_cache: bool = False, **kwargs: Any) -> list[Any]:
+        """Retrieve tests for the test set from the API asynchronously.
+
+        If tests are already cached, returns the cached version.
 
-        response = requests.get(
-            self.client.get_url(f"{self.endpoint}/{self.id}/tests"),
-            params=kwargs,
-            headers=self.headers,
+        Args:
+            use_cache: Whether to send a conditional request and keep the
+                response in the in-memory response cache. Off by default, since
+                the tests of a large test set would take up most of the cache.
+            **kwargs: Additional query parameters for the API request.
+
+        Returns:
+            list[Any]: A list of tests associated with the test set.
+        """
+        if self.tests is not None:
+            return self.tests
+        if self.table is not None:
+            return columnar.table_to_tests(self.table)
+
+        client = self.async_client
+        return cast(
+            list[Any],
+            await client.get_json(
+                client.get_url(f"{self.endpoint}/{self.id}/tests"),
+                params=kwargs,
+                use_cache=use_cache,
+            ),
         )
-        response.raise_for_status()
-        return cast(list[Any], response.json())
+
+    def iter_test_pages(
+        self, page_size: int = 100, prefetch: bool = True, **kwargs: Any
+    ) -> Iterator[list[Any]]:
+        """Iterate over the tests of the test set one page at a time.
+
+        Pages are requested with skip and limit parameters, and the next page is
+        fetched in the background while the current one is processed. If tests
+        are already cached, the cached list is yielded in pages instead.
+
+        Args:
+            page_size: Number of tests per page. Defaults to 100.
+            prefetch: Whether to fetch the next page in the background.
+            **kwargs: Additional query parameters for the API request.
+
+        Yields:
+            list[Any]: The pages of tests, in order.
+
+        Raises:
+            requests.exceptions.HTTPError: If a page request fails.
+        """
+        if self.tests is not None:
+            tests = self.tests
+            for start in range(0, len(tests), page_size):
+                yield tests[start : start + page_size]
+            return
+        if self.table is not None:
+            yield from columnar.iter_table_tests(self.table, batch_size=page_size)
+            return
+
+        url = self.client.get_url(f"{self.endpoint}/{self.id}/tests")
+
+        def fetch_page(skip: int, limit: int) -> list[Any]:
+            response = self.client.get(
+                url, params={**kwargs, "skip": skip, "limit": limit}
+            )
+            response.raise_for_status()
+            return cast(list[Any], response.json())
+
+        yield from iter_pages(fetch_page, page_size=page_size, prefetch=prefetch)
+
+    def iter_tests(
+        self, page_size: int = 100, prefetch: bool = True, **kwargs: Any
+    ) -> Iterator[Any]:
+        """Iterate over the tests of the test set without loading them all at once.
+
+        Only the current page, plus the prefetched next page, is held in memory.
+
+        Args:
+            page_size: Number of tests per request. Defaults to 100.
+            prefetch: Whether to fetch the next page in the background.
+            **kwargs: Additional query parameters for the API request.
+
+        Yields:
+            Any: The tests, in order.
+
+        Example:
+            >>> test_set = TestSet(id='123')
+            >>> for test in test_set.iter_tests(page_size=500):
+            ...     process(test)
+        """
+        for page in self.iter_test_pages(page_size, prefetch=prefetch, **kwargs):
+            yield from page
+
+    def _test_source(self, page_size: Optional[int]) -> Iterable[Any]:
+        """Get the tests to process, streamed in pages if page_size is given.
+
+        Without a page size, the full list of tests is fetched and cached,
+        unless the test set is columnar.
+
+        Args:
+            page_size: Number of tests per page, or None to load all tests.
+
+        Returns:
+            Iterable[Any]: The tests of the test set.
+        """
+        if page_size is not None:
+            return self.iter_tests(page_size=page_size)
+        if self.tests is None and self.table is not None:
+            return self.iter_tests(page_size=columnar.DEFAULT_BATCH_SIZE)
+        if self.tests is None:
+            self.tests = self.get_tests()
+        return self.tests or []
+
+    @classmethod
+    def from_arrow(cls, table: "pa.Table", **fields: Any) -> "TestSet":
+        """Create a columnar test set from an Arrow table.
+
+        Args:
+            table: The tests, in the schema of rhesis.entities.columnar.
+            **fields: Other test set fields, such as id or name.
+
+        Returns:
+            TestSet: A test set backed by the table.
+        """
+        test_set = cls(**fields)
+        test_set.table = table
+        return test_set
+
+    def to_arrow(self, page_size: Optional[int] = None) -> "pa.Table":
+        """Convert the tests to a columnar Arrow table.
+
+        The prompt content and language code are flattened into their own
+        columns, behavior, category and topic are dictionary encoded, and all
+        other fields are kept as JSON in an "extra" column.
+
+        Args:
+            page_size: Number of tests fetched per request if the tests are
+                not loaded yet. Defaults to 100.
+
+        Returns:
+            pa.Table: The tests as a table.
+        """
+        if self.tests is None and self.table is not None:
+            return self.table
+        if self.tests is not None:
+            return columnar.tests_to_table(self.tests)
+        return columnar.tests_to_table(self.iter_tests(page_size=page_size or 100))
+
+    def convert_to_columnar(self, page_size: Optional[int] = None) -> None:
+        """Store the tests in a columnar Arrow table instead of a list.
+
+        The table takes several times less memory than the list of dicts it
+        replaces, and to_pandas and to_parquet convert it without copying
+        the tests through Python objects. Methods that need dicts, such as
+        to_dict, convert rows back on demand.
+
+        Args:
+            page_size: Number of tests fetched per request if the tests are
+                not loaded yet. Defaults to 100.
+        """
+        self.table = self.to_arrow(page_size=page_size)
+        self.tests = None
 
     @handle_http_errors
-    def load(self, format: str = "pandas") -> Union[pd.DataFrame, list[Any]]:
+    def load(
+        self,
+        format: str = "pandas",
+        page_size: Optional[int] = None,
+        cache: Optional["TestSetCache"] = None,
+    ) -> Union["pd.DataFrame", "pa.Table", list[Any]]:
         """Load and format the test set tests.
 
         Fetches the test set data and its tests, then returns them in the specified format.
 
         Args:
             format (str, optional): The desired output format.
-                Options are "pandas", "parquet", or "dict". Defaults to "pandas".
+                Options are "pandas", "parquet", "arrow", or "dict".
+                Defaults to "pandas". "arrow" converts the test set to columnar.
+            page_size (int, optional): If given, tests are fetched in pages of
+                this size. The pandas and parquet formats then build the
+                DataFrame page by page without caching the tests.
+            cache (TestSetCache, optional): If given, the tests are read from
+                this local cache when it holds the test set's current version,
+                and stored in it otherwise. The test set becomes columnar.
 
         Returns:
-            Union[pd.DataFrame, list[Any]]: The tests in the specified format.
+            Union[pd.DataFrame, pa.Table, list[Any]]: The tests in the specified format.
                 Returns a pandas DataFrame if format="pandas",
-                writes to parquet file if format="parquet",
+                writes to parquet file if format="parquet" (returning the
+                DataFrame, or the Arrow table of a columnar test set),
+                an Arrow table if format="arrow",
                 or a list of dictionaries if format="dict".
 
         Raises:
             ValueError: If an invalid format is specified.
             ImportError: If pyarrow is not installed when using parquet format.
         """
+        import pandas as pd
+
         self.fetch()
-        tests = self.get_tests()
-        if tests is None:
-            raise ValueError("Failed to fetch tests")
-        self.tests = tests
+        if cache is not None:
+            self._load_cached(cache, page_size=page_size)
+        if format == "arrow":
+            self.convert_to_columnar(page_size=page_size)
+            return self.table
+        if self.tests is None and self.table is not None:
+            # Export columnar test sets directly from the table
+            if format == "pandas":
+                return self.to_pandas()
+            elif format == "parquet":
+                return self.to_parquet()
+            elif format == "dict":
+                return self.get_tests()
+            raise ValueError(f"Invalid format: {format}")
+        if page_size is not None and format in ("pandas", "parquet"):
+            df = self.to_pandas(page_size=page_size)
+        else:
+            tests = self.get_tests()
+            if tests is None:
+                raise ValueError("Failed to fetch tests")
+            self.tests = tests
+            df = None
 
         if format == "pandas":
-            return pd.DataFrame(self.tests)
+            return df if df is not None else pd.DataFrame(self.tests)
         elif format == "parquet":
             try:
                 import pyarrow  # noqa: F401
@@ -119,7 +378,8 @@ class TestSet(BaseEntity):
                     "pyarrow is required for parquet support. "
                     "Install it with: pip install pyarrow"
                 )
-            df = pd.DataFrame(self.tests)
+            if df is None:
+                df = pd.DataFrame(self.tests)
             file_path = f"test_set_{self.id}.parquet"
             df.to_parquet(file_path)
             return df
@@ -128,30 +388,264 @@ class TestSet(BaseEntity):
         else:
             raise ValueError(f"Invalid format: {format}")
 
+    def _load_cached(self, cache: "TestSetCache", page_size: Optional[int]) -> None:
+        """Make the test set columnar, reading the tests from a local cache.
+
+        On a miss the tests are fetched and stored in the cache. Test sets
+        without an updated_at timestamp are not cached, since a cached copy
+        could not be validated.
+        """
+        updated_at = self.fields.get("updated_at")
+        if self.id is None or updated_at is None:
+            return
+        table = cache.get(self.id, updated_at)
+        if table is None:
+            table = cache.set(self.id, updated_at, self.to_arrow(page_size=page_size))
+        self.table = table
+        self.tests = None
+
+    #: :no-index: Size of the chunks downloads are written in
+    download_chunk_size: int = 1024 * 1024
+
     @handle_http_errors
-    def download(self, format: str = "csv", path: str = ".") -> bool:
+    def download(
+        self,
+        format: str = "csv",
+        path: str = ".",
+        checksum: Optional[str] = None,
+        max_resumes: int = 3,
+    ) -> bool:
         """Download the test set to a local file.
 
         Downloads the test set data and saves it to the specified path
-        in the requested format.
+        in the requested format. The body is streamed in chunks to a
+        '.part' file next to the destination, which is renamed into place once
+        complete. If the transfer is interrupted, it is resumed with an HTTP
+        Range request, both within this call and from a '.part' file left
+        behind by an earlier call. The ETag or Last-Modified value of the
+        response is saved in a '.part.meta' file and sent as If-Range, so a
+        file that changed in between is downloaded again from the start; a
+        partial file without a saved validator is discarded.
 
         Args:
             format: The file format to download. Defaults to "csv".
             path: The path where the file should be saved.
                 Can be a directory or a full file path. Defaults to current directory.
+            checksum: Optional expected digest of the file, as
+                "<algorithm>:<hex digest>" (e.g. "sha256:9f86...") or a bare
+                SHA-256 hex digest.
+            max_resumes: Maximum number of times an interrupted transfer is
+                resumed within this call.
 
         Returns:
             bool: True if the download was successful.
 
+        Raises:
+            ValueError: If the downloaded file does not match the checksum.
+
         Note:
             The file will be named 'test_set_{id}.{format}' where id is the test set ID.
         """
-        response = requests.get(
-            self.client.get_url(f"{self.endpoint}/{self.id}/download"),
-            headers=self.headers,
-        )
-        response.raise_for_status()
+        file_path = self._download_path(format, path)
+        part_path = f"{file_path}.part"
+        url = self.client.get_url(f"{self.endpoint}/{self.id}/download")
+        resumes = 0
+
+        while True:
+            headers, offset = self._range_headers(part_path)
+            response = self.client.get(url, headers=headers, stream=True)
+            try:
+                if response.status_code == 416 and offset:
+                    # The partial file is not a prefix of the current body
+                    self._discard_part(part_path)
+                    continue
+                response.raise_for_status()
+                self._save_validator(part_path, response.headers)
+                with self._open_part(part_path, response.status_code, offset) as f:
+                    for chunk in response.iter_content(self.download_chunk_size):
+                        f.write(chunk)
+                break
+            except (
+                requests.exceptions.ChunkedEncodingError,
+                requests.exceptions.ConnectionError,
+            ):
+                if resumes >= max_resumes:
+                    raise
+                resumes += 1
+            finally:
+                response.close()
+
+        self._finish_download(part_path, file_path, checksum)
+        return True
+
+    @handle_http_errors
+    async def adownload(
+        self,
+        format: str = "csv",
+        path: str = ".",
+        checksum: Optional[str] = None,
+        max_resumes: int = 3,
+    ) -> bool:
+        """Download the test set to a local file asynchronously.
+
+        Streams and resumes the transfer like download().
 
+        Args:
+            format: The file format to download. Defaults to "csv".
+            path: The path where the file should be saved.
+                Can be a directory or a full file path. Defaults to current directory.
+            checksum: Optional expected digest of the file, as
+                "<algorithm>:<hex digest>" or a bare SHA-256 hex digest.
+            max_resumes: Maximum number of times an interrupted transfer is
+                resumed within this call.
+
+        Returns:
+            bool: True if the download was successful.
+
+        Raises:
+            ValueError: If the downloaded file does not match the checksum.
+        """
+        httpx = _import_httpx()
+
+        file_path = self._download_path(format, path)
+        part_path = f"{file_path}.part"
+        client = self.async_client
+        url = client.get_url(f"{self.endpoint}/{self.id}/download")
+        resumes = 0
+
+        while True:
+            headers, offset = self._range_headers(part_path)
+            response = await client.get(url, headers=headers, stream=True)
+            try:
+                if response.status_code == 416 and offset:
+                    self._discard_part(part_path)
+                    continue
+                response.raise_for_status()
+                self._save_validator(part_path, response.headers)
+                with self._open_part(part_path, response.status_code, offset) as f:
+                    async for chunk in response.aiter_bytes(self.download_chunk_size):
+                        f.write(chunk)
+                break
+            except httpx.TransportError:
+                if resumes >= max_resumes:
+                    raise
+                resumes += 1
+            finally:
+                await response.aclose()
+
+        self._finish_download(part_path, file_path, checksum)
+        return True
+
+    @staticmethod
+    def _range_headers(part_path: str) -> tuple[Dict[str, str], int]:
+        """Build the headers resuming a download from a partial file.
+
+        The transfer is only resumed if the validator of the response the
+        partial file came from was saved, and is sent as If-Range so the server
+        returns the whole body if the file has changed since.
+
+        Args:
+            part_path: The path of the partial file.
+
+        Returns:
+            tuple[Dict[str, str], int]: The request headers and the offset
+                the transfer resumes from.
+        """
+        offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+        if not offset:
+            return {}, 0
+        try:
+            with open(f"{part_path}.meta") as f:
+                validator = f.read().strip()
+        except OSError:
+            validator = ""
+        if not validator:
+            # Without a validator the partial file may be from another version
+            return {}, 0
+        return {"Range": f"bytes={offset}-", "If-Range": validator}, offset
+
+    @staticmethod
+    def _save_validator(part_path: str, headers: Any) -> None:
+        """Save the strong validator of a response next to its partial file.
+
+        The ETag is preferred over Last-Modified; weak ETags cannot be used
+        with If-Range. Without a validator, a stale one is removed.
+        """
+        etag = headers.get("ETag")
+        if etag and not etag.startswith("W/"):
+            validator = str(etag)
+        else:
+            validator = str(headers.get("Last-Modified") or "")
+        meta_path = f"{part_path}.meta"
+        if validator:
+            with open(meta_path, "w") as f:
+                f.write(validator)
+        elif os.path.exists(meta_path):
+            os.remove(meta_path)
+
+    @staticmethod
+    def _discard_part(part_path: str) -> None:
+        """Remove a partial file and its saved validator."""
+        for stale_path in (part_path, f"{part_path}.meta"):
+            if os.path.exists(stale_path):
+                os.remove(stale_path)
+
+    @staticmethod
+    def _open_part(part_path: str, status_code: int, offset: int) -> Any:
+        """Open the partial file for the body of a download response.
+
+        A 206 response continues the partial file at offset; any other
+        successful response carries the whole body, so the file is truncated.
+        """
+        if status_code == 206 and offset:
+            f = open(part_path, "r+b")
+            f.seek(offset)
+            f.truncate()
+            return f
+        return open(part_path, "wb")
+
+    @staticmethod
+    def _finish_download(
+        part_path: str, file_path: str, checksum: Optional[str]
+    ) -> None:
+        """Verify a completed download and move it into place atomically.
+
+        Args:
+            part_path: The path of the completed partial file.
+            file_path: The final path of the file.
+            checksum: Optional expected digest, as "<algorithm>:<hex digest>"
+                or a bare SHA-256 hex digest.
+
+        Raises:
+            ValueError: If the file does not match the checksum. The partial
+                file is removed so the next attempt starts over.
+        """
+        if checksum:
+            algorithm, _, expected = checksum.rpartition(":")
+            digest = hashlib.new(algorithm or "sha256")
+            with open(part_path, "rb") as f:
+                for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                    digest.update(chunk)
+            if digest.hexdigest().lower() != expected.strip().lower():
+                TestSet._discard_part(part_path)
+                raise ValueError(
+                    f"Checksum mismatch for {file_path}: "
+                    f"expected {expected}, got {digest.hexdigest()}"
+                )
+        os.replace(part_path, file_path)
+        if os.path.exists(f"{part_path}.meta"):
+            os.remove(f"{part_path}.meta")
+
+    def _download_path(self, format: str, path: str) -> str:
+        """Build the local file path for a download, creating directories as needed.
+
+        Args:
+            format: The file format of the download.
+            path: The directory where the file should be saved.
+
+        Returns:
+            str: The path of the file to write.
+        """
         # Get the directory path
         dir_path = os.path.dirname(path)
 
@@ -160,10 +654,7 @@ class TestSet(BaseEntity):
             if not os.path.exists(dir_path):
                 os.makedirs(dir_path)
 
-        file_path = os.path.join(path, f"test_set_{self.id}.{format}")
-        with open(file_path, "wb") as f:
-            f.write(response.content)
-        return True
+        return os.path.join(path, f"test_set_{self.id}.{format}")
 
     def _prepare_test_set_data(self) -> dict:
         """Prepare the test set data for upload.
@@ -171,7 +662,10 @@ class TestSet(BaseEntity):
         Returns:
             dict: The prepared test set data.
         """
-        if not self.tests:
+        tests = self.tests
+        if tests is None and self.table is not None:
+            tests = columnar.table_to_tests(self.table)
+        if not tests:
             raise ValueError(
                 "No tests to upload. Please add tests to the test set first."
             )
@@ -181,7 +675,7 @@ class TestSet(BaseEntity):
             "description": self.description,
             "short_description": self.short_description,
             "metadata": self.metadata,
-            "tests": self.tests,
+            "tests": tests,
         }
 
     def _update_from_response(self, response_data: dict) -> None:
@@ -217,13 +711,49 @@ class TestSet(BaseEntity):
                     # If either is not a dict, just use the response value
                     self.metadata = response_data["metadata"]
 
-    def upload(self) -> None:
+    #: :no-index: Endpoint template receiving the tests of chunks after the first.
+    #: Only used by chunked uploads; override it if the API appends tests to an
+    #: existing test set through another endpoint.
+    upload_chunk_endpoint: str = "test_sets/{id}/tests"
+
+    def upload(
+        self,
+        chunk_size: Optional[int] = None,
+        max_concurrency: int = 4,
+        resume: bool = False,
+        journal_path: Optional[str] = None,
+    ) -> None:
         """Upload a new test set to the API.
 
         Uploads the test set data to the /test_set/bulk endpoint to create
         a test set with multiple tests in a single operation. This method
         is only for test sets that do not yet exist in the database.
 
+        By default all tests are sent in a single request. Chunked upload is
+        opt-in: with chunk_size, the tests are split into chunks, the first
+        chunk creates the test set through /test_set/bulk, and the remaining
+        chunks are added to it through upload_chunk_endpoint with up to
+        max_concurrency requests in flight. It requires an API that accepts
+        tests for an existing test set on that endpoint.
+
+        If a chunk fails, the partially uploaded test set is deleted again
+        before the error is raised. With resume, it is kept instead and the
+        completed chunks are recorded in a journal file, so calling upload()
+        again only sends the chunks that did not succeed. The journal is
+        removed once all chunks are uploaded.
+
+        The progress bar counts the bytes of the request bodies as they are
+        sent.
+
+        Args:
+            chunk_size: Maximum number of tests per request. None (the
+                default) to upload all tests in a single request.
+            max_concurrency: Maximum number of chunks uploaded at once.
+            resume: Whether to keep a partially uploaded test set and a resume
+                journal if a chunk fails, instead of deleting the test set.
+            journal_path: Path of the resume journal. Defaults to a file in
+                the cache directory derived from the test set contents.
+
         Returns:
             None: Updates the current TestSet instance with the server response.
 
@@ -231,62 +761,272 @@ class TestSet(BaseEntity):
             ValueError: If the test set already has an ID.
             requests.exceptions.HTTPError: If the API request fails.
         """
+        from tqdm import tqdm
+
+        # Prepare test set data
+        test_set = self._prepare_test_set_data()
+        test_count = len(test_set["tests"])
+
+        chunks = self._split_upload(test_set, chunk_size)
+        fingerprint = self._upload_fingerprint(chunks)
+        if journal_path is None:
+            journal_path = str(get_cache_dir() / "uploads" / f"{fingerprint}.json")
+        journal = self._read_upload_journal(journal_path, fingerprint) if resume else {}
+
         # Check if the test set already has an ID
-        if self.id is not None:
+        if self.id is not None and journal.get("id") != self.id:
             raise ValueError(
                 "Cannot upload test set: test set already has an ID. "
                 "This test set already exists in the database."
             )
 
-        # Prepare test set data
-        test_set = self._prepare_test_set_data()
-        if self.tests is None:
-            raise ValueError("Tests cannot be None")
-        test_count = len(self.tests)
+        completed = set(journal.get("completed", []))
+        created = False
+
+        def save_journal() -> None:
+            if resume:
+                self._write_upload_journal(journal_path, fingerprint, completed)
 
         try:
-            # Show progress indicator during the request
-            with tqdm.tqdm(
-                total=100, desc=f"Uploading test set with {test_count} tests", unit="%"
+            with tqdm(
+                total=sum(len(chunk) for chunk in chunks),
+                initial=sum(len(chunks[i]) for i in completed),
+                desc=f"Uploading test set with {test_count} tests",
+                unit="B",
+                unit_scale=True,
             ) as pbar:
-                pbar.update(10)  # Start with 10% for initialization
+                lock = threading.Lock()
+
+                # The first chunk creates the test set
+                if 0 not in completed:
+                    response = self.client.post(
+                        self.client.get_url("test_sets/bulk"),
+                        data=_ProgressBody(chunks[0], pbar, lock),
+                        headers={"Content-Type": "application/json"},
+                    )
+                    response.raise_for_status()
+                    self._update_from_response(response.json())
+                    created = True
+                    completed.add(0)
+                    if len(chunks) > 1:
+                        save_journal()
+                else:
+                    self.fields["id"] = journal["id"]
+
+                pending = [i for i in range(1, len(chunks)) if i not in completed]
+                if pending:
+                    self._upload_chunks(
+                        chunks,
+                        pending,
+                        completed,
+                        max_concurrency,
+                        pbar,
+                        lock,
+                        save_journal,
+                    )
+
+            if os.path.exists(journal_path):
+                os.remove(journal_path)
 
-                # Send request
-                response = requests.post(
-                    self.client.get_url("test_sets/bulk"),
-                    json=test_set,
-                    headers=self.headers,
-                )
-                pbar.update(40)  # 50% after sending
+            # Print success message
+            print(f"☑️ Successfully uploaded test set with ID: {self.id}")
+            print(f" - Name: {self.name}")
+            print(f" - Tests: {test_count}")
 
-                # Process response
-                response.raise_for_status()
-                pbar.update(40)  # 90% after receiving response
+        except Exception as e:
+            if isinstance(e, requests.exceptions.HTTPError):
+                print(f"✗ {self._upload_error_message(e)}")
+            else:
+                print(f"✗ Unexpected error: {str(e)}")
+            if created and not resume:
+                self._discard_partial_upload()
+            raise
 
-                # Update from response
-                self._update_from_response(response.json())
-                pbar.update(10)  # 100% complete
+    def _discard_partial_upload(self) -> None:
+        """Delete a test set whose chunked upload failed, and forget its ID."""
+        try:
+            deleted = self.delete(self.id)
+        except requests.exceptions.RequestException:
+            deleted = False
+        if not deleted:
+            print(f"✗ Could not delete partially uploaded test set {self.id}")
+        self.fields.pop("id", None)
+
+    def _upload_chunks(
+        self,
+        chunks: List[bytes],
+        pending: List[int],
+        completed: set[int],
+        max_concurrency: int,
+        pbar: Any,
+        lock: threading.Lock,
+        save_journal: Any,
+    ) -> None:
+        """Upload the chunks after the first to the created test set.
+
+        Every chunk is attempted even if others fail; the first error is
+        raised once all of them have finished.
+
+        Args:
+            chunks: The serialized request bodies of all chunks.
+            pending: Indices of the chunks to upload.
+            completed: Indices of the uploaded chunks, updated in place.
+            max_concurrency: Maximum number of chunks uploaded at once.
+            pbar: Progress bar counting uploaded bytes.
+            lock: Lock guarding the progress bar and the journal.
+            save_journal: Function persisting the completed chunks.
+        """
+        url = self.client.get_url(self.upload_chunk_endpoint.format(id=self.id))
+
+        def upload_chunk(index: int) -> None:
+            response = self.client.post(
+                url,
+                data=_ProgressBody(chunks[index], pbar, lock),
+                headers={"Content-Type": "application/json"},
+            )
+            response.raise_for_status()
+            with lock:
+                completed.add(index)
+                save_journal()
+
+        errors = []
+        with ThreadPoolExecutor(max_workers=max(1, max_concurrency)) as executor:
+            for future in [executor.submit(upload_chunk, i) for i in pending]:
+                try:
+                    future.result()
+                except Exception as e:
+                    errors.append(e)
+        if errors:
+            raise errors[0]
+
+    def _split_upload(self, test_set: dict, chunk_size: Optional[int]) -> List[bytes]:
+        """Serialize the upload into request bodies of at most chunk_size tests.
+
+        Args:
+            test_set: The prepared test set data.
+            chunk_size: Maximum number of tests per chunk, or None for one chunk.
+
+        Returns:
+            List[bytes]: The JSON body creating the test set with the first
+                chunk of tests, followed by the bodies of the other chunks.
+        """
+        tests = test_set["tests"]
+        if chunk_size is None or chunk_size >= len(tests):
+            return [json.dumps(test_set, default=str).encode()]
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1")
+
+        first = {**test_set, "tests": tests[:chunk_size]}
+        chunks = [json.dumps(first, default=str).encode()]
+        for start in range(chunk_size, len(tests), chunk_size):
+            body = {"tests": tests[start : start + chunk_size]}
+            chunks.append(json.dumps(body, default=str).encode())
+        return chunks
+
+    @staticmethod
+    def _upload_fingerprint(chunks: List[bytes]) -> str:
+        """Identify an upload by its contents and chunking."""
+        digest = hashlib.sha256()
+        for chunk in chunks:
+            digest.update(hashlib.sha256(chunk).digest())
+        return digest.hexdigest()
+
+    @staticmethod
+    def _read_upload_journal(journal_path: str, fingerprint: str) -> Dict[str, Any]:
+        """Read the resume journal of an interrupted upload, if it matches.
+
+        Returns:
+            Dict[str, Any]: The journal, or an empty dict if there is none for
+                this upload.
+        """
+        try:
+            with open(journal_path, "r") as f:
+                journal = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(journal, dict) or journal.get("fingerprint") != fingerprint:
+            return {}
+        return journal
+
+    def _write_upload_journal(
+        self, journal_path: str, fingerprint: str, completed: set[int]
+    ) -> None:
+        """Atomically record the uploaded chunks of the test set."""
+        os.makedirs(os.path.dirname(journal_path) or ".", exist_ok=True)
+        temp_path = f"{journal_path}.tmp"
+        with open(temp_path, "w") as f:
+            json.dump(
+                {
+                    "fingerprint": fingerprint,
+                    "id": self.id,
+                    "completed": sorted(completed),
+                },
+                f,
+            )
+        os.replace(temp_path, journal_path)
+
+    async def aupload(self) -> None:
+        """Upload a new test set to the API asynchronously.
+
+        Asynchronous variant of upload(), posting to the /test_set/bulk endpoint.
+
+        Returns:
+            None: Updates the current TestSet instance with the server response.
+
+        Raises:
+            ValueError: If the test set already has an ID.
+            httpx.HTTPStatusError: If the API request fails.
+        """
+        if self.id is not None:
+            raise ValueError(
+                "Cannot upload test set: test set already has an ID. "
+                "This test set already exists in the database."
+            )
+
+        test_set = self._prepare_test_set_data()
+        test_count = len(test_set["tests"])
+
+        client = self.async_client
+        try:
+            response = await client.post(
+                client.get_url("test_sets/bulk"),
+                json=test_set,
+            )
+            response.raise_for_status()
+            self._update_from_response(response.json())
 
-            # Print success message
             print(f"☑️ Successfully uploaded test set with ID: {self.id}")
             print(f" - Name: {self.name}")
             print(f" - Tests: {test_count}")
 
-        except requests.exceptions.HTTPError as e:
-            error_msg = f"Error uploading test set: {str(e)}"
-            if e.response is not None:
-                try:
-                    error_data = e.response.json()
-                    if "message" in error_data:
-                        error_msg = f"Error: {error_data['message']}"
-                except ValueError:
-                    pass
-            print(f"✗ {error_msg}")
-            raise
         except Exception as e:
-            print(f"✗ Unexpected error: {str(e)}")
+            if getattr(e, "response", None) is not None:
+                print(f"✗ {self._upload_error_message(e)}")
+            else:
+                print(f"✗ Unexpected error: {str(e)}")
             raise
 
+    @staticmethod
+    def _upload_error_message(e: Exception) -> str:
+        """Build a readable error message for a failed upload request.
+
+        Args:
+            e: The HTTP error raised by requests or httpx.
+
+        Returns:
+            str: The server-provided message if available, otherwise the error.
+        """
+        error_msg = f"Error uploading test set: {str(e)}"
+        response = getattr(e, "response", None)
+        if response is not None:
+            try:
+                error_data = response.json()
+                if "message" in error_data:
+                    error_msg = f"Error: {error_data['message']}"
+            except ValueError:
+                pass
+        return error_msg
+
     def update(self) -> None:
         if not self.exists(self.id):
             raise ValueError(
@@ -299,41 +1039,71 @@ class TestSet(BaseEntity):
                 "Cannot update test set: created_at must be a datetime object"
             )
 
-    def count_tokens(self, encoding_name: str = "cl100k_base") -> Dict[str, int]:
+    #: :no-index: Number of prompts encoded per batch when counting tokens
+    token_count_batch_size: int = 10_000
+
+    @staticmethod
+    def _prompt_content(test: Any) -> Optional[str]:
+        """Get the prompt text of a test, or None if it has none.
+
+        Tests from the API and the synthesizers keep it under prompt.content;
+        a top-level content field is accepted as well.
+        """
+        if not isinstance(test, dict):
+            return None
+        prompt = test.get("prompt")
+        if isinstance(prompt, dict):
+            content = prompt.get("content")
+        elif isinstance(prompt, str):
+            content = prompt
+        else:
+            content = test.get("content")
+        return content if isinstance(content, str) else None
+
+    def count_tokens(
+        self,
+        encoding_name: str = "cl100k_base",
+        page_size: Optional[int] = None,
+        method: str = "exact",
+    ) -> Dict[str, int]:
         """Count tokens for all prompts in the test set.
 
         Args:
             encoding_name: The name of the encoding to use. Defaults to cl100k_base
                           (used by GPT-4 and GPT-3.5-turbo)
+            page_size: If given, tests are streamed in pages of this size
+                instead of being loaded and cached all at once.
+            method: "exact" to encode with tiktoken, "estimate" for a fast
+                heuristic, or "auto" to estimate only if the encoding is
+                unavailable. Defaults to "exact".
 
         Returns:
             Dict[str, int]: A dictionary containing token statistics
         """
-        # Ensure prompts are loaded
-        if self.tests is None:
-            self.get_tests()
-
-        if not self.tests:
-            return {
-                "total": 0,
-                "average": 0,
-                "max": 0,
-                "min": 0,
-                "test_count": 0,
-            }
-
-        # Count tokens for each prompt's content
-        token_counts = []
-        for test in self.tests:
-            content = test.get("content", "")
-            if not isinstance(content, str):
-                continue
-
-            token_count = count_tokens(content, encoding_name)
-            if token_count is not None:
-                token_counts.append(token_count)
+        # Count tokens for each prompt's content in batches, keeping running statistics
+        total = 0
+        counted = 0
+        max_tokens = 0
+        min_tokens: Optional[int] = None
+        tests = iter(self._test_source(page_size))
+        while True:
+            batch = list(islice(tests, self.token_count_batch_size))
+            if not batch:
+                break
+            contents = [self._prompt_content(test) for test in batch]
+            for token_count in count_tokens_batch(
+                contents, encoding_name, method=method
+            ):
+                if token_count is None:
+                    continue
+                total += token_count
+                counted += 1
+                max_tokens = max(max_tokens, token_count)
+                min_tokens = (
+                    token_count if min_tokens is None else min(min_tokens, token_count)
+                )
 
-        if not token_counts:
+        if not counted:
             return {
                 "total": 0,
                 "average": 0,
@@ -343,11 +1113,11 @@ class TestSet(BaseEntity):
             }
 
         return {
-            "total": sum(token_counts),
-            "average": int(round(sum(token_counts) / len(token_counts))),
-            "max": max(token_counts),
-            "min": min(token_counts),
-            "test_count": len(token_counts),
+            "total": total,
+            "average": int(round(total / counted)),
+            "max": max_tokens,
+            "min": min_tokens or 0,
+            "test_count": counted,
         }
 
     def to_dict(self) -> List[Dict[str, Any]]:
@@ -356,15 +1126,25 @@ class TestSet(BaseEntity):
         Returns:
             List[Dict[str, Any]]: A list of dictionaries containing test data
         """
+        if self.tests is None and self.table is not None:
+            return cast(List[Dict[str, Any]], columnar.table_to_tests(self.table))
         if self.tests is None:
-            self.get_tests()
+            self.tests = self.get_tests()
         if self.tests is None:  # Double-check after get_tests
             return []
         return cast(List[Dict[str, Any]], self.tests)
 
-    def to_pandas(self) -> pd.DataFrame:
+    def to_pandas(self, page_size: Optional[int] = None) -> "pd.DataFrame":
         """Convert the test set tests to a pandas DataFrame.
 
+        For a columnar test set, the DataFrame has the flattened columns of the
+        Arrow table, with behavior, category and topic as categoricals.
+
+        Args:
+            page_size: If given, tests are fetched in pages of this size and
+                converted page by page, so the raw tests are never all held
+                in memory at once. The tests are not cached.
+
         Returns:
             pd.DataFrame: A DataFrame containing the test data
 
@@ -373,19 +1153,35 @@ class TestSet(BaseEntity):
             >>> df = test_set.to_pandas()
             >>> print(df.columns)
         """
-        if self.tests is None:
-            self.get_tests()
-        return pd.DataFrame(self.tests)
-
-    def to_parquet(self, path: Optional[str] = None) -> pd.DataFrame:
+        import pandas as pd
+
+        if self.tests is None and self.table is not None:
+            return self.table.to_pandas()
+        if page_size is None:
+            return pd.DataFrame(self._test_source(None))
+
+        frames = [
+            pd.DataFrame(page) for page in self.iter_test_pages(page_size=page_size)
+        ]
+        if not frames:
+            return pd.DataFrame()
+        return pd.concat(frames, ignore_index=True)
+
+    def to_parquet(
+        self, path: Optional[str] = None
+    ) -> Union["pd.DataFrame", "pa.Table"]:
         """Convert the test set tests to a parquet file.
 
+        A columnar test set is written directly from its Arrow table, without
+        converting it to pandas.
+
         Args:
             path: The path where the parquet file should be saved.
                  If None, uses 'test_set_{id}.parquet'
 
         Returns:
-            pd.DataFrame: The DataFrame that was saved to parquet
+            Union[pd.DataFrame, pa.Table]: The DataFrame that was saved to
+                parquet, or the Arrow table of a columnar test set
 
         Raises:
             ImportError: If pyarrow is not installed
@@ -402,15 +1198,21 @@ class TestSet(BaseEntity):
                 "Install it with: pip install pyarrow"
             )
 
-        df = self.to_pandas()
-
         if path is None:
             path = f"test_set_{self.id}.parquet"
 
+        if self.tests is None and self.table is not None:
+            # Write the columnar store directly, without going through pandas
+            import pyarrow.parquet as pq
+
+            pq.write_table(self.table, path)
+            return self.table
+
+        df = self.to_pandas()
         df.to_parquet(path)
         return df
 
-    def to_csv(self, path: Optional[str] = None) -> pd.DataFrame:
+    def to_csv(self, path: Optional[str] = None) -> "pd.DataFrame":
         """Convert the test set tests to a CSV file.
 
         Args:
@@ -432,9 +1234,13 @@ class TestSet(BaseEntity):
         df.to_csv(path, index=False)
         return df
 
-    def get_properties(self) -> Dict[str, Any]:
+    def get_properties(self, page_size: Optional[int] = None) -> Dict[str, Any]:
         """Get the test set properties including basic info and test analysis.
 
+        Args:
+            page_size: If given, tests are streamed in pages of this size
+                instead of being loaded and cached all at once.
+
         Returns:
             Dict[str, Any]: A dictionary containing:
                 - basic properties (name, description, short_description)
@@ -447,22 +1253,19 @@ class TestSet(BaseEntity):
             >>> print(f"Categories: {props['categories']}")
             >>> print(f"Topics: {props['topics']}")
         """
-        # Ensure tests are loaded
-        if self.tests is None:
-            self.get_tests()
-
         # Initialize sets for unique categories and topics
         categories = set()
         topics = set()
+        test_count = 0
 
         # Extract unique categories and topics from tests
-        if self.tests is not None:
-            for test in self.tests:
-                if isinstance(test, dict):
-                    if "category" in test and test["category"]:
-                        categories.add(test["category"])
-                    if "topic" in test and test["topic"]:
-                        topics.add(test["topic"])
+        for test in self._test_source(page_size):
+            test_count += 1
+            if isinstance(test, dict):
+                if "category" in test and test["category"]:
+                    categories.add(test["category"])
+                if "topic" in test and test["topic"]:
+                    topics.add(test["topic"])
 
         return {
             "name": self.name,
@@ -470,10 +1273,10 @@ class TestSet(BaseEntity):
             "short_description": self.short_description,
             "categories": sorted(list(categories)),
             "topics": sorted(list(topics)),
-            "test_count": len(self.tests) if self.tests is not None else 0,
+            "test_count": test_count,
         }
 
-    def set_properties(self) -> None:
+    def set_properties(self, llm_service: Optional[LLMService] = None) -> None:
         """Set test set attributes using LLM based on categories and topics in tests.
 
         This method:
@@ -481,26 +1284,28 @@ class TestSet(BaseEntity):
         2. Uses the LLM service to generate appropriate name, description, and short description
         3. Updates the test set's attributes
 
+        Args:
+            llm_service: Optional LLM service to use. Defaults to a new LLMService.
+
         Example:
             >>> test_set = TestSet(id='123')
             >>> test_set.set_properties()
             >>> print(f"Name: {test_set.name}")
             >>> print(f"Description: {test_set.description}")
         """
-        # Ensure tests are loaded
-        if self.tests is None:
-            self.get_tests()
-
         # Get unique categories and topics
         categories = set()
         topics = set()
-        if self.tests is not None:
-            for test in self.tests:
-                if isinstance(test, dict):
-                    if "category" in test and test["category"]:
-                        categories.add(test["category"])
-                    if "topic" in test and test["topic"]:
-                        topics.add(test["topic"])
+        test_count = 0
+        for test in self._test_source(None):
+            test_count += 1
+            if isinstance(test, dict):
+                if "category" in test and test["category"]:
+                    categories.add(test["category"])
+                if "topic" in test and test["topic"]:
+                    topics.add(test["topic"])
+
+        from jinja2 import Template
 
         # Load the prompt template
         prompt_path = (
@@ -518,7 +1323,8 @@ class TestSet(BaseEntity):
         )
 
         # Create LLM service and get response
-        llm_service = LLMService()
+        if llm_service is None:
+            llm_service = LLMService()
         response = llm_service.run(formatted_prompt)
         # Update test set attributes
         if isinstance(response, dict):
@@ -527,6 +1333,6 @@ class TestSet(BaseEntity):
             self.short_description = response.get("short_description")
             self.categories = sorted(list(categories))
             self.topics = sorted(list(topics))
-            self.test_count = len(self.tests) if self.tests is not None else 0
+            self.test_count = test_count
         else:
             raise ValueError("LLM response was not in the expected format")
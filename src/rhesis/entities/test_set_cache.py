@@ -0,0 +1,191 @@
+"""Local on-disk cache of test set tests."""
+
+import hashlib
+import os
+import threading
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, List, Optional, Tuple, Union
+
+from rhesis.config import get_cache_dir
+from rhesis.entities.columnar import _import_pyarrow
+
+if TYPE_CHECKING:
+    import pyarrow as pa
+
+
+class TestSetCache:
+    """Persistent cache for the tests of test sets.
+
+    Tests are stored in the columnar Arrow layout as uncompressed Arrow IPC
+    (Feather V2) files, one per test set, keyed by the test set ID and its
+    updated_at timestamp, so a test set changed through the API is fetched
+    again. Cached files are opened via memory mapping: reading a table costs
+    no parsing, and processes on the same machine share one copy in the page
+    cache. Least recently used files are evicted beyond max_size_bytes.
+
+    Examples:
+        >>> cache = TestSetCache(max_size_bytes=2 * 1024**3)
+        >>> df = TestSet(id="123").load(cache=cache)  # fetches the tests
+        >>> df = TestSet(id="123").load(cache=cache)  # reads the cached file
+    """
+
+    #: File extension of cached test sets
+    suffix = ".arrow"
+
+    def __init__(
+        self,
+        path: Optional[Union[str, Path]] = None,
+        max_size_bytes: Optional[int] = 1024**3,
+    ) -> None:
+        """
+        Initialize the cache.
+
+        Args:
+            path: Directory of the cached files. Defaults to 'test_sets' in the
+                Rhesis cache directory.
+            max_size_bytes: Maximum total size of cached files in bytes. Least
+                recently used test sets are evicted beyond this. None for no limit.
+        """
+        if path is None:
+            path = get_cache_dir() / "test_sets"
+        self.path = Path(path)
+        self.max_size_bytes = max_size_bytes
+
+        self._lock = threading.Lock()
+        os.makedirs(self.path, exist_ok=True)
+
+    @staticmethod
+    def _digest(value: Any) -> str:
+        """Hash a key part into a file name safe string."""
+        return hashlib.sha256(str(value).encode("utf-8")).hexdigest()
+
+    def file_path(self, test_set_id: str, updated_at: Any) -> Path:
+        """
+        Get the path of the cached file for a version of a test set.
+
+        Args:
+            test_set_id: The ID of the test set
+            updated_at: The updated_at timestamp of the test set
+
+        Returns:
+            Path: The file path, whether or not the file exists
+        """
+        name = f"{self._digest(test_set_id)[:32]}-{self._digest(updated_at)[:16]}"
+        return self.path / f"{name}{self.suffix}"
+
+    def get(self, test_set_id: str, updated_at: Any) -> Optional["pa.Table"]:
+        """
+        Open a cached test set.
+
+        Args:
+            test_set_id: The ID of the test set
+            updated_at: The updated_at timestamp of the test set
+
+        Returns:
+            Optional[pa.Table]: The memory-mapped tests, or None on a miss
+        """
+        _import_pyarrow()
+        from pyarrow import feather
+
+        path = self.file_path(test_set_id, updated_at)
+        try:
+            table = feather.read_table(str(path), memory_map=True)
+        except FileNotFoundError:
+            return None
+        self._touch(path)
+        return table
+
+    def set(self, test_set_id: str, updated_at: Any, table: "pa.Table") -> "pa.Table":
+        """
+        Store the tests of a test set, replacing older versions of it, and evict
+        old test sets if the size limit is exceeded.
+
+        Args:
+            test_set_id: The ID of the test set
+            updated_at: The updated_at timestamp of the test set
+            table: The tests in the columnar schema
+
+        Returns:
+            pa.Table: The stored tests, memory-mapped from the cached file
+        """
+        _import_pyarrow()
+        from pyarrow import feather
+
+        path = self.file_path(test_set_id, updated_at)
+        # Write to a private file and rename it, so that concurrent readers
+        # never see a partially written table
+        tmp_path = path.with_name(
+            f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp"
+        )
+        try:
+            feather.write_feather(table, str(tmp_path), compression="uncompressed")
+            os.replace(tmp_path, path)
+        finally:
+            if tmp_path.exists():
+                tmp_path.unlink()
+
+        with self._lock:
+            prefix = path.name.split("-")[0]
+            for stale in self.path.glob(f"{prefix}-*{self.suffix}"):
+                if stale != path:
+                    self._remove(stale)
+            self._evict(keep=path)
+        return feather.read_table(str(path), memory_map=True)
+
+    def clear(self) -> None:
+        """Remove all cached test sets."""
+        with self._lock:
+            for path, _, _ in self._entries():
+                self._remove(path)
+
+    def size_bytes(self) -> int:
+        """Get the total size of the cached files in bytes."""
+        return sum(size for _, _, size in self._entries())
+
+    def __len__(self) -> int:
+        return len(self._entries())
+
+    def _entries(self) -> List[Tuple[Path, float, int]]:
+        """List cached files with their last access time and size."""
+        entries = []
+        for path in self.path.glob(f"*{self.suffix}"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                # Removed by another process
+                continue
+            entries.append((path, stat.st_mtime, stat.st_size))
+        return entries
+
+    @staticmethod
+    def _touch(path: Path) -> None:
+        """Mark a cached file as recently used."""
+        now = time.time()
+        try:
+            os.utime(path, (now, now))
+        except OSError:
+            pass
+
+    @staticmethod
+    def _remove(path: Path) -> None:
+        """Remove a cached file if possible."""
+        try:
+            path.unlink()
+        except OSError:
+            # Already removed, or still mapped by a reader on Windows
+            pass
+
+    def _evict(self, keep: Path) -> None:
+        """Remove least recently used files beyond the size limit. Must hold the lock."""
+        if self.max_size_bytes is None:
+            return
+        entries = sorted(self._entries(), key=lambda entry: entry[1])
+        excess = sum(size for _, _, size in entries) - self.max_size_bytes
+        for path, _, size in entries:
+            if excess <= 0:
+                break
+            if path == keep:
+                continue
+            self._remove(path)
+            excess -= size
@@ -0,0 +1,290 @@
+"""Request instrumentation hooks and metrics for API clients."""
+
+import math
+import re
+import threading
+from collections import deque
+from typing import Any, Dict, List, Optional
+
+# Path segments that identify a record rather than a resource: UUIDs, numbers
+# and long hex strings
+_ID_SEGMENT = re.compile(
+    r"^(?:[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}"
+    r"|\d+|[0-9a-fA-F]{16,})$"
+)
+
+
+def endpoint_template(path: str) -> str:
+    """
+    Reduce a request path to its endpoint, replacing record IDs with {id}.
+
+    Args:
+        path: The URL path relative to the API base URL, e.g. "test_sets/<uuid>".
+
+    Returns:
+        str: The endpoint, e.g. "test_sets/{id}".
+    """
+    segments = path.split("?", 1)[0].strip("/").split("/")
+    return "/".join("{id}" if _ID_SEGMENT.match(s) else s for s in segments)
+
+
+class RequestEvent:
+    """A single attempt of an API request, passed to every hook.
+
+    The same event is passed to on_request_start and to the hooks called when
+    the attempt completes, so hooks can keep per-attempt state in context.
+    """
+
+    def __init__(self, method: str, url: str, endpoint: str, attempt: int) -> None:
+        """
+        Initialize the event.
+
+        Args:
+            method: The HTTP method.
+            url: The complete request URL.
+            endpoint: The endpoint with record IDs replaced, e.g. "test_sets/{id}".
+            attempt: The attempt number, starting at 1.
+        """
+        self.method = method
+        self.url = url
+        self.endpoint = endpoint
+        self.attempt = attempt
+        self.status_code: Optional[int] = None
+        self.bytes_sent: Optional[int] = None
+        self.bytes_received: Optional[int] = None
+        self.latency: Optional[float] = None
+        self.error: Optional[BaseException] = None
+        self.retry_delay: Optional[float] = None
+        self.context: Dict[str, Any] = {}
+
+    def __repr__(self) -> str:
+        return (
+            f"RequestEvent({self.method} {self.endpoint}, attempt={self.attempt}, "
+            f"status_code={self.status_code}, latency={self.latency})"
+        )
+
+
+class RequestHooks:
+    """Base class of request hooks; every method is a no-op.
+
+    Subclasses override the methods they need and are registered with
+    rhesis.client.add_request_hooks() or passed to a client as hooks. Exceptions
+    raised by hooks are logged and never fail the request.
+
+    Examples:
+        >>> class SlowRequestLogger(RequestHooks):
+        ...     def on_request_end(self, event):
+        ...         if event.latency > 1.0:
+        ...             print(f"{event.method} {event.endpoint} took {event.latency:.1f}s")
+    """
+
+    def on_request_start(self, event: RequestEvent) -> None:
+        """Called before an attempt is sent."""
+
+    def on_request_end(self, event: RequestEvent) -> None:
+        """Called when an attempt received a response, whatever its status.
+
+        status_code, bytes_sent, bytes_received and latency are set. For
+        streamed responses, latency is the time until the headers arrived and
+        bytes_received is only known if the server sent a Content-Length.
+        """
+
+    def on_retry(self, event: RequestEvent) -> None:
+        """Called after a failed attempt that will be retried.
+
+        retry_delay is the number of seconds waited before the next attempt.
+        """
+
+    def on_error(self, event: RequestEvent) -> None:
+        """Called when an attempt failed without a response, e.g. a timeout.
+
+        error and latency are set.
+        """
+
+
+class MetricsCollector(RequestHooks):
+    """Thread-safe in-memory collector of per-endpoint request metrics.
+
+    Latencies of the most recent attempts are kept per method and endpoint,
+    so memory stays bounded in long-running processes.
+
+    Examples:
+        >>> from rhesis.client import add_request_hooks
+        >>> metrics = MetricsCollector()
+        >>> add_request_hooks(metrics)
+        >>> # ... run the pipeline ...
+        >>> for endpoint, stats in metrics.summary().items():
+        ...     print(endpoint, stats["count"], stats["p95"])
+    """
+
+    def __init__(self, max_samples: int = 10_000) -> None:
+        """
+        Initialize the collector.
+
+        Args:
+            max_samples: Maximum number of latencies kept per endpoint.
+        """
+        self.max_samples = max_samples
+        self._lock = threading.Lock()
+        self._endpoints: Dict[str, Dict[str, Any]] = {}
+
+    def _stats(self, event: RequestEvent) -> Dict[str, Any]:
+        key = f"{event.method} {event.endpoint}"
+        stats = self._endpoints.get(key)
+        if stats is None:
+            stats = {
+                "count": 0,
+                "errors": 0,
+                "retries": 0,
+                "bytes_sent": 0,
+                "bytes_received": 0,
+                "latencies": deque(maxlen=self.max_samples),
+            }
+            self._endpoints[key] = stats
+        return stats
+
+    def on_request_end(self, event: RequestEvent) -> None:
+        with self._lock:
+            stats = self._stats(event)
+            stats["count"] += 1
+            if event.status_code is not None and event.status_code >= 400:
+                stats["errors"] += 1
+            stats["bytes_sent"] += event.bytes_sent or 0
+            stats["bytes_received"] += event.bytes_received or 0
+            stats["latencies"].append(event.latency)
+
+    def on_retry(self, event: RequestEvent) -> None:
+        with self._lock:
+            self._stats(event)["retries"] += 1
+
+    def on_error(self, event: RequestEvent) -> None:
+        with self._lock:
+            stats = self._stats(event)
+            stats["count"] += 1
+            stats["errors"] += 1
+            stats["latencies"].append(event.latency)
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get the metrics of every endpoint.
+
+        Returns:
+            Dict[str, Dict[str, Any]]: Metrics keyed by "METHOD endpoint", with
+                the number of attempts, errors (error statuses and failed
+                attempts), retries, bytes sent and received, and the mean,
+                p50, p95 and p99 latency in seconds.
+        """
+        with self._lock:
+            snapshot = {
+                key: {**stats, "latencies": sorted(stats["latencies"])}
+                for key, stats in self._endpoints.items()
+            }
+        summary = {}
+        for key, stats in snapshot.items():
+            latencies: List[float] = stats.pop("latencies")
+            stats["mean"] = sum(latencies) / len(latencies) if latencies else None
+            for percent in (50, 95, 99):
+                stats[f"p{percent}"] = _percentile(latencies, percent)
+            summary[key] = stats
+        return summary
+
+    def reset(self) -> None:
+        """Discard all collected metrics."""
+        with self._lock:
+            self._endpoints.clear()
+
+
+def _percentile(values: List[float], percent: float) -> Optional[float]:
+    """Nearest-rank percentile of sorted values."""
+    if not values:
+        return None
+    return values[max(0, math.ceil(percent / 100 * len(values)) - 1)]
+
+
+def _import_opentelemetry() -> Any:
+    """Import the OpenTelemetry API, which is only required for its adapter."""
+    try:
+        from opentelemetry import metrics, trace
+    except ImportError:
+        raise ImportError(
+            "opentelemetry-api is required for OpenTelemetry instrumentation. "
+            "Install it with: pip install rhesis-sdk[otel]"
+        )
+    return trace, metrics
+
+
+class OpenTelemetryHooks(RequestHooks):
+    """Request hooks recording OpenTelemetry client spans and metrics.
+
+    Every attempt becomes a span following the HTTP semantic conventions, and
+    its duration is recorded in the http.client.request.duration histogram.
+    Requires the optional opentelemetry-api dependency
+    (pip install rhesis-sdk[otel]); providers default to the global ones.
+    """
+
+    def __init__(
+        self,
+        tracer_provider: Optional[Any] = None,
+        meter_provider: Optional[Any] = None,
+    ) -> None:
+        """
+        Initialize the adapter.
+
+        Args:
+            tracer_provider: Optional OpenTelemetry tracer provider.
+            meter_provider: Optional OpenTelemetry meter provider.
+        """
+        trace, metrics = _import_opentelemetry()
+        self._trace = trace
+        self._tracer = trace.get_tracer(
+            "rhesis.client", tracer_provider=tracer_provider
+        )
+        meter = metrics.get_meter("rhesis.client", meter_provider=meter_provider)
+        self._duration = meter.create_histogram(
+            "http.client.request.duration",
+            unit="s",
+            description="Duration of API requests",
+        )
+
+    def on_request_start(self, event: RequestEvent) -> None:
+        event.context["otel_span"] = self._tracer.start_span(
+            f"{event.method} {event.endpoint}",
+            kind=self._trace.SpanKind.CLIENT,
+            attributes={
+                "http.request.method": event.method,
+                "url.full": event.url,
+                "url.template": event.endpoint,
+                "http.request.resend_count": event.attempt - 1,
+            },
+        )
+
+    def _finish(self, event: RequestEvent) -> None:
+        attributes: Dict[str, Any] = {
+            "http.request.method": event.method,
+            "url.template": event.endpoint,
+        }
+        if event.status_code is not None:
+            attributes["http.response.status_code"] = event.status_code
+        if event.error is not None:
+            attributes["error.type"] = type(event.error).__name__
+        self._duration.record(event.latency or 0.0, attributes=attributes)
+
+        span = event.context.pop("otel_span", None)
+        if span is None:
+            return
+        span.set_attributes(attributes)
+        if event.bytes_sent is not None:
+            span.set_attribute("http.request.body.size", event.bytes_sent)
+        if event.bytes_received is not None:
+            span.set_attribute("http.response.body.size", event.bytes_received)
+        if event.error is not None:
+            span.record_exception(event.error)
+        if event.error is not None or (event.status_code or 0) >= 500:
+            span.set_status(self._trace.Status(self._trace.StatusCode.ERROR))
+        span.end()
+
+    def on_request_end(self, event: RequestEvent) -> None:
+        self._finish(event)
+
+    def on_error(self, event: RequestEvent) -> None:
+        self._finish(event)
@@ -0,0 +1,317 @@
+"""Client-side rate limiting and adaptive concurrency control."""
+
+import asyncio
+import threading
+import time
+from typing import List, Optional, Tuple
+
+
+class TokenBucket:
+    """Thread-safe token bucket.
+
+    Tokens refill continuously at a fixed rate up to the bucket's capacity.
+    Reservations may overdraw the bucket; the caller then waits until the
+    deficit has been refilled, so large requests are never starved.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None) -> None:
+        """
+        Initialize the bucket, initially full.
+
+        Args:
+            rate: Tokens added per second.
+            capacity: Maximum number of stored tokens. Defaults to one second
+                worth of tokens.
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else rate
+        self._tokens = self.capacity
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, amount: float) -> float:
+        """
+        Take tokens from the bucket.
+
+        Args:
+            amount: Number of tokens to take.
+
+        Returns:
+            float: Seconds to wait before the reserved tokens are available.
+        """
+        with self._lock:
+            self._refill()
+            self._tokens -= amount
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def refund(self, amount: float) -> None:
+        """
+        Return tokens to the bucket, e.g. when a reservation overestimated usage.
+
+        Args:
+            amount: Number of tokens to return.
+        """
+        with self._lock:
+            self._refill()
+            self._tokens = min(self.capacity, self._tokens + amount)
+
+    def _refill(self) -> None:
+        """Add the tokens accrued since the last update. Must hold the lock."""
+        now = time.monotonic()
+        self._tokens = min(
+            self.capacity, self._tokens + (now - self._updated_at) * self.rate
+        )
+        self._updated_at = now
+
+
+class AdaptiveConcurrencyLimiter:
+    """Concurrency limit adjusted by additive increase, multiplicative decrease.
+
+    Each successful request raises the limit by increase / limit, so the limit
+    grows by roughly `increase` per round of requests. A rate-limited (429)
+    response, or one slower than latency_threshold, multiplies the limit by
+    decrease_factor, at most once per cooldown period.
+    """
+
+    def __init__(
+        self,
+        initial_limit: float = 4,
+        min_limit: float = 1,
+        max_limit: float = 64,
+        increase: float = 1.0,
+        decrease_factor: float = 0.5,
+        latency_threshold: Optional[float] = None,
+        cooldown: float = 1.0,
+    ) -> None:
+        """
+        Initialize the limiter.
+
+        Args:
+            initial_limit: Initial number of concurrent requests.
+            min_limit: Lowest allowed limit.
+            max_limit: Highest allowed limit.
+            increase: Additive increase per round of successful requests.
+            decrease_factor: Factor applied to the limit on congestion.
+            latency_threshold: Latency in seconds above which a response
+                counts as congestion. None to only react to 429 responses.
+            cooldown: Minimum seconds between two decreases.
+        """
+        if not 0 < decrease_factor < 1:
+            raise ValueError("decrease_factor must be between 0 and 1")
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.increase = increase
+        self.decrease_factor = decrease_factor
+        self.latency_threshold = latency_threshold
+        self.cooldown = cooldown
+
+        self._limit = float(min(max(initial_limit, min_limit), max_limit))
+        self._in_flight = 0
+        self._decreased_at = float("-inf")
+        self._condition = threading.Condition()
+        # Futures of coroutines waiting for a slot, with their event loops
+        self._async_waiters: List[
+            Tuple[asyncio.AbstractEventLoop, "asyncio.Future[None]"]
+        ] = []
+
+    @property
+    def limit(self) -> float:
+        """Get the current concurrency limit."""
+        return self._limit
+
+    @property
+    def in_flight(self) -> int:
+        """Get the number of requests currently holding a slot."""
+        return self._in_flight
+
+    def try_acquire(self) -> bool:
+        """
+        Take a slot if one is free.
+
+        Returns:
+            bool: Whether a slot was taken.
+        """
+        with self._condition:
+            if self._in_flight < int(self._limit):
+                self._in_flight += 1
+                return True
+            return False
+
+    def acquire(self) -> None:
+        """Block until a slot is free and take it."""
+        with self._condition:
+            while self._in_flight >= int(self._limit):
+                self._condition.wait()
+            self._in_flight += 1
+
+    async def acquire_async(self) -> None:
+        """Wait without blocking the event loop until a slot is free and take it.
+
+        Waiting coroutines are woken when a slot is released, from any thread
+        or event loop sharing the limiter.
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            with self._condition:
+                if self._in_flight < int(self._limit):
+                    self._in_flight += 1
+                    return
+                waiter = loop.create_future()
+                self._async_waiters.append((loop, waiter))
+            try:
+                await waiter
+            finally:
+                with self._condition:
+                    if (loop, waiter) in self._async_waiters:
+                        self._async_waiters.remove((loop, waiter))
+
+    @staticmethod
+    def _wake(waiter: "asyncio.Future[None]") -> None:
+        """Resolve the future of a waiting coroutine, unless it was cancelled."""
+        if not waiter.done():
+            waiter.set_result(None)
+
+    def release(self, status_code: Optional[int], latency: float) -> None:
+        """
+        Free a slot and adjust the limit based on the outcome of the request.
+
+        Args:
+            status_code: The response status, or None if the request failed
+                without a response.
+            latency: The request latency in seconds.
+        """
+        with self._condition:
+            self._in_flight -= 1
+            congested = status_code == 429 or (
+                self.latency_threshold is not None and latency > self.latency_threshold
+            )
+            now = time.monotonic()
+            if congested:
+                if now - self._decreased_at >= self.cooldown:
+                    self._limit = max(
+                        self.min_limit, self._limit * self.decrease_factor
+                    )
+                    self._decreased_at = now
+            elif status_code is not None and status_code < 400:
+                self._limit = min(
+                    self.max_limit, self._limit + self.increase / self._limit
+                )
+            self._condition.notify_all()
+            for loop, waiter in self._async_waiters:
+                loop.call_soon_threadsafe(self._wake, waiter)
+            self._async_waiters.clear()
+
+
+class RateLimiter:
+    """Request-rate, token-rate and adaptive concurrency limits for API calls.
+
+    A single instance can be shared by any number of services, synthesizers
+    and threads in a process so that their combined traffic stays within the
+    quota. Each request reserves one request slot and its estimated token
+    count, waits until they are available and then takes a concurrency slot,
+    so no slot is held while waiting for budget. The concurrency limit adapts
+    to 429 responses and latency.
+
+    Examples:
+        >>> limiter = RateLimiter(requests_per_second=5, tokens_per_minute=200_000)
+        >>> llm_service = LLMService(rate_limiter=limiter)
+        >>> synthesizers = [
+        ...     PromptSynthesizer(prompt, llm_service=llm_service, max_concurrency=8)
+        ...     for prompt in prompts
+        ... ]
+    """
+
+    def __init__(
+        self,
+        requests_per_second: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None,
+        concurrency: Optional[AdaptiveConcurrencyLimiter] = None,
+    ) -> None:
+        """
+        Initialize the rate limiter.
+
+        Args:
+            requests_per_second: Maximum sustained requests per second.
+                None for no request rate limit.
+            tokens_per_minute: Maximum sustained tokens per minute.
+                None for no token rate limit.
+            concurrency: Adaptive concurrency limiter. Defaults to an
+                AdaptiveConcurrencyLimiter with default settings.
+        """
+        self.requests = (
+            TokenBucket(requests_per_second, capacity=max(1.0, requests_per_second))
+            if requests_per_second
+            else None
+        )
+        self.tokens = (
+            TokenBucket(tokens_per_minute / 60.0, capacity=tokens_per_minute)
+            if tokens_per_minute
+            else None
+        )
+        self.concurrency = (
+            concurrency if concurrency is not None else AdaptiveConcurrencyLimiter()
+        )
+
+    def _reserve(self, tokens: int) -> float:
+        """Reserve request and token budget, returning the time to wait."""
+        wait = 0.0
+        if self.requests is not None:
+            wait = max(wait, self.requests.reserve(1))
+        if self.tokens is not None and tokens:
+            wait = max(wait, self.tokens.reserve(tokens))
+        return wait
+
+    def acquire(self, tokens: int = 0) -> None:
+        """
+        Block until a request of the given token size may be sent.
+
+        Args:
+            tokens: Estimated number of tokens the request consumes.
+        """
+        wait = self._reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+        self.concurrency.acquire()
+
+    async def acquire_async(self, tokens: int = 0) -> None:
+        """
+        Wait without blocking the event loop until a request may be sent.
+
+        Args:
+            tokens: Estimated number of tokens the request consumes.
+        """
+        wait = self._reserve(tokens)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        await self.concurrency.acquire_async()
+
+    def release(self, status_code: Optional[int], latency: float) -> None:
+        """
+        Report the outcome of a request acquired with acquire().
+
+        Args:
+            status_code: The response status, or None if the request failed
+                without a response.
+            latency: The request latency in seconds.
+        """
+        self.concurrency.release(status_code, latency)
+
+    def record_usage(self, estimated_tokens: int, actual_tokens: int) -> None:
+        """
+        Reconcile a request's token estimate with its actual usage.
+
+        Args:
+            estimated_tokens: The tokens reserved when acquiring.
+            actual_tokens: The tokens the API reported as used.
+        """
+        if self.tokens is None:
+            return
+        difference = estimated_tokens - actual_tokens
+        if difference > 0:
+            self.tokens.refund(difference)
+        elif difference < 0:
+            self.tokens.reserve(-difference)
@@ -0,0 +1,199 @@
+"""Retry policy for API requests."""
+
+import random
+import sys
+import time
+from email.utils import parsedate_to_datetime
+from typing import FrozenSet, Iterable, Optional
+
+import requests
+from urllib3.exceptions import NewConnectionError
+
+# Methods that can be repeated without changing the result on the server
+IDEMPOTENT_METHODS: FrozenSet[str] = frozenset(
+    {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+)
+
+# Statuses where the server rejected the request without processing it,
+# so retrying is safe even for non-idempotent requests
+UNPROCESSED_STATUSES: FrozenSet[int] = frozenset({429, 503})
+
+
+class RetryPolicy:
+    """Exponential backoff retry policy with jitter and Retry-After handling.
+
+    Failed requests with a retryable status (or a transport error) are repeated
+    up to max_attempts times. Non-idempotent requests (POST by default) are only
+    retried when the server provably did not process them: a 429 or 503 status,
+    or a failure to connect.
+
+    Examples:
+        >>> from rhesis.client import set_retry_policy
+        >>> set_retry_policy(RetryPolicy(max_attempts=6, backoff_factor=1.0))
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 4,
+        backoff_factor: float = 0.5,
+        max_backoff: float = 30.0,
+        jitter: bool = True,
+        retry_statuses: Iterable[int] = (429, 500, 502, 503, 504),
+        respect_retry_after: bool = True,
+        max_retry_after: float = 120.0,
+    ) -> None:
+        """
+        Initialize the retry policy.
+
+        Args:
+            max_attempts: Maximum number of attempts, including the first one.
+                Use 1 to disable retries.
+            backoff_factor: Base delay in seconds; attempt n waits up to
+                backoff_factor * 2 ** (n - 1) seconds.
+            max_backoff: Maximum computed backoff delay in seconds.
+            jitter: Whether to randomize delays to avoid synchronized retries.
+            retry_statuses: HTTP status codes that trigger a retry.
+            respect_retry_after: Whether to wait as long as the server's
+                Retry-After header asks for.
+            max_retry_after: Maximum delay in seconds taken from Retry-After.
+        """
+        if max_attempts < 1:
+            raise ValueError("max_attempts must be at least 1")
+        self.max_attempts = max_attempts
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.retry_statuses = frozenset(retry_statuses)
+        self.respect_retry_after = respect_retry_after
+        self.max_retry_after = max_retry_after
+
+    @staticmethod
+    def is_idempotent(method: str, idempotent: Optional[bool] = None) -> bool:
+        """
+        Check whether a request can safely be repeated.
+
+        Args:
+            method: The HTTP method.
+            idempotent: Explicit override, e.g. True for a POST without side effects.
+
+        Returns:
+            bool: Whether the request is idempotent.
+        """
+        if idempotent is not None:
+            return idempotent
+        return method.upper() in IDEMPOTENT_METHODS
+
+    def should_retry_status(
+        self, method: str, status_code: int, idempotent: Optional[bool] = None
+    ) -> bool:
+        """
+        Check whether a response status should be retried.
+
+        Args:
+            method: The HTTP method.
+            status_code: The response status code.
+            idempotent: Explicit idempotency override for the request.
+
+        Returns:
+            bool: Whether to retry.
+        """
+        if status_code not in self.retry_statuses:
+            return False
+        if status_code in UNPROCESSED_STATUSES:
+            return True
+        return self.is_idempotent(method, idempotent)
+
+    def should_retry_error(
+        self, method: str, error: Exception, idempotent: Optional[bool] = None
+    ) -> bool:
+        """
+        Check whether a transport error should be retried.
+
+        Connection failures are always retried since the request never reached
+        the server. Other errors, such as read timeouts or dropped connections,
+        are only retried for idempotent requests.
+
+        Args:
+            method: The HTTP method.
+            error: The exception raised by requests or httpx.
+            idempotent: Explicit idempotency override for the request.
+
+        Returns:
+            bool: Whether to retry.
+        """
+        if _is_connect_error(error):
+            return True
+        return _is_transport_error(error) and self.is_idempotent(method, idempotent)
+
+    def get_delay(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        """
+        Compute how long to wait before the next attempt.
+
+        Args:
+            attempt: The number of the attempt that just failed, starting at 1.
+            retry_after: The value of the response's Retry-After header, if any.
+
+        Returns:
+            float: The delay in seconds.
+        """
+        if self.respect_retry_after and retry_after:
+            delay = parse_retry_after(retry_after)
+            if delay is not None:
+                delay = min(delay, self.max_retry_after)
+                # Spread clients that were told the same time slightly apart
+                if self.jitter:
+                    delay += random.uniform(0, min(1.0, delay * 0.1))
+                return delay
+
+        delay = min(self.max_backoff, self.backoff_factor * 2 ** (attempt - 1))
+        if self.jitter:
+            # Full jitter: uniformly random between zero and the backoff
+            delay = random.uniform(0, delay)
+        return delay
+
+
+def parse_retry_after(value: str) -> Optional[float]:
+    """
+    Parse a Retry-After header given in seconds or as an HTTP date.
+
+    Args:
+        value: The header value.
+
+    Returns:
+        Optional[float]: The delay in seconds, or None if it cannot be parsed.
+    """
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+def _is_connect_error(error: Exception) -> bool:
+    """Check whether an error happened before the request reached the server."""
+    if isinstance(error, requests.exceptions.ConnectTimeout):
+        return True
+    if isinstance(error, requests.exceptions.ConnectionError):
+        # requests wraps both connect and mid-request failures in ConnectionError
+        reason = error.args[0] if error.args else None
+        reason = getattr(reason, "reason", reason)
+        return isinstance(reason, NewConnectionError)
+    httpx = sys.modules.get("httpx")
+    return httpx is not None and isinstance(
+        error, (httpx.ConnectError, httpx.ConnectTimeout)
+    )
+
+
+def _is_transport_error(error: Exception) -> bool:
+    """Check whether an error is a network-level failure of requests or httpx."""
+    if isinstance(
+        error, (requests.exceptions.ConnectionError, requests.exceptions.Timeout)
+    ):
+        return True
+    httpx = sys.modules.get("httpx")
+    return httpx is not None and isinstance(error, httpx.TransportError)
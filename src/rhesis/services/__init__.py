@@ -1,3 +1,5 @@
+from .cache import LLMCache
 from .llm import LLMService
+from .usage import TokenUsage, track_usage
 
-__all__ = ["LLMService"]
+__all__ = ["LLMService", "LLMCache", "TokenUsage", "track_usage"]
@@ -0,0 +1,277 @@
+"""Content-addressed caching of LLM completions."""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from rhesis.config import get_cache_dir
+
+
+class LLMCache:
+    """Persistent cache for LLM completion responses.
+
+    Responses are stored in a SQLite database keyed by a hash of the full
+    request (endpoint, messages, temperature, max_tokens, response_format and
+    any extra parameters) and its occurrence, with a small in-memory LRU in
+    front of it so repeated hits skip the database entirely. The access times
+    of in-memory hits are written to the database in batches, before entries
+    are evicted. The cache is safe to share across threads and processes.
+
+    Size limits are enforced with a running count and byte total kept by each
+    instance, so entries written by other processes are only counted once the
+    cache is reopened.
+
+    An LLMService keys the n-th identical request it makes on occurrence n, so
+    sampling the same prompt twice calls the API twice, and a later service
+    replays both responses in order.
+
+    Examples:
+        >>> cache = LLMCache(ttl=24 * 3600)
+        >>> llm_service = LLMService(cache=cache)
+        >>> llm_service.run("Generate a test")  # calls the API
+        >>> llm_service.run("Generate a test")  # calls the API for a new sample
+        >>> replay = LLMService(cache=cache)
+        >>> replay.run("Generate a test")  # served from the cache (1st response)
+        >>> replay.run("Generate a test")  # served from the cache (2nd response)
+        >>> replay.run("Generate a test", bypass_cache=True)  # calls the API
+    """
+
+    def __init__(
+        self,
+        path: Optional[Union[str, Path]] = None,
+        max_entries: Optional[int] = 10_000,
+        max_size_bytes: Optional[int] = None,
+        ttl: Optional[float] = None,
+        memory_entries: int = 256,
+    ) -> None:
+        """
+        Initialize the cache.
+
+        Args:
+            path: Path of the SQLite database file. Defaults to
+                'llm_cache.sqlite3' in the Rhesis cache directory.
+            max_entries: Maximum number of cached responses. Least recently used
+                entries are evicted beyond this. None for no limit.
+            max_size_bytes: Maximum total size of cached responses in bytes.
+                Least recently used entries are evicted beyond this. None for no limit.
+            ttl: Time to live of an entry in seconds. None for no expiry.
+            memory_entries: Number of entries kept in the in-memory LRU.
+        """
+        if path is None:
+            path = get_cache_dir() / "llm_cache.sqlite3"
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self.max_size_bytes = max_size_bytes
+        self.ttl = ttl
+        self.memory_entries = memory_entries
+
+        self._lock = threading.Lock()
+        self._memory: "OrderedDict[str, Tuple[Optional[float], str]]" = OrderedDict()
+        # Access times of in-memory hits not yet written to the database
+        self._accessed: Dict[str, float] = {}
+
+        os.makedirs(self.path.parent, exist_ok=True)
+        self._connection = sqlite3.connect(
+            str(self.path), timeout=30, check_same_thread=False, isolation_level=None
+        )
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, "
+            "value TEXT NOT NULL, "
+            "size INTEGER NOT NULL, "
+            "created_at REAL NOT NULL, "
+            "accessed_at REAL NOT NULL)"
+        )
+        self._connection.execute(
+            "CREATE INDEX IF NOT EXISTS responses_accessed_at "
+            "ON responses (accessed_at)"
+        )
+        self._connection.execute(
+            "CREATE INDEX IF NOT EXISTS responses_created_at "
+            "ON responses (created_at)"
+        )
+        count, size = self._connection.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()
+        self._count = int(count)
+        self._size = int(size)
+
+    @staticmethod
+    def make_key(url: str, request_data: Dict[str, Any], occurrence: int = 0) -> str:
+        """
+        Build the cache key for a completion request.
+
+        Args:
+            url: The completion endpoint URL
+            request_data: The JSON body of the completion request
+            occurrence: Index of this request among identical requests, so that
+                sampling the same prompt several times caches distinct responses
+
+        Returns:
+            str: A SHA-256 hex digest of the canonicalized request
+        """
+        key_data: Dict[str, Any] = {"url": url, "request": request_data}
+        if occurrence:
+            key_data["occurrence"] = occurrence
+        payload = json.dumps(
+            key_data,
+            sort_keys=True,
+            separators=(",", ":"),
+            default=str,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached response.
+
+        Args:
+            key: The cache key from make_key()
+
+        Returns:
+            Optional[Dict[str, Any]]: The cached response, or None on a miss
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at is None or expires_at > now:
+                    self._memory.move_to_end(key)
+                    self._accessed[key] = now
+                    return dict(json.loads(value))
+                del self._memory[key]
+
+            row = self._connection.execute(
+                "SELECT value, size, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+
+            value, size, created_at = row
+            if self.ttl is not None and created_at + self.ttl <= now:
+                self._delete([(key, size)])
+                return None
+
+            self._accessed[key] = now
+            self._remember(key, created_at, value)
+        return dict(json.loads(value))
+
+    def set(self, key: str, response: Dict[str, Any]) -> None:
+        """
+        Store a response and evict old entries if limits are exceeded.
+
+        Args:
+            key: The cache key from make_key()
+            response: The JSON response to cache
+        """
+        value = json.dumps(response, separators=(",", ":"))
+        now = time.time()
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT size FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            self._connection.execute(
+                "INSERT OR REPLACE INTO responses "
+                "(key, value, size, created_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                (key, value, len(value), now, now),
+            )
+            if row is None:
+                self._count += 1
+            else:
+                self._size -= row[0]
+            self._size += len(value)
+            self._accessed.pop(key, None)
+            self._remember(key, now, value)
+            self._flush_accessed()
+            self._evict(now)
+
+    def clear(self) -> None:
+        """Remove all cached responses."""
+        with self._lock:
+            self._memory.clear()
+            self._accessed.clear()
+            self._connection.execute("DELETE FROM responses")
+            self._count = self._size = 0
+
+    def close(self) -> None:
+        """Write pending access times and close the underlying database connection."""
+        with self._lock:
+            self._flush_accessed()
+            self._memory.clear()
+            self._connection.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            row = self._connection.execute("SELECT COUNT(*) FROM responses").fetchone()
+        return int(row[0])
+
+    def _remember(self, key: str, created_at: float, value: str) -> None:
+        """Add an entry to the in-memory LRU. Must hold the lock."""
+        if self.memory_entries <= 0:
+            return
+        expires_at = created_at + self.ttl if self.ttl is not None else None
+        self._memory[key] = (expires_at, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def _flush_accessed(self) -> None:
+        """Write the access times of in-memory hits to the database. Must hold the lock."""
+        if self._accessed:
+            self._connection.executemany(
+                "UPDATE responses SET accessed_at = ? WHERE key = ?",
+                [(accessed_at, key) for key, accessed_at in self._accessed.items()],
+            )
+            self._accessed.clear()
+
+    def _evict(self, now: float) -> None:
+        """Drop expired entries and enforce size limits. Must hold the lock."""
+        if self.ttl is not None:
+            self._delete(
+                self._connection.execute(
+                    "SELECT key, size FROM responses WHERE created_at <= ?",
+                    (now - self.ttl,),
+                ).fetchall()
+            )
+
+        if self.max_entries is not None and self._count > self.max_entries:
+            self._delete(
+                self._connection.execute(
+                    "SELECT key, size FROM responses ORDER BY accessed_at ASC LIMIT ?",
+                    (self._count - self.max_entries,),
+                ).fetchall()
+            )
+
+        if self.max_size_bytes is not None and self._size > self.max_size_bytes:
+            excess = self._size - self.max_size_bytes
+            rows = []
+            # Read the least recently used entries until enough are found
+            for key, size in self._connection.execute(
+                "SELECT key, size FROM responses ORDER BY accessed_at ASC"
+            ):
+                if excess <= 0:
+                    break
+                rows.append((key, size))
+                excess -= size
+            self._delete(rows)
+
+    def _delete(self, rows: List[Tuple[str, int]]) -> None:
+        """Delete entries from the database and the in-memory LRU. Must hold the lock."""
+        if not rows:
+            return
+        self._connection.executemany(
+            "DELETE FROM responses WHERE key = ?", [(key,) for key, _ in rows]
+        )
+        for key, size in rows:
+            self._memory.pop(key, None)
+            self._accessed.pop(key, None)
+            self._count = max(0, self._count - 1)
+            self._size = max(0, self._size - size)
@@ -1,18 +1,53 @@
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterator, Optional
 import requests
 import json
-from rhesis.client import Client
+import threading
+from collections import OrderedDict
+from rhesis.client import AsyncClient, Client, _import_httpx
+from rhesis.rate_limit import RateLimiter
+from rhesis.services.cache import LLMCache
+from rhesis.services.streaming import IncrementalJSONArrayParser, iter_sse_data
+from rhesis.services.usage import TokenUsage, active_usage
+from rhesis.utils import count_tokens
 
 
 class LLMService:
     """Service for interacting with the LLM API endpoints."""
 
-    def __init__(self) -> None:
+    # Number of distinct requests whose occurrences are counted for the cache
+    MAX_TRACKED_REQUESTS = 10_000
+
+    def __init__(
+        self,
+        cache: Optional[LLMCache] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+    ) -> None:
+        """
+        Initialize the LLM service.
+
+        Args:
+            cache: Optional response cache. The n-th identical request made
+                through this service maps to the n-th cached response, so
+                repeated calls that sample more outputs still get distinct ones,
+                and a new service replays a previous run in order. Call
+                reset_cache_occurrences() to replay from the first response.
+            rate_limiter: Optional rate limiter for completion requests. Share
+                one limiter across services to keep their combined traffic
+                within the API quota.
+        """
         self.client = Client()
-        self.headers = {
-            "Authorization": f"Bearer {self.client.api_key}",
-            "Content-Type": "application/json",
-        }
+        self.headers = self.client.headers
+        self.cache = cache
+        self.rate_limiter = rate_limiter
+        # Token usage of every completion made through this service
+        self.usage = TokenUsage()
+        self._cache_occurrences: "OrderedDict[str, int]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+
+    @property
+    def async_client(self) -> AsyncClient:
+        """Get an asynchronous client sharing this service's credentials."""
+        return AsyncClient(api_key=self.client.api_key, base_url=self.client.base_url)
 
     def run(
         self, prompt: str, response_format: str = "json_object", **kwargs: Any
@@ -24,19 +59,45 @@ class LLMService:
                 response_format=response_format,
                 **kwargs,
             )
-            response_content = response["choices"][0]["message"]["content"]
-            if response_format == "json_object":
-                return json.loads(response_content)
-
-            return response_content
+            return self._parse_content(response, response_format)
 
         except (requests.exceptions.HTTPError, KeyError, IndexError) as e:
-            # Log the error and return an appropriate message
-            print(f"Error occurred while running the prompt: {e}")
-            if response_format == "json_object":
-                return {"error": "An error occurred while processing the request."}
+            return self._error_response(e, response_format)
 
-            return "An error occurred while processing the request."
+    async def arun(
+        self, prompt: str, response_format: str = "json_object", **kwargs: Any
+    ) -> Any:
+        """Run a chat completion asynchronously, and return the response."""
+        httpx = _import_httpx()
+
+        try:
+            response = await self.acreate_completion(
+                messages=[{"role": "user", "content": prompt}],
+                response_format=response_format,
+                **kwargs,
+            )
+            return self._parse_content(response, response_format)
+
+        except (httpx.HTTPStatusError, KeyError, IndexError) as e:
+            return self._error_response(e, response_format)
+
+    @staticmethod
+    def _parse_content(response: Dict[str, Any], response_format: str) -> Any:
+        """Extract the message content from a completion response."""
+        response_content = response["choices"][0]["message"]["content"]
+        if response_format == "json_object":
+            return json.loads(response_content)
+
+        return response_content
+
+    @staticmethod
+    def _error_response(e: Exception, response_format: str) -> Any:
+        """Log the error and return an appropriate message."""
+        print(f"Error occurred while running the prompt: {e}")
+        if response_format == "json_object":
+            return {"error": "An error occurred while processing the request."}
+
+        return "An error occurred while processing the request."
 
     def create_completion(
         self,
@@ -44,6 +105,7 @@ class LLMService:
         temperature: float = 0.7,
         max_tokens: int = 2000,
         response_format: Optional[str] = None,
+        bypass_cache: bool = False,
         **kwargs: Any,
     ) -> Dict[str, Any]:
         """
@@ -53,6 +115,8 @@ class LLMService:
             messages: List of message dictionaries with 'role' and 'content'
             temperature: Sampling temperature (0-1)
             max_tokens: Maximum tokens to generate
+            bypass_cache: Skip the cache lookup and always call the API.
+                The fresh response still replaces the cached one.
             **kwargs: Additional parameters to pass to the API
 
         Returns:
@@ -70,12 +134,243 @@ class LLMService:
             **kwargs,
         }
 
-        response = requests.post(
-            self.client.get_url("services/chat/completions"),
-            headers=self.headers,
+        url = self.client.get_url("services/chat/completions")
+        cache = self.cache
+        cache_key = None
+        if cache is not None:
+            cache_key = self._next_cache_key(cache, url, request_data)
+            cached = None if bypass_cache else cache.get(cache_key)
+            if cached is not None:
+                self._count_usage(cached, cached=True)
+                return cached
+
+        # Completions have no side effects, so they are safe to retry
+        token_estimate = self._estimate_tokens(messages, max_tokens)
+        response = self.client.post(
+            url,
+            json=request_data,
+            idempotent=True,
+            rate_limiter=self.rate_limiter,
+            token_estimate=token_estimate,
+        )
+
+        response.raise_for_status()
+        result: Dict[str, Any] = response.json()
+        self._record_usage(token_estimate, result)
+        if cache is not None and cache_key is not None:
+            cache.set(cache_key, result)
+        return result
+
+    async def acreate_completion(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float = 0.7,
+        max_tokens: int = 2000,
+        response_format: Optional[str] = None,
+        bypass_cache: bool = False,
+        **kwargs: Any,
+    ) -> Dict[str, Any]:
+        """
+        Create a chat completion using the API asynchronously.
+
+        Args:
+            messages: List of message dictionaries with 'role' and 'content'
+            temperature: Sampling temperature (0-1)
+            max_tokens: Maximum tokens to generate
+            bypass_cache: Skip the cache lookup and always call the API.
+                The fresh response still replaces the cached one.
+            **kwargs: Additional parameters to pass to the API
+
+        Returns:
+            Dict[str, Any]: The raw response from the API
+
+        Raises:
+            httpx.HTTPStatusError: If the API request fails
+            ValueError: If the response cannot be parsed
+        """
+        request_data = {
+            "messages": messages,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+            "response_format": response_format,
+            **kwargs,
+        }
+
+        client = self.async_client
+        url = client.get_url("services/chat/completions")
+        cache = self.cache
+        cache_key = None
+        if cache is not None:
+            cache_key = self._next_cache_key(cache, url, request_data)
+            cached = None if bypass_cache else cache.get(cache_key)
+            if cached is not None:
+                self._count_usage(cached, cached=True)
+                return cached
+
+        # Completions have no side effects, so they are safe to retry
+        token_estimate = self._estimate_tokens(messages, max_tokens)
+        response = await client.post(
+            url,
             json=request_data,
+            idempotent=True,
+            rate_limiter=self.rate_limiter,
+            token_estimate=token_estimate,
         )
 
         response.raise_for_status()
         result: Dict[str, Any] = response.json()
+        self._record_usage(token_estimate, result)
+        if cache is not None and cache_key is not None:
+            cache.set(cache_key, result)
         return result
+
+    def stream_completion(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float = 0.7,
+        max_tokens: int = 2000,
+        response_format: Optional[str] = None,
+        **kwargs: Any,
+    ) -> Iterator[str]:
+        """
+        Create a chat completion and yield its content as it is generated.
+
+        The request asks the API for server-sent events. If the API answers
+        with a regular JSON response instead, its content is yielded at once.
+        Streamed completions are not cached.
+
+        Args:
+            messages: List of message dictionaries with 'role' and 'content'
+            temperature: Sampling temperature (0-1)
+            max_tokens: Maximum tokens to generate
+            **kwargs: Additional parameters to pass to the API
+
+        Yields:
+            str: The content deltas of the completion.
+
+        Raises:
+            requests.exceptions.HTTPError: If the API request fails
+        """
+        request_data = {
+            "messages": messages,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+            "response_format": response_format,
+            "stream": True,
+            **kwargs,
+        }
+
+        url = self.client.get_url("services/chat/completions")
+        token_estimate = self._estimate_tokens(messages, max_tokens)
+        response = self.client.post(
+            url,
+            json=request_data,
+            stream=True,
+            idempotent=True,
+            rate_limiter=self.rate_limiter,
+            token_estimate=token_estimate,
+        )
+
+        with response:
+            response.raise_for_status()
+            content_type = response.headers.get("Content-Type", "")
+            if not content_type.startswith("text/event-stream"):
+                result: Dict[str, Any] = response.json()
+                self._record_usage(token_estimate, result)
+                yield result["choices"][0]["message"]["content"]
+                return
+
+            # Server-sent events are always UTF-8 encoded
+            response.encoding = "utf-8"
+            lines = response.iter_lines(decode_unicode=True)
+            usage_recorded = False
+            try:
+                for data in iter_sse_data(lines):
+                    event = json.loads(data)
+                    if event.get("usage"):
+                        self._record_usage(token_estimate, event)
+                        usage_recorded = True
+                    for choice in event.get("choices") or []:
+                        delta = (choice.get("delta") or {}).get("content")
+                        if delta:
+                            yield delta
+            finally:
+                # Streams closed early or without a usage event
+                if not usage_recorded:
+                    self._count_usage({})
+
+    def stream_items(
+        self, prompt: str, key: Optional[str] = "tests", **kwargs: Any
+    ) -> Iterator[Any]:
+        """
+        Run a JSON chat completion and yield the elements of an array in the
+        response as soon as each one is complete.
+
+        Args:
+            prompt: The prompt to send.
+            key: Key of the array in the response object, or None if the
+                response is a top-level array.
+            **kwargs: Additional parameters passed to stream_completion.
+
+        Yields:
+            Any: The parsed array elements, in order.
+
+        Raises:
+            requests.exceptions.HTTPError: If the API request fails
+            json.JSONDecodeError: If an element is not valid JSON
+        """
+        kwargs.setdefault("response_format", "json_object")
+        parser = IncrementalJSONArrayParser(key=key)
+        for delta in self.stream_completion(
+            messages=[{"role": "user", "content": prompt}], **kwargs
+        ):
+            yield from parser.feed(delta)
+            if parser.done:
+                return
+
+    def reset_cache_occurrences(self) -> None:
+        """Restart the replay of identical requests from their first cached response."""
+        with self._cache_lock:
+            self._cache_occurrences.clear()
+
+    def _next_cache_key(
+        self, cache: LLMCache, url: str, request_data: Dict[str, Any]
+    ) -> str:
+        """Get the cache key for the next occurrence of an identical request."""
+        key = cache.make_key(url, request_data)
+        with self._cache_lock:
+            occurrence = self._cache_occurrences.pop(key, 0)
+            self._cache_occurrences[key] = occurrence + 1
+            if len(self._cache_occurrences) > self.MAX_TRACKED_REQUESTS:
+                # Forget the least recently made request, which restarts its
+                # replay from the first cached response
+                self._cache_occurrences.popitem(last=False)
+        if occurrence == 0:
+            return key
+        return cache.make_key(url, request_data, occurrence)
+
+    def _estimate_tokens(self, messages: List[Dict[str, str]], max_tokens: int) -> int:
+        """Estimate the tokens a request reserves from the rate limiter's budget."""
+        if self.rate_limiter is None or self.rate_limiter.tokens is None:
+            return 0
+        prompt_tokens = 0
+        for message in messages:
+            # Fall back to an estimate if the encoding is unavailable
+            token_count = count_tokens(str(message.get("content", "")), method="auto")
+            prompt_tokens += token_count or 0
+        return prompt_tokens + max_tokens
+
+    def _count_usage(self, result: Dict[str, Any], cached: bool = False) -> None:
+        """Add a completion to the service's usage and to the active runs' usage."""
+        self.usage.record(result, cached=cached)
+        for usage in active_usage():
+            usage.record(result, cached=cached)
+
+    def _record_usage(self, token_estimate: int, result: Dict[str, Any]) -> None:
+        """Record the reported usage and reconcile the rate limiter's budget."""
+        self._count_usage(result)
+        if self.rate_limiter is None or not token_estimate:
+            return
+        usage = result.get("usage")
+        if isinstance(usage, dict) and isinstance(usage.get("total_tokens"), int):
+            self.rate_limiter.record_usage(token_estimate, usage["total_tokens"])
@@ -0,0 +1,176 @@
+"""Helpers for streamed LLM completions."""
+
+import json
+from typing import Any, Iterable, Iterator, List, Optional
+
+
+def iter_sse_data(lines: Iterable[str]) -> Iterator[str]:
+    """
+    Extract the data payloads from a server-sent events stream.
+
+    Multi-line data fields are joined with newlines. The stream ends at the
+    first "[DONE]" payload.
+
+    Args:
+        lines: The decoded lines of the response body.
+
+    Yields:
+        str: The data payload of each event.
+    """
+    data: List[str] = []
+    for line in lines:
+        if not line:
+            # A blank line terminates the event
+            if data:
+                payload = "\n".join(data)
+                data = []
+                if payload == "[DONE]":
+                    return
+                yield payload
+            continue
+        if line.startswith(":"):
+            # Comment line, e.g. a keep-alive
+            continue
+        field, _, value = line.partition(":")
+        if field == "data":
+            data.append(value[1:] if value.startswith(" ") else value)
+
+    if data:
+        payload = "\n".join(data)
+        if payload != "[DONE]":
+            yield payload
+
+
+class IncrementalJSONArrayParser:
+    """Incrementally parse the elements of a JSON array as text arrives.
+
+    The parser tracks nesting and string state across chunks, and returns each
+    element of the target array as soon as its closing delimiter has been seen,
+    without waiting for the rest of the document.
+
+    Examples:
+        >>> parser = IncrementalJSONArrayParser(key="tests")
+        >>> parser.feed('{"tests": [{"prompt": "a"}, {"pro')
+        [{'prompt': 'a'}]
+        >>> parser.feed('mpt": "b"}]}')
+        [{'prompt': 'b'}]
+    """
+
+    def __init__(self, key: Optional[str] = "tests") -> None:
+        """
+        Initialize the parser.
+
+        Args:
+            key: Key of the array in the top-level object. None to parse a
+                top-level array.
+        """
+        self.key = key
+        self._buffer = ""
+        self._position = 0
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._string_start = 0
+        self._last_string: Optional[str] = None
+        self._last_key: Optional[str] = None
+        self._array_depth: Optional[int] = None
+        self._element_start: Optional[int] = None
+        self._done = False
+
+    @property
+    def done(self) -> bool:
+        """Whether the end of the target array has been reached."""
+        return self._done
+
+    def feed(self, chunk: str) -> List[Any]:
+        """
+        Add text to the parser.
+
+        Args:
+            chunk: The next piece of the JSON document.
+
+        Returns:
+            List[Any]: The array elements completed by this chunk.
+
+        Raises:
+            json.JSONDecodeError: If a completed element is not valid JSON.
+        """
+        if self._done:
+            return []
+
+        self._buffer += chunk
+        elements = []
+        buffer = self._buffer
+        position = self._position
+
+        while position < len(buffer):
+            char = buffer[position]
+
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+                    if self._array_depth is None and self._depth == 1:
+                        key_start = self._string_start + 1
+                        self._last_string = buffer[key_start:position]
+                position += 1
+                continue
+
+            in_array = (
+                self._array_depth is not None and self._depth == self._array_depth
+            )
+            if in_array and self._element_start is None and not char.isspace():
+                if char not in ",]":
+                    self._element_start = position
+
+            if char == '"':
+                self._in_string = True
+                self._string_start = position
+            elif char == ":" and self._depth == 1 and self._array_depth is None:
+                self._last_key = self._last_string
+            elif char in "{[":
+                if (
+                    char == "["
+                    and self._array_depth is None
+                    and self._is_target_array()
+                ):
+                    self._array_depth = self._depth + 1
+                self._depth += 1
+            elif char in "}]":
+                if in_array and char == "]":
+                    elements.extend(self._complete_element(buffer, position))
+                    self._done = True
+                    break
+                self._depth -= 1
+            elif char == "," and in_array:
+                elements.extend(self._complete_element(buffer, position))
+
+            position += 1
+
+        # Drop text that can no longer be part of an element
+        keep_from = self._element_start if self._element_start is not None else position
+        if self._in_string and self._array_depth is None:
+            keep_from = min(keep_from, self._string_start)
+        self._buffer = buffer[keep_from:]
+        self._position = position - keep_from
+        self._string_start -= keep_from
+        if self._element_start is not None:
+            self._element_start -= keep_from
+        return elements
+
+    def _is_target_array(self) -> bool:
+        """Check whether an array opening at the current depth is the target."""
+        if self.key is None:
+            return self._depth == 0
+        return self._depth == 1 and self._last_key == self.key
+
+    def _complete_element(self, buffer: str, position: int) -> List[Any]:
+        """Parse the element ending at position, if there is one."""
+        start = self._element_start
+        self._element_start = None
+        if start is None:
+            return []
+        return [json.loads(buffer[start:position])]
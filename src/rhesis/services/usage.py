@@ -0,0 +1,166 @@
+"""Token usage accounting for LLM calls."""
+
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+# Usage totals of the runs the current context belongs to, innermost last
+_active_usage: ContextVar[Tuple["TokenUsage", ...]] = ContextVar(
+    "rhesis_active_usage", default=()
+)
+
+
+class TokenUsage:
+    """Thread-safe running totals of the token usage reported by the API.
+
+    Responses served from an LLMCache are counted as cached calls and add no
+    tokens, since they did not consume any.
+
+    Examples:
+        >>> before = llm_service.usage.snapshot()
+        >>> llm_service.run(prompt="...")
+        >>> (llm_service.usage.snapshot() - before).total_tokens
+    """
+
+    FIELDS = (
+        "calls",
+        "cached_calls",
+        "calls_without_usage",
+        "prompt_tokens",
+        "completion_tokens",
+        "total_tokens",
+    )
+
+    def __init__(
+        self,
+        calls: int = 0,
+        cached_calls: int = 0,
+        calls_without_usage: int = 0,
+        prompt_tokens: int = 0,
+        completion_tokens: int = 0,
+        total_tokens: int = 0,
+    ) -> None:
+        """
+        Initialize the totals.
+
+        Args:
+            calls: Number of completions, including cached ones.
+            cached_calls: Number of completions served from a cache.
+            calls_without_usage: Number of API completions that reported no usage.
+            prompt_tokens: Total prompt tokens.
+            completion_tokens: Total completion tokens.
+            total_tokens: Total tokens.
+        """
+        self.calls = calls
+        self.cached_calls = cached_calls
+        self.calls_without_usage = calls_without_usage
+        self.prompt_tokens = prompt_tokens
+        self.completion_tokens = completion_tokens
+        self.total_tokens = total_tokens
+        self._lock = threading.Lock()
+
+    def record(self, result: Dict[str, Any], cached: bool = False) -> None:
+        """
+        Add the usage of a completion response.
+
+        Args:
+            result: The completion response, or a streamed event carrying usage.
+            cached: Whether the response was served from a cache.
+        """
+        usage = result.get("usage")
+        with self._lock:
+            self.calls += 1
+            if cached:
+                self.cached_calls += 1
+                return
+            if not isinstance(usage, dict):
+                self.calls_without_usage += 1
+                return
+            prompt_tokens, completion_tokens, total_tokens = (
+                value if isinstance(value, int) else None
+                for value in (
+                    usage.get("prompt_tokens"),
+                    usage.get("completion_tokens"),
+                    usage.get("total_tokens"),
+                )
+            )
+            self.prompt_tokens += prompt_tokens or 0
+            self.completion_tokens += completion_tokens or 0
+            if total_tokens is None:
+                total_tokens = (prompt_tokens or 0) + (completion_tokens or 0)
+            self.total_tokens += total_tokens
+
+    def snapshot(self) -> "TokenUsage":
+        """Get a copy of the current totals."""
+        with self._lock:
+            return TokenUsage(**{field: getattr(self, field) for field in self.FIELDS})
+
+    def cost(
+        self, prompt_price: float, completion_price: Optional[float] = None
+    ) -> float:
+        """
+        Compute the cost of the usage.
+
+        Args:
+            prompt_price: Price per million prompt tokens.
+            completion_price: Price per million completion tokens. Defaults to
+                the prompt price.
+
+        Returns:
+            float: The cost, in the currency of the prices.
+        """
+        if completion_price is None:
+            completion_price = prompt_price
+        return (
+            self.prompt_tokens * prompt_price
+            + self.completion_tokens * completion_price
+        ) / 1_000_000
+
+    def to_dict(self) -> Dict[str, int]:
+        """Get the totals as a dictionary, e.g. for test set metadata."""
+        return {field: getattr(self, field) for field in self.FIELDS}
+
+    def __sub__(self, other: "TokenUsage") -> "TokenUsage":
+        return TokenUsage(
+            **{
+                field: getattr(self, field) - getattr(other, field)
+                for field in self.FIELDS
+            }
+        )
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{field}={getattr(self, field)}" for field in self.FIELDS)
+        return f"TokenUsage({fields})"
+
+
+@contextmanager
+def track_usage() -> Iterator[TokenUsage]:
+    """Collect the usage of the LLM calls made within a block.
+
+    Every LLMService records its completions into the totals of the blocks
+    the calling context is in, besides its own usage. Unlike a difference of
+    snapshots of a shared service's usage, the totals only contain the calls
+    of this block, even while other threads use the same service. Threads
+    started within the block must run in a copy of its context (see
+    contextvars.copy_context) for their calls to count.
+
+    Examples:
+        >>> with track_usage() as usage:
+        ...     llm_service.run(prompt="...")
+        >>> usage.total_tokens
+
+    Yields:
+        TokenUsage: The totals of the block.
+    """
+    usage = TokenUsage()
+    token = _active_usage.set(_active_usage.get() + (usage,))
+    try:
+        yield usage
+    finally:
+        _active_usage.reset(token)
+
+
+def active_usage() -> Tuple[TokenUsage, ...]:
+    """Get the totals of the track_usage() blocks the current context is in."""
+    return _active_usage.get()
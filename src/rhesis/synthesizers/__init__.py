@@ -1,5 +1,37 @@
-from rhesis.synthesizers.base import TestSetSynthesizer
-from rhesis.synthesizers.prompt_synthesizer import PromptSynthesizer
-from rhesis.synthesizers.paraphrasing_synthesizer import ParaphrasingSynthesizer
+import importlib
+from typing import TYPE_CHECKING, Any, List
 
-__all__ = ["TestSetSynthesizer", "PromptSynthesizer", "ParaphrasingSynthesizer"]
+if TYPE_CHECKING:
+    from rhesis.synthesizers.base import TestSetSynthesizer
+    from rhesis.synthesizers.prompt_synthesizer import PromptSynthesizer
+    from rhesis.synthesizers.paraphrasing_synthesizer import ParaphrasingSynthesizer
+    from rhesis.synthesizers.tracing import Tracer
+
+# Module defining each lazily imported attribute
+_LAZY_ATTRIBUTES = {
+    "TestSetSynthesizer": "rhesis.synthesizers.base",
+    "PromptSynthesizer": "rhesis.synthesizers.prompt_synthesizer",
+    "ParaphrasingSynthesizer": "rhesis.synthesizers.paraphrasing_synthesizer",
+    "Tracer": "rhesis.synthesizers.tracing",
+}
+
+__all__ = [
+    "TestSetSynthesizer",
+    "PromptSynthesizer",
+    "ParaphrasingSynthesizer",
+    "Tracer",
+]
+
+
+def __getattr__(name: str) -> Any:
+    """Import synthesizer classes on first access."""
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted([*globals(), *_LAZY_ATTRIBUTES])
@@ -1,26 +1,68 @@
+import contextvars
+import json
 from abc import ABC, abstractmethod
-from typing import Any, List
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import nullcontext
+from typing import Any, ContextManager, Dict, Iterator, List, Optional
 from pathlib import Path
 from tqdm.auto import tqdm
 from jinja2 import Template
-from rhesis.services import LLMService
+from rhesis.services import LLMService, TokenUsage
 from rhesis.entities.test_set import TestSet
+from rhesis.synthesizers.tracing import Tracer
+from rhesis.utils import count_tokens_batch
 
 
 class TestSetSynthesizer(ABC):
     """Base class for all test set synthesizers."""
 
-    def __init__(self, batch_size: int = 5):
+    def __init__(
+        self,
+        batch_size: int = 5,
+        max_concurrency: int = 1,
+        llm_service: Optional[LLMService] = None,
+        tracer: Optional[Tracer] = None,
+    ):
         """
         Initialize the base synthesizer.
 
         Args:
             batch_size: Maximum number of items to process in a single LLM call
+            max_concurrency: Maximum number of LLM calls in flight at once.
+                Defaults to 1 (sequential processing).
+            llm_service: Optional LLM service to use, e.g. one configured with a
+                response cache. Defaults to a new LLMService.
+            tracer: Optional tracer recording the time spent in each stage of
+                generation: template rendering, LLM calls, parsing, top-ups,
+                metadata and test set properties. Tracing is off by default.
+
+        Raises:
+            ValueError: If batch_size or max_concurrency is less than 1
         """
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
         self.batch_size = batch_size
-        self.llm_service = LLMService()
+        self.max_concurrency = max_concurrency
+        self.llm_service = llm_service if llm_service is not None else LLMService()
+        self.tracer = tracer
         self.system_prompt = self._load_prompt_template()
 
+    def _span(self, name: str, **args: Any) -> ContextManager[None]:
+        """Time a stage of generation if a tracer is set."""
+        if self.tracer is None:
+            return nullcontext()
+        return self.tracer.span(name, category=self.__class__.__name__, **args)
+
+    def _run_llm(self, prompt: str) -> Any:
+        """Run the LLM on a rendered prompt, tracing the call.
+
+        The span includes decoding the JSON content of the completion.
+        """
+        with self._span("llm_call", prompt_chars=len(prompt)):
+            return self.llm_service.run(prompt=prompt)
+
     def _load_prompt_template(self) -> Template:
         """Load the prompt template from assets directory."""
         # Convert camel case to snake case
@@ -37,19 +79,149 @@ class TestSetSynthesizer(ABC):
         items: List[Any],
         process_func: Any,
         desc: str = "Processing",
+        max_concurrency: Optional[int] = None,
     ) -> List[Any]:
-        """Process items with a progress bar."""
-        results = []
+        """
+        Process items with a progress bar.
+
+        Items are processed on up to max_concurrency threads. Results are
+        collected in the order of the input items regardless of completion order,
+        and list results are flattened into the output.
+
+        Args:
+            items: The items to process
+            process_func: Function called with each item
+            desc: Description shown on the progress bar
+            max_concurrency: Maximum number of items processed at once.
+                Defaults to the synthesizer's max_concurrency.
+
+        Returns:
+            List[Any]: The flattened results in input order
+        """
+        workers = min(max_concurrency or self.max_concurrency, len(items) or 1)
+        item_results: List[Any] = [None] * len(items)
+
         with tqdm(total=len(items), desc=desc) as pbar:
-            for item in items:
-                result = process_func(item)
-                if isinstance(result, list):
-                    results.extend(result)
-                else:
-                    results.append(result)
-                pbar.update(1)
+            if workers == 1:
+                for index, item in enumerate(items):
+                    item_results[index] = process_func(item)
+                    pbar.update(1)
+            else:
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    # Workers run in a copy of the caller's context, so their
+                    # LLM calls count towards the usage of the current run
+                    futures = {
+                        executor.submit(
+                            contextvars.copy_context().run, process_func, item
+                        ): index
+                        for index, item in enumerate(items)
+                    }
+                    try:
+                        for future in as_completed(futures):
+                            item_results[futures[future]] = future.result()
+                            pbar.update(1)
+                    except BaseException:
+                        for future in futures:
+                            future.cancel()
+                        raise
+
+        results = []
+        for result in item_results:
+            if isinstance(result, list):
+                results.extend(result)
+            else:
+                results.append(result)
         return results
 
+    def _stream_tests(self, prompt: str) -> Iterator[Any]:
+        """
+        Stream the items of the "tests" array of a completion as they arrive.
+
+        A malformed element ends the stream early; callers top up the shortfall
+        like they do for short non-streamed responses.
+
+        Args:
+            prompt: The formatted prompt to send
+
+        Yields:
+            Any: The parsed items, in order
+        """
+        try:
+            yield from self.llm_service.stream_items(prompt, key="tests")
+        except json.JSONDecodeError:
+            return
+
+    def _planned_prompts(self, **kwargs: Any) -> List[str]:
+        """
+        Render the prompts generate() sends before any top-up.
+
+        Subclasses override this to support estimate_usage().
+
+        Args:
+            **kwargs: The keyword arguments of generate()
+
+        Returns:
+            List[str]: The rendered prompts, one per LLM call
+
+        Raises:
+            NotImplementedError: If the synthesizer does not support estimates
+        """
+        raise NotImplementedError(
+            f"{self.__class__.__name__} does not support usage estimates"
+        )
+
+    def estimate_usage(
+        self,
+        prompt_price: Optional[float] = None,
+        completion_price: Optional[float] = None,
+        max_tokens: int = 2000,
+        **kwargs: Any,
+    ) -> Dict[str, Any]:
+        """
+        Estimate the LLM usage of generate() without calling the LLM.
+
+        The prompts of the planned LLM calls are rendered and their tokens
+        counted. Top-up calls for short responses and the call generating the
+        test set properties depend on the responses and are not included.
+
+        Args:
+            prompt_price: Optional price per million prompt tokens.
+            completion_price: Optional price per million completion tokens.
+                Defaults to the prompt price.
+            max_tokens: Maximum completion tokens per call.
+            **kwargs: The keyword arguments that will be passed to generate()
+
+        Returns:
+            Dict[str, Any]: The number of calls, the total and largest number of
+                prompt tokens, the maximum number of completion tokens and, if a
+                price is given, the maximum cost.
+
+        Raises:
+            NotImplementedError: If the synthesizer does not support estimates
+        """
+        prompts = self._planned_prompts(**kwargs)
+        token_counts = [
+            count or 0 for count in count_tokens_batch(prompts, method="auto")
+        ]
+        estimate: Dict[str, Any] = {
+            "calls": len(prompts),
+            "prompt_tokens": sum(token_counts),
+            "largest_prompt_tokens": max(token_counts, default=0),
+            "max_completion_tokens": len(prompts) * max_tokens,
+        }
+        if prompt_price is not None:
+            estimate["max_cost"] = TokenUsage(
+                prompt_tokens=estimate["prompt_tokens"],
+                completion_tokens=estimate["max_completion_tokens"],
+            ).cost(prompt_price, completion_price)
+        return estimate
+
+    @staticmethod
+    def _attach_usage(test_set: TestSet, usage: TokenUsage) -> TestSet:
+        """Add the token usage of a run to the test set metadata."""
+        test_set.metadata = {**(test_set.metadata or {}), "usage": usage.to_dict()}
+        return test_set
+
     @abstractmethod
     def generate(self, **kwargs: Any) -> TestSet:
         """
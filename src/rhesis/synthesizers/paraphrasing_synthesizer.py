@@ -1,6 +1,8 @@
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterator, Optional
 from rhesis.synthesizers.base import TestSetSynthesizer
 from rhesis.entities.test_set import TestSet
+from rhesis.services import LLMService, track_usage
+from rhesis.synthesizers.tracing import Tracer
 from jinja2 import Template
 from pathlib import Path
 
@@ -13,6 +15,10 @@ class ParaphrasingSynthesizer(TestSetSynthesizer):
         test_set: TestSet,
         batch_size: int = 5,
         system_prompt: Optional[str] = None,
+        max_concurrency: int = 1,
+        packed: bool = False,
+        llm_service: Optional[LLMService] = None,
+        tracer: Optional[Tracer] = None,
     ):
         """
         Initialize the ParaphrasingSynthesizer.
@@ -21,9 +27,21 @@ class ParaphrasingSynthesizer(TestSetSynthesizer):
             test_set: The original test set to paraphrase
             batch_size: Maximum number of prompts to process in a single LLM call
             system_prompt: Optional custom system prompt template to override the default
+            max_concurrency: Maximum number of LLM calls in flight at once
+            packed: Whether to pack up to batch_size tests into a single LLM call.
+                Packed requests use the batch template; tests the LLM returns too
+                few paraphrases for are topped up with single-test requests.
+            llm_service: Optional LLM service to use. Defaults to a new LLMService.
+            tracer: Optional tracer recording the time spent in each stage.
         """
-        super().__init__(batch_size=batch_size)
+        super().__init__(
+            batch_size=batch_size,
+            max_concurrency=max_concurrency,
+            llm_service=llm_service,
+            tracer=tracer,
+        )
         self.test_set = test_set
+        self.packed = packed
         self.num_paraphrases: int = 2  # Default value, can be overridden in generate()
 
         if system_prompt:
@@ -36,6 +54,13 @@ class ParaphrasingSynthesizer(TestSetSynthesizer):
             with open(prompt_path, "r") as f:
                 self.system_prompt = Template(f.read())
 
+        # Template for packing several tests into one request
+        batch_prompt_path = (
+            Path(__file__).parent / "assets" / "paraphrasing_synthesizer_batch.md"
+        )
+        with open(batch_prompt_path, "r") as f:
+            self.batch_prompt = Template(f.read())
+
     def _parse_paraphrases(self, content: Any) -> List[Dict[str, Any]]:
         """
         Parse the LLM response content into a list of paraphrased versions.
@@ -88,56 +113,31 @@ class ParaphrasingSynthesizer(TestSetSynthesizer):
 
         return paraphrases
 
-    def _generate_paraphrases(self, test: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """
-        Generate paraphrased versions of a single test.
-
-        Args:
-            test: The original test to paraphrase
-
-        Returns:
-            List[Dict[str, Any]]: List of paraphrased versions, exactly num_paraphrases in length
-        """
-        # Extract the prompt content, handling different possible test structures
-        original_prompt = ""
+    @staticmethod
+    def _original_prompt(test: Dict[str, Any]) -> str:
+        """Extract the prompt content, handling different possible test structures."""
         if isinstance(test.get("prompt"), dict):
-            original_prompt = test["prompt"].get("content", "")
+            return str(test["prompt"].get("content", ""))
         elif isinstance(test.get("prompt"), str):
-            original_prompt = test["prompt"]
+            return str(test["prompt"])
         else:
-            original_prompt = str(test.get("prompt", ""))
+            return str(test.get("prompt", ""))
 
-        # Format the system prompt
-        formatted_prompt = self.system_prompt.render(
-            original_prompt=original_prompt,
-            num_paraphrases=self.num_paraphrases,
-        )
-
-        # Use run() method with default parameters
-        content = self.llm_service.run(prompt=formatted_prompt)
-
-        # Parse and validate the response
-        paraphrases = self._parse_paraphrases(content)
-
-        # Ensure we get exactly num_paraphrases results
-        if len(paraphrases) < self.num_paraphrases:
-            for attempt in range(2):
-                additional_content = self.llm_service.run(prompt=formatted_prompt)
-                additional_paraphrases = self._parse_paraphrases(additional_content)
-                paraphrases.extend(additional_paraphrases)
-
-                if len(paraphrases) >= self.num_paraphrases:
-                    break
-
-            if len(paraphrases) < self.num_paraphrases:
-                raise ValueError(
-                    f"LLM returned {len(paraphrases)} paraphrases, expected {self.num_paraphrases}"
-                )
+    @staticmethod
+    def _build_paraphrased_tests(
+        test: Dict[str, Any], paraphrases: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Create paraphrased test objects with all the necessary metadata.
 
-        # Take exactly num_paraphrases results
-        paraphrases = paraphrases[: self.num_paraphrases]
+        Args:
+            test: The original test
+            paraphrases: Parsed paraphrases of the original test
 
-        # Create paraphrased test objects with all the necessary metadata
+        Returns:
+            List[Dict[str, Any]]: The paraphrased tests
+        """
+        original_prompt = ParaphrasingSynthesizer._original_prompt(test)
         return [
             {
                 "prompt": {
@@ -157,6 +157,172 @@ class ParaphrasingSynthesizer(TestSetSynthesizer):
             for p in paraphrases
         ]
 
+    def _generate_paraphrases(
+        self, test: Dict[str, Any], num_paraphrases: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Generate paraphrased versions of a single test.
+
+        Args:
+            test: The original test to paraphrase
+            num_paraphrases: Number of paraphrases to generate.
+                Defaults to the num_paraphrases passed to generate().
+
+        Returns:
+            List[Dict[str, Any]]: List of paraphrased versions, exactly num_paraphrases in length
+        """
+        if num_paraphrases is None:
+            num_paraphrases = self.num_paraphrases
+
+        # Format the system prompt
+        with self._span("render"):
+            formatted_prompt = self.system_prompt.render(
+                original_prompt=self._original_prompt(test),
+                num_paraphrases=num_paraphrases,
+            )
+
+        # Use run() method with default parameters
+        content = self._run_llm(formatted_prompt)
+
+        # Parse and validate the response
+        with self._span("parse"):
+            paraphrases = self._parse_paraphrases(content)
+
+        # Ensure we get exactly num_paraphrases results
+        if len(paraphrases) < num_paraphrases:
+            with self._span("top_up", shortfall=num_paraphrases - len(paraphrases)):
+                for attempt in range(2):
+                    additional_content = self._run_llm(formatted_prompt)
+                    with self._span("parse"):
+                        additional_paraphrases = self._parse_paraphrases(
+                            additional_content
+                        )
+                    paraphrases.extend(additional_paraphrases)
+
+                    if len(paraphrases) >= num_paraphrases:
+                        break
+
+            if len(paraphrases) < num_paraphrases:
+                raise ValueError(
+                    f"LLM returned {len(paraphrases)} paraphrases, expected {num_paraphrases}"
+                )
+
+        # Take exactly num_paraphrases results
+        paraphrases = paraphrases[:num_paraphrases]
+
+        with self._span("metadata"):
+            return self._build_paraphrased_tests(test, paraphrases)
+
+    def _parse_packed_paraphrases(
+        self, content: Any, num_tests: int
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Parse a packed LLM response and map paraphrases back to their originals.
+
+        Malformed items and items without a valid original_index are dropped. A
+        response that is not an object with a tests array yields no paraphrases,
+        so every original is topped up individually.
+
+        Args:
+            content: Python object from LLM containing paraphrased prompts
+            num_tests: Number of original tests packed into the request
+
+        Returns:
+            List[List[Dict[str, Any]]]: Parsed paraphrases for each original, by index
+        """
+        grouped: List[List[Dict[str, Any]]] = [[] for _ in range(num_tests)]
+        if not isinstance(content, dict) or not isinstance(content.get("tests"), list):
+            return grouped
+
+        for item in content["tests"]:
+            if not isinstance(item, dict):
+                continue
+            index = item.get("original_index")
+            if isinstance(index, str) and index.isdigit():
+                index = int(index)
+            if not isinstance(index, int) or not 0 <= index < num_tests:
+                continue
+            try:
+                grouped[index].extend(self._parse_paraphrases({"tests": [item]}))
+            except ValueError:
+                continue
+
+        return grouped
+
+    def _generate_packed_paraphrases(
+        self, tests: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Generate paraphrases for several tests in a single LLM call.
+
+        Args:
+            tests: The original tests to paraphrase, at most batch_size of them
+
+        Returns:
+            List[Dict[str, Any]]: Each original test followed by its paraphrases
+        """
+        with self._span("render", num_tests=len(tests)):
+            formatted_prompt = self.batch_prompt.render(
+                original_prompts=[self._original_prompt(test) for test in tests],
+                num_paraphrases=self.num_paraphrases,
+            )
+        content = self._run_llm(formatted_prompt)
+        with self._span("parse", num_tests=len(tests)):
+            grouped = self._parse_packed_paraphrases(content, len(tests))
+
+        results: List[Dict[str, Any]] = []
+        for test, paraphrases in zip(tests, grouped):
+            paraphrases = paraphrases[: self.num_paraphrases]
+            results.append(test)
+            with self._span("metadata"):
+                results.extend(self._build_paraphrased_tests(test, paraphrases))
+
+            # Top up originals the packed response fell short on
+            shortfall = self.num_paraphrases - len(paraphrases)
+            if shortfall > 0:
+                with self._span("top_up", shortfall=shortfall):
+                    results.extend(self._generate_paraphrases(test, shortfall))
+
+        return results
+
+    def stream(self, num_paraphrases: int = 2) -> Iterator[Dict[str, Any]]:
+        """
+        Generate paraphrases, yielding each test as soon as it is available.
+
+        Each original test is yielded first, followed by its paraphrases as the
+        streamed completion produces them. Originals are processed one at a
+        time, regardless of packed, and short or malformed responses are topped
+        up with regular requests.
+
+        Args:
+            num_paraphrases: Number of paraphrases to generate per test. Defaults to 2.
+
+        Yields:
+            Dict[str, Any]: Each original test followed by its paraphrased versions
+        """
+        self.num_paraphrases = num_paraphrases
+
+        for test in self.test_set.to_dict():
+            yield test
+
+            formatted_prompt = self.system_prompt.render(
+                original_prompt=self._original_prompt(test),
+                num_paraphrases=num_paraphrases,
+            )
+            count = 0
+            for item in self._stream_tests(formatted_prompt):
+                try:
+                    paraphrases = self._parse_paraphrases({"tests": [item]})
+                except ValueError:
+                    continue
+                yield from self._build_paraphrased_tests(test, paraphrases)
+                count += 1
+                if count == num_paraphrases:
+                    break
+
+            if count < num_paraphrases:
+                yield from self._generate_paraphrases(test, num_paraphrases - count)
+
     def generate(self, **kwargs: Any) -> TestSet:
         """
         Generate paraphrased versions of all tests in the test set.
@@ -167,24 +333,68 @@ class ParaphrasingSynthesizer(TestSetSynthesizer):
 
         Returns:
             TestSet: A TestSet containing original tests plus their paraphrased versions,
-                    with paraphrases appearing immediately after their original test
+                    with paraphrases appearing immediately after their original test.
+                    The token usage of the run is added to its metadata under "usage".
         """
         self.num_paraphrases = kwargs.get("num_paraphrases", 2)
+        with (
+            track_usage() as usage,
+            self._span("generate", num_paraphrases=self.num_paraphrases),
+        ):
+            test_set = self._generate()
+        return self._attach_usage(test_set, usage)
+
+    def _pack(self, tests: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+        """Split tests into packed requests of at most batch_size tests."""
+        return [
+            tests[i : i + self.batch_size]
+            for i in range(0, len(tests), self.batch_size)
+        ]
+
+    def _planned_prompts(self, **kwargs: Any) -> List[str]:
+        """Render the prompt of every request generate() sends before top-ups."""
+        num_paraphrases = kwargs.get("num_paraphrases", 2)
+        original_tests = self.test_set.to_dict()
+        if self.packed:
+            return [
+                self.batch_prompt.render(
+                    original_prompts=[self._original_prompt(test) for test in batch],
+                    num_paraphrases=num_paraphrases,
+                )
+                for batch in self._pack(original_tests)
+            ]
+        return [
+            self.system_prompt.render(
+                original_prompt=self._original_prompt(test),
+                num_paraphrases=num_paraphrases,
+            )
+            for test in original_tests
+        ]
+
+    def _generate(self) -> TestSet:
+        """Paraphrase every test of the test set num_paraphrases times."""
         original_tests = self.test_set.to_dict()
-        all_tests = []
 
-        def process_test(test: Dict[str, Any]) -> None:
+        def process_test(test: Dict[str, Any]) -> List[Dict[str, Any]]:
             """Process a single test and its paraphrases."""
-            all_tests.append(test)  # Add original
-            paraphrases = self._generate_paraphrases(test)  # Generate paraphrases
-            all_tests.extend(paraphrases)  # Add paraphrases
-
-        # Use the base class's progress bar
-        self._process_with_progress(
-            original_tests,
-            process_test,
-            desc=f"Generating {self.num_paraphrases} paraphrases per test",
-        )
+            return [test, *self._generate_paraphrases(test)]
+
+        # Use the base class's progress bar; results keep the input order
+        if self.packed:
+            all_tests = self._process_with_progress(
+                self._pack(original_tests),
+                self._generate_packed_paraphrases,
+                desc=(
+                    f"Generating {self.num_paraphrases} paraphrases per test "
+                    f"in batches of {self.batch_size}"
+                ),
+            )
+        else:
+            all_tests = self._process_with_progress(
+                original_tests,
+                process_test,
+                desc=f"Generating {self.num_paraphrases} paraphrases per test",
+            )
 
         test_set = TestSet(
             tests=all_tests,
@@ -194,10 +404,13 @@ class ParaphrasingSynthesizer(TestSetSynthesizer):
                 "num_original_tests": len(original_tests),
                 "total_tests": len(all_tests),
                 "batch_size": self.batch_size,
+                "max_concurrency": self.max_concurrency,
+                "packed": self.packed,
                 "synthesizer": "ParaphrasingSynthesizer",
             },
         )
 
         # Set attributes based on the generated tests
-        test_set.set_properties()
+        with self._span("set_properties"):
+            test_set.set_properties(llm_service=self.llm_service)
         return test_set
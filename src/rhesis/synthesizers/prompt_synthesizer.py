@@ -1,15 +1,23 @@
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterator, Optional
 from pathlib import Path
 from jinja2 import Template
 from rhesis.synthesizers.base import TestSetSynthesizer
 from rhesis.entities.test_set import TestSet
+from rhesis.services import LLMService, track_usage
+from rhesis.synthesizers.tracing import Tracer
 
 
 class PromptSynthesizer(TestSetSynthesizer):
     """A synthesizer that generates test cases based on a prompt using LLM."""
 
     def __init__(
-        self, prompt: str, batch_size: int = 5, system_prompt: Optional[str] = None
+        self,
+        prompt: str,
+        batch_size: int = 5,
+        system_prompt: Optional[str] = None,
+        max_concurrency: int = 4,
+        llm_service: Optional[LLMService] = None,
+        tracer: Optional[Tracer] = None,
     ):
         """
         Initialize the PromptSynthesizer.
@@ -18,8 +26,17 @@ class PromptSynthesizer(TestSetSynthesizer):
             prompt: The generation prompt to use
             batch_size: Maximum number of tests to generate in a single LLM call
             system_prompt: Optional custom system prompt template to override the default
+            max_concurrency: Maximum number of batches generated concurrently.
+                Defaults to 4; pass 1 to generate batches one at a time.
+            llm_service: Optional LLM service to use. Defaults to a new LLMService.
+            tracer: Optional tracer recording the time spent in each stage.
         """
-        super().__init__(batch_size=batch_size)
+        super().__init__(
+            batch_size=batch_size,
+            max_concurrency=max_concurrency,
+            llm_service=llm_service,
+            tracer=tracer,
+        )
         self.prompt = prompt
 
         if system_prompt:
@@ -31,60 +48,139 @@ class PromptSynthesizer(TestSetSynthesizer):
                 self.system_prompt = Template(f.read())
 
     def _generate_batch(self, num_tests: int) -> List[Dict[str, Any]]:
-        """Generate a batch of test cases."""
-        formatted_prompt = self.system_prompt.render(
-            generation_prompt=self.prompt, num_tests=num_tests
-        )
+        """Generate a batch of test cases.
+
+        A batch that is still short after two retries is returned as is;
+        generate() tops up the total shortfall across all batches.
+        """
+        with self._span("render"):
+            formatted_prompt = self.system_prompt.render(
+                generation_prompt=self.prompt, num_tests=num_tests
+            )
 
         # Use run() method with default parameters
-        response = self.llm_service.run(prompt=formatted_prompt)
+        response = self._run_llm(formatted_prompt)
 
-        if not isinstance(response, dict) or "tests" not in response:
-            raise ValueError(
-                f"Expected a dict with 'tests' key, got {type(response).__name__}"
-            )
+        with self._span("parse"):
+            if not isinstance(response, dict) or "tests" not in response:
+                raise ValueError(
+                    f"Expected a dict with 'tests' key, got {type(response).__name__}"
+                )
 
-        test_cases = response["tests"]
-        if not isinstance(test_cases, list):
-            raise ValueError(
-                f"Expected 'tests' to be a list, got {type(test_cases).__name__}"
-            )
+            test_cases = response["tests"]
+            if not isinstance(test_cases, list):
+                raise ValueError(
+                    f"Expected 'tests' to be a list, got {type(test_cases).__name__}"
+                )
 
         # Ensure we get the requested number of test cases
         if len(test_cases) < num_tests:
-            for attempt in range(2):  # Try up to 2 more times
-                additional_response = self.llm_service.run(prompt=formatted_prompt)
-                if (
-                    not isinstance(additional_response, dict)
-                    or "tests" not in additional_response
-                ):
-                    continue
-                additional_cases = additional_response["tests"]
-                if not isinstance(additional_cases, list):
-                    continue
-                test_cases.extend(additional_cases)
-
-                if len(test_cases) >= num_tests:
-                    break
-
-            if len(test_cases) < num_tests:
-                raise ValueError(
-                    f"LLM returned {len(test_cases)} test cases, expected {num_tests}"
-                )
+            with self._span("top_up", shortfall=num_tests - len(test_cases)):
+                for attempt in range(2):  # Try up to 2 more times
+                    additional_response = self._run_llm(formatted_prompt)
+                    if (
+                        not isinstance(additional_response, dict)
+                        or "tests" not in additional_response
+                    ):
+                        continue
+                    additional_cases = additional_response["tests"]
+                    if not isinstance(additional_cases, list):
+                        continue
+                    test_cases.extend(additional_cases)
 
-        # Take exactly num_tests results
+                    if len(test_cases) >= num_tests:
+                        break
+
+        # Take at most num_tests results
         test_cases = test_cases[:num_tests]
 
         # Add metadata to each test case
-        return [
-            {
-                **test,
-                "metadata": {
-                    "generated_by": "PromptSynthesizer",
-                },
-            }
-            for test in test_cases
-        ]
+        with self._span("metadata"):
+            return [
+                {
+                    **test,
+                    "metadata": {
+                        "generated_by": "PromptSynthesizer",
+                    },
+                }
+                for test in test_cases
+            ]
+
+    def _split_batches(self, num_tests: int) -> List[int]:
+        """Split a number of tests into batch sizes of at most batch_size."""
+        full_batches, remainder = divmod(num_tests, self.batch_size)
+        return [self.batch_size] * full_batches + ([remainder] if remainder else [])
+
+    @staticmethod
+    def _dedup_key(test: Dict[str, Any]) -> str:
+        """Get the key identifying duplicate test cases."""
+        prompt = test.get("prompt")
+        if isinstance(prompt, dict):
+            return str(prompt.get("content", "")).strip().lower()
+        return str(prompt).strip().lower()
+
+    @staticmethod
+    def _deduplicate(test_cases: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Remove test cases whose prompt content was already generated."""
+        seen = set()
+        unique = []
+        for test in test_cases:
+            key = PromptSynthesizer._dedup_key(test)
+            if key in seen:
+                continue
+            seen.add(key)
+            unique.append(test)
+        return unique
+
+    def stream(self, num_tests: int = 5) -> Iterator[Dict[str, Any]]:
+        """
+        Generate test cases, yielding each one as soon as the LLM has produced it.
+
+        Batches are requested one at a time with streamed completions, so the
+        first tests are available for validation or persistence while the rest
+        are still being generated. Duplicates are skipped and the shortfall is
+        topped up with up to two additional rounds of batches.
+
+        Args:
+            num_tests: Total number of test cases to generate. Defaults to 5.
+                Nothing is generated if it is not positive.
+
+        Yields:
+            Dict[str, Any]: The generated test cases
+
+        Raises:
+            ValueError: If the LLM does not produce enough unique test cases
+        """
+        if not isinstance(num_tests, int):
+            raise TypeError("num_tests must be an integer")
+        if num_tests <= 0:
+            return
+
+        seen = set()
+        batches = self._split_batches(num_tests)
+        for attempt in range(3):
+            for batch_size in batches:
+                formatted_prompt = self.system_prompt.render(
+                    generation_prompt=self.prompt, num_tests=batch_size
+                )
+                for test in self._stream_tests(formatted_prompt):
+                    if not isinstance(test, dict):
+                        continue
+                    key = self._dedup_key(test)
+                    if key in seen:
+                        continue
+                    seen.add(key)
+                    yield {**test, "metadata": {"generated_by": "PromptSynthesizer"}}
+                    if len(seen) == num_tests:
+                        return
+
+            # Top up tests lost to deduplication, requesting whole batches
+            shortfall = num_tests - len(seen)
+            batches = [self.batch_size] * -(-shortfall // self.batch_size)
+
+        raise ValueError(
+            f"LLM returned {len(seen)} unique test cases, expected {num_tests}"
+        )
 
     def generate(self, **kwargs: Any) -> TestSet:
         """
@@ -95,16 +191,57 @@ class PromptSynthesizer(TestSetSynthesizer):
                 num_tests (int): Total number of test cases to generate. Defaults to 5.
 
         Returns:
-            TestSet: A TestSet entity containing the generated test cases
+            TestSet: A TestSet entity containing the generated test cases. The
+                token usage of the run is added to its metadata under "usage".
         """
         num_tests = kwargs.get("num_tests", 5)
         if not isinstance(num_tests, int):
             raise TypeError("num_tests must be an integer")
 
-        all_test_cases = []
+        with track_usage() as usage, self._span("generate", num_tests=num_tests):
+            test_set = self._generate(num_tests)
+        return self._attach_usage(test_set, usage)
+
+    def _planned_prompts(self, **kwargs: Any) -> List[str]:
+        """Render the prompt of every batch generate() requests."""
+        return [
+            self.system_prompt.render(generation_prompt=self.prompt, num_tests=n)
+            for n in self._split_batches(kwargs.get("num_tests", 5))
+        ]
+
+    def _generate(self, num_tests: int) -> TestSet:
+        """Generate a test set of num_tests test cases."""
+        # Generate tests in batches of at most batch_size, dispatched concurrently
+        test_cases = self._process_with_progress(
+            self._split_batches(num_tests),
+            self._generate_batch,
+            desc=f"Generating {num_tests} tests",
+        )
+        with self._span("deduplicate"):
+            all_test_cases = self._deduplicate(test_cases)
+
+        # Top up tests lost to short batches or deduplication, requesting
+        # whole batches
+        for attempt in range(2):
+            shortfall = num_tests - len(all_test_cases)
+            if shortfall <= 0:
+                break
+            num_batches = -(-shortfall // self.batch_size)
+            with self._span("top_up", shortfall=shortfall):
+                additional_cases = self._process_with_progress(
+                    [self.batch_size] * num_batches,
+                    self._generate_batch,
+                    desc=f"Generating {shortfall} additional tests",
+                )
+                all_test_cases = self._deduplicate(all_test_cases + additional_cases)
+
+        if len(all_test_cases) < num_tests:
+            raise ValueError(
+                f"LLM returned {len(all_test_cases)} unique test cases, expected {num_tests}"
+            )
 
-        # Generate all tests in a single batch
-        all_test_cases = self._generate_batch(num_tests)
+        # Take exactly num_tests results
+        all_test_cases = all_test_cases[:num_tests]
 
         test_set = TestSet(
             tests=all_test_cases,
@@ -112,11 +249,13 @@ class PromptSynthesizer(TestSetSynthesizer):
                 "generation_prompt": self.prompt,
                 "num_tests": num_tests,
                 "batch_size": self.batch_size,
+                "max_concurrency": self.max_concurrency,
                 "synthesizer": "PromptSynthesizer",
             },
         )
 
         # Set properties based on the generated tests
-        test_set.set_properties()
+        with self._span("set_properties"):
+            test_set.set_properties(llm_service=self.llm_service)
 
         return test_set
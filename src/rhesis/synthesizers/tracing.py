@@ -0,0 +1,138 @@
+"""Stage-level tracing of synthesizer runs in the Chrome trace event format."""
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Union
+
+
+class Tracer:
+    """Thread-safe recorder of timed spans.
+
+    Spans are recorded as Chrome trace "complete" events, so a saved trace can
+    be opened in chrome://tracing, Perfetto (https://ui.perfetto.dev) or
+    speedscope (https://www.speedscope.app). Spans on worker threads appear on
+    their own tracks, and nested spans (e.g. LLM calls inside a top-up) are
+    shown inside their parent.
+
+    Examples:
+        >>> tracer = Tracer()
+        >>> synthesizer = ParaphrasingSynthesizer(test_set, tracer=tracer)
+        >>> synthesizer.generate(num_paraphrases=2)
+        >>> tracer.save("paraphrasing.trace.json")
+        >>> tracer.summary()["llm_call"]["seconds"]
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty tracer; timestamps are relative to its creation."""
+        self._origin = time.perf_counter()
+        self._lock = threading.Lock()
+        self._events: List[Dict[str, Any]] = []
+        self._threads: Dict[int, int] = {}
+
+    @contextmanager
+    def span(
+        self, name: str, category: str = "synthesizer", **args: Any
+    ) -> Iterator[None]:
+        """
+        Record the duration of a block as a span.
+
+        Args:
+            name: The name of the span, e.g. "llm_call".
+            category: The category of the span.
+            **args: Details shown with the span, e.g. the batch size.
+        """
+        thread = threading.current_thread()
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            finished = time.perf_counter()
+            with self._lock:
+                tid = self._threads.get(thread.ident or 0)
+                if tid is None:
+                    tid = len(self._threads) + 1
+                    self._threads[thread.ident or 0] = tid
+                    self._events.append(
+                        {
+                            "name": "thread_name",
+                            "ph": "M",
+                            "pid": os.getpid(),
+                            "tid": tid,
+                            "args": {"name": thread.name},
+                        }
+                    )
+                self._events.append(
+                    {
+                        "name": name,
+                        "cat": category,
+                        "ph": "X",
+                        "ts": (started - self._origin) * 1e6,
+                        "dur": (finished - started) * 1e6,
+                        "pid": os.getpid(),
+                        "tid": tid,
+                        "args": args,
+                    }
+                )
+
+    @property
+    def events(self) -> List[Dict[str, Any]]:
+        """Get a copy of the recorded trace events."""
+        with self._lock:
+            return list(self._events)
+
+    def to_chrome_trace(self) -> Dict[str, Any]:
+        """
+        Get the recorded spans as a Chrome trace.
+
+        Returns:
+            Dict[str, Any]: The trace in the JSON object format of the Chrome
+                trace event format, with timestamps in microseconds.
+        """
+        return {"traceEvents": self.events, "displayTimeUnit": "ms"}
+
+    def save(self, path: Union[str, Path]) -> Path:
+        """
+        Write the trace to a JSON file.
+
+        Args:
+            path: The path of the file.
+
+        Returns:
+            Path: The path of the written file.
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(self.to_chrome_trace(), f)
+        return path
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """
+        Get the number of spans and their total duration by name.
+
+        Durations of nested spans are also included in their parents, and spans
+        on concurrent threads add up, so totals can exceed the wall-clock time.
+
+        Returns:
+            Dict[str, Dict[str, float]]: The count and total seconds of each
+                span name.
+        """
+        summary: Dict[str, Dict[str, float]] = {}
+        for event in self.events:
+            if event["ph"] != "X":
+                continue
+            stats = summary.setdefault(event["name"], {"count": 0, "seconds": 0.0})
+            stats["count"] += 1
+            stats["seconds"] += event["dur"] / 1e6
+        return summary
+
+    def clear(self) -> None:
+        """Discard all recorded spans and restart the clock."""
+        with self._lock:
+            self._events.clear()
+            self._threads.clear()
+            self._origin = time.perf_counter()
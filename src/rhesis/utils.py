@@ -1,16 +1,198 @@
 """Utility functions for the Rhesis SDK."""
 
-import tiktoken
-from typing import Optional
+import functools
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import (
+    TYPE_CHECKING,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
 
+from rhesis.config import get_tokenizer_cache_dir
 
-def count_tokens(text: str, encoding_name: str = "cl100k_base") -> Optional[int]:
+if TYPE_CHECKING:
+    import tiktoken
+
+logger = logging.getLogger(__name__)
+
+#: Ways of counting tokens: "exact" encodes with tiktoken, "estimate" uses a
+#: character and word based heuristic, and "auto" encodes exactly but falls
+#: back to the estimate if the encoding cannot be loaded.
+TOKEN_COUNT_METHODS = ("exact", "estimate", "auto")
+
+# Encodings that failed to load, which "auto" does not try to load again
+_unavailable_encodings: Set[str] = set()
+
+#: Seconds before loading an encoding that failed is tried again
+ENCODING_RETRY_SECONDS = 300.0
+
+# Recent encoding load failures by encoding name and cache directory, with the
+# time after which loading is tried again
+_encoding_failures: Dict[Tuple[str, str], Tuple[Exception, float]] = {}
+
+
+# Serializes the temporary changes to TIKTOKEN_CACHE_DIR while loading
+_encoding_load_lock = threading.Lock()
+
+
+def get_encoding(encoding_name: str = "cl100k_base") -> "tiktoken.Encoding":
+    """Get a tiktoken encoding, loading it only once per process.
+
+    Encoding files are read from and stored in the tokenizer cache directory
+    (see rhesis.config.get_tokenizer_cache_dir), so they are only downloaded
+    once. Populate the directory ahead of time with `rhesis prewarm` to work
+    without network access. A failed load is remembered for
+    ENCODING_RETRY_SECONDS, during which the same error is raised again
+    without retrying the download.
+
+    Args:
+        encoding_name: The name of the encoding to load
+
+    Returns:
+        tiktoken.Encoding: The encoding
+
+    Raises:
+        ValueError: If the encoding is unknown
+        requests.exceptions.RequestException: If the encoding cannot be downloaded
+    """
+    key = (encoding_name, str(get_tokenizer_cache_dir()))
+    failure = _encoding_failures.get(key)
+    if failure is not None and time.monotonic() < failure[1]:
+        raise failure[0].with_traceback(None)
+    try:
+        encoding = _load_encoding(*key)
+    except Exception as e:
+        _encoding_failures[key] = (e, time.monotonic() + ENCODING_RETRY_SECONDS)
+        raise
+    _encoding_failures.pop(key, None)
+    return encoding
+
+
+@functools.lru_cache(maxsize=None)
+def _load_encoding(encoding_name: str, cache_dir: str) -> "tiktoken.Encoding":
+    """Load an encoding with its files in cache_dir, once per directory."""
+    import tiktoken
+
+    Path(cache_dir).mkdir(parents=True, exist_ok=True)
+    # tiktoken looks up its cache directory in the environment when it loads an
+    # encoding, so point it at cache_dir for the load only
+    with _encoding_load_lock:
+        previous = os.environ.get("TIKTOKEN_CACHE_DIR")
+        os.environ["TIKTOKEN_CACHE_DIR"] = cache_dir
+        try:
+            return tiktoken.get_encoding(encoding_name)
+        finally:
+            if previous is None:
+                del os.environ["TIKTOKEN_CACHE_DIR"]
+            else:
+                os.environ["TIKTOKEN_CACHE_DIR"] = previous
+
+
+def prewarm_encodings(
+    encoding_names: Iterable[str] = ("cl100k_base", "o200k_base"),
+) -> Path:
+    """Download encodings into the tokenizer cache directory.
+
+    Run this once on a machine with network access; the cache directory can
+    then be copied to machines without it.
+
+    Args:
+        encoding_names: The names of the encodings to download
+
+    Returns:
+        Path: The tokenizer cache directory
+
+    Raises:
+        ValueError: If an encoding is unknown
+        requests.exceptions.RequestException: If an encoding cannot be downloaded
+    """
+    cache_dir = get_tokenizer_cache_dir()
+    for encoding_name in encoding_names:
+        # Retry encodings that failed to load recently
+        _encoding_failures.pop((encoding_name, str(cache_dir)), None)
+        get_encoding(encoding_name)
+    return cache_dir
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the number of tokens in a text without a tokenizer.
+
+    Averages the common rules of thumb of four characters and three quarters
+    of a word per token. Typically within 10-20% of the exact count for
+    English prose.
+
+    Args:
+        text: The input text
+
+    Returns:
+        int: The estimated number of tokens
+
+    Examples:
+        >>> estimate_tokens("Hello, world!")
+        3
+    """
+    if not text:
+        return 0
+    estimate = (len(text) / 4 + len(text.split()) / 0.75) / 2
+    return max(1, round(estimate))
+
+
+def estimate_tokens_batch(texts: Sequence[Optional[str]]) -> List[Optional[int]]:
+    """Estimate the number of tokens of many texts.
+
+    Args:
+        texts: The texts to estimate. Entries that are not strings are not counted.
+
+    Returns:
+        List[Optional[int]]: The estimate for each text, in order, or None for
+            entries that are not strings
+    """
+    return [estimate_tokens(text) if isinstance(text, str) else None for text in texts]
+
+
+def _use_estimate(method: str, encoding_name: str) -> bool:
+    """Check whether a token counting method resolves to the estimate."""
+    if method not in TOKEN_COUNT_METHODS:
+        raise ValueError(
+            f"Invalid method: {method}. Expected one of {', '.join(TOKEN_COUNT_METHODS)}"
+        )
+    if method == "auto":
+        return encoding_name in _unavailable_encodings
+    return method == "estimate"
+
+
+def _mark_unavailable(encoding_name: str, error: Exception) -> None:
+    """Remember that an encoding cannot be loaded, so "auto" stops trying."""
+    if encoding_name not in _unavailable_encodings:
+        _unavailable_encodings.add(encoding_name)
+        logger.warning(
+            f"Encoding {encoding_name} is unavailable ({error}), "
+            "estimating token counts instead"
+        )
+
+
+def count_tokens(
+    text: str, encoding_name: str = "cl100k_base", method: str = "exact"
+) -> Optional[int]:
     """Count the number of tokens in a given text string using tiktoken.
 
+    Special tokens such as "<|endoftext|>" are counted as ordinary text.
+
     Args:
         text: The input text to count tokens for
         encoding_name: The name of the encoding to use. Defaults to cl100k_base
                       (used by GPT-4 and GPT-3.5-turbo)
+        method: "exact", "estimate" or "auto", see TOKEN_COUNT_METHODS.
+            Defaults to "exact".
 
     Returns:
         Optional[int]: The number of tokens in the text, or None if encoding fails
@@ -21,13 +203,69 @@ def count_tokens(text: str, encoding_name: str = "cl100k_base") -> Optional[int]
         >>> count_tokens("Complex text", encoding_name="p50k_base")
         2
     """
+    if _use_estimate(method, encoding_name):
+        return estimate_tokens(text)
+
     try:
-        encoding = tiktoken.get_encoding(encoding_name)
-        return len(encoding.encode(text))
+        encoding = get_encoding(encoding_name)
+        return len(encoding.encode_ordinary(text))
     except Exception as e:
+        if method == "auto":
+            _mark_unavailable(encoding_name, e)
+            return estimate_tokens(text)
         # Log the error but don't raise it to avoid breaking client code
-        import logging
-
-        logger = logging.getLogger(__name__)
         logger.error(f"Failed to count tokens: {str(e)}")
         return None
+
+
+def count_tokens_batch(
+    texts: Sequence[Optional[str]],
+    encoding_name: str = "cl100k_base",
+    num_threads: int = 8,
+    method: str = "exact",
+) -> List[Optional[int]]:
+    """Count the tokens of many texts at once using tiktoken's batch encoding.
+
+    The texts are encoded in parallel on num_threads threads, which is much
+    faster than calling count_tokens in a loop for large collections.
+
+    Args:
+        texts: The texts to count tokens for. Entries that are not strings
+            are not counted.
+        encoding_name: The name of the encoding to use. Defaults to cl100k_base
+        num_threads: Number of threads used for encoding
+        method: "exact", "estimate" or "auto", see TOKEN_COUNT_METHODS.
+            Defaults to "exact".
+
+    Returns:
+        List[Optional[int]]: The token count of each text, in order, or None
+            for entries that are not strings or if encoding fails
+
+    Examples:
+        >>> count_tokens_batch(["Hello, world!", "Complex text"])
+        [4, 2]
+    """
+    if _use_estimate(method, encoding_name):
+        return estimate_tokens_batch(texts)
+
+    counts: List[Optional[int]] = [None] * len(texts)
+    indices = [i for i, text in enumerate(texts) if isinstance(text, str)]
+    if not indices:
+        return counts
+
+    try:
+        encoding = get_encoding(encoding_name)
+        encoded = encoding.encode_ordinary_batch(
+            [str(texts[i]) for i in indices], num_threads=num_threads
+        )
+    except Exception as e:
+        if method == "auto":
+            _mark_unavailable(encoding_name, e)
+            return estimate_tokens_batch(texts)
+        # Log the error but don't raise it to avoid breaking client code
+        logger.error(f"Failed to count tokens: {str(e)}")
+        return counts
+
+    for index, tokens in zip(indices, encoded):
+        counts[index] = len(tokens)
+    return counts
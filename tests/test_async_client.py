@@ -0,0 +1,153 @@
+import asyncio
+import json
+
+import pytest
+
+httpx = pytest.importorskip("httpx")
+
+from rhesis.client import AsyncClient, get_response_cache  # noqa: E402
+from rhesis.client import close_async_session, configure_async_session  # noqa: E402
+from rhesis.entities import Behavior, Topic  # noqa: E402
+from rhesis.services import LLMService  # noqa: E402
+
+
+@pytest.fixture
+def requests_seen(monkeypatch):
+    """Fixture that routes async sessions to an in-memory transport"""
+    monkeypatch.setenv("RHESIS_API_KEY", "test-key")
+    monkeypatch.setenv("RHESIS_BASE_URL", "http://testserver")
+    seen = []
+
+    def handler(request):
+        seen.append(request)
+        if request.url.path == "/services/chat/completions":
+            content = json.dumps({"tests": [{"prompt": "hi"}]})
+            return httpx.Response(
+                200, json={"choices": [{"message": {"content": content}}]}
+            )
+        if request.url.path == "/behaviors/missing/":
+            return httpx.Response(404, json={"detail": "Not found"})
+        if request.url.path == "/behaviors/etag/":
+            if request.headers.get("If-None-Match") == '"v1"':
+                return httpx.Response(304)
+            return httpx.Response(
+                200, json={"id": "etag", "name": "Cached"}, headers={"ETag": '"v1"'}
+            )
+        if request.url.path == "/topics/":
+            skip = int(request.url.params["skip"])
+            limit = int(request.url.params["limit"])
+            records = [{"id": str(i)} for i in range(5)]
+            return httpx.Response(200, json=records[skip : skip + limit])
+        if request.method == "GET" and request.url.path == "/behaviors/":
+            # Ignores skip and limit and always returns the same records
+            return httpx.Response(200, json=[{"id": str(i)} for i in range(2)])
+        if request.method == "POST":
+            return httpx.Response(200, json={"id": "1", **json.loads(request.content)})
+        return httpx.Response(200, json={"id": "1", "name": "Behavior"})
+
+    configure_async_session(transport=httpx.MockTransport(handler))
+    yield seen
+    configure_async_session()
+
+
+def run(coroutine):
+    """Run a coroutine and close the loop's session afterwards"""
+
+    async def wrapper():
+        try:
+            return await coroutine
+        finally:
+            await close_async_session()
+
+    return asyncio.run(wrapper())
+
+
+def test_async_clients_share_session(requests_seen):
+    """Test that async clients on one loop share a session"""
+
+    async def sessions():
+        return AsyncClient().session, AsyncClient().session
+
+    first, second = run(sessions())
+    assert first is second
+
+
+def test_async_entity_crud(requests_seen):
+    """Test async save, from_id and exists on an entity"""
+    saved = run(Behavior(name="Async").asave())
+    assert saved == {"id": "1", "name": "Async"}
+
+    entity = run(Behavior.afrom_id("1"))
+    assert entity.fields["name"] == "Behavior"
+
+    assert run(Behavior.aexists("1")) is True
+    assert run(Behavior.afrom_id("missing")) is None
+    assert requests_seen[0].headers["Authorization"] == "Bearer test-key"
+
+
+def test_async_llm_run(requests_seen):
+    """Test that arun parses the JSON completion"""
+    result = run(LLMService().arun("Generate tests"))
+    assert result == {"tests": [{"prompt": "hi"}]}
+
+
+def test_async_from_id_uses_conditional_get(requests_seen):
+    """Test that afrom_id reuses the cached body on 304"""
+    get_response_cache().clear()
+    run(Behavior.afrom_id("etag"))
+    entity = run(Behavior.afrom_id("etag"))
+
+    assert entity.fields == {"id": "etag", "name": "Cached"}
+    assert requests_seen[-1].headers["If-None-Match"] == '"v1"'
+    get_response_cache().clear()
+
+
+def test_async_from_ids(requests_seen):
+    """Test that afrom_ids keeps the input order with errors in place"""
+    entities = run(Behavior.afrom_ids(["1", "missing", "1"], max_concurrency=2))
+
+    assert entities[0].fields["name"] == "Behavior"
+    assert isinstance(entities[1], httpx.HTTPStatusError)
+    assert entities[2].fields == entities[0].fields
+    assert run(Behavior.aexists_many(["1", "missing"])) == [True, False]
+
+
+def test_async_all_pages(requests_seen):
+    """Test that aall pages through the collection"""
+    topics = run(Topic.aall(page_size=2))
+
+    assert [topic["id"] for topic in topics] == ["0", "1", "2", "3", "4"]
+    assert [r.url.params["skip"] for r in requests_seen] == ["0", "2", "4"]
+
+
+def test_async_all_stops_on_repeated_page(requests_seen):
+    """Test that aall stops when the endpoint repeats the previous page"""
+    behaviors = run(Behavior.aall(page_size=2))
+
+    assert [behavior["id"] for behavior in behaviors] == ["0", "1"]
+    assert [r.url.params["skip"] for r in requests_seen] == ["0", "2"]
+
+
+def test_async_all_max_pages_and_none_filters(requests_seen):
+    """Test that aall stops at max_pages and does not send None filters"""
+    behaviors = run(Behavior.aall(page_size=2, max_pages=1, status=None))
+
+    assert [behavior["id"] for behavior in behaviors] == ["0", "1"]
+    assert [dict(r.url.params) for r in requests_seen] == [{"skip": "0", "limit": "2"}]
+
+
+def test_async_request_hooks(requests_seen):
+    """Test that the async client reports attempts to its hooks"""
+    from rhesis.instrumentation import MetricsCollector
+
+    metrics = MetricsCollector()
+    client = AsyncClient(hooks=[metrics])
+
+    async def post():
+        return await client.post(client.get_url("behaviors/"), json={"name": "x"})
+
+    assert run(post()).status_code == 200
+    stats = metrics.summary()["POST behaviors"]
+    assert stats["count"] == 1
+    assert stats["bytes_sent"] > 0
+    assert stats["bytes_received"] > 0
@@ -0,0 +1,172 @@
+import json
+import threading
+import time
+
+import pytest
+import requests
+
+from rhesis.client import close_session, get_response_cache, get_session
+from rhesis.entities import Behavior
+
+
+def json_response(status_code, data):
+    """Build a requests response with a JSON body"""
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = json.dumps(data).encode("utf-8")
+    return response
+
+
+@pytest.fixture
+def server(monkeypatch):
+    """Fixture that serves behaviors by ID and tracks concurrent requests"""
+    monkeypatch.setenv("RHESIS_API_KEY", "test-key")
+    monkeypatch.setenv("RHESIS_BASE_URL", "http://testserver")
+    close_session()
+    get_response_cache().clear()
+    lock = threading.Lock()
+    state = {"requested": [], "in_flight": 0, "max_in_flight": 0}
+
+    def fake_request(method, url, params=None, **kwargs):
+        record_id = url.rstrip("/").rsplit("/", 1)[-1]
+        with lock:
+            state["requested"].append(record_id)
+            state["in_flight"] += 1
+            state["max_in_flight"] = max(state["max_in_flight"], state["in_flight"])
+        try:
+            time.sleep(0.01)
+            if record_id.startswith("missing"):
+                return json_response(404, {"detail": "Not found"})
+            if record_id == "broken":
+                raise requests.exceptions.InvalidURL("broken")
+            return json_response(
+                200, {"id": record_id, "name": f"Behavior {record_id}"}
+            )
+        finally:
+            with lock:
+                state["in_flight"] -= 1
+
+    monkeypatch.setattr(get_session(), "request", fake_request)
+    yield state
+    close_session()
+
+
+def test_from_ids_returns_entities_in_order(server):
+    """Test that from_ids fetches in parallel and keeps the input order"""
+    ids = [str(i) for i in range(20)]
+    entities = Behavior.from_ids(ids, max_concurrency=4)
+
+    assert [entity.fields["id"] for entity in entities] == ids
+    assert all(isinstance(entity, Behavior) for entity in entities)
+    assert 1 < server["max_in_flight"] <= 4
+
+
+def test_from_ids_reports_errors_per_id(server):
+    """Test that failures are returned in place of the failed entities"""
+    entities = Behavior.from_ids(["1", "missing", "broken", "1"])
+
+    assert entities[0].fields["name"] == "Behavior 1"
+    assert isinstance(entities[1], requests.exceptions.HTTPError)
+    assert entities[1].response.status_code == 404
+    assert isinstance(entities[2], requests.exceptions.InvalidURL)
+    assert entities[3].fields == entities[0].fields
+    assert entities[3] is not entities[0]
+    assert sorted(server["requested"]) == ["1", "broken", "missing"]
+
+
+def test_exists_many(server):
+    """Test that exists_many checks each ID and keeps the input order"""
+    results = Behavior.exists_many(["1", "missing-1", "2", "broken"])
+
+    assert results[:3] == [True, False, True]
+    assert isinstance(results[3], requests.exceptions.InvalidURL)
+    assert Behavior.exists_many([]) == []
+
+
+@pytest.fixture
+def collection(monkeypatch):
+    """Fixture that serves a paginated collection of behaviors"""
+    monkeypatch.setenv("RHESIS_API_KEY", "test-key")
+    monkeypatch.setenv("RHESIS_BASE_URL", "http://testserver")
+    close_session()
+    state = {"records": [{"id": str(i)} for i in range(25)], "paginate": True}
+    requested = []
+
+    def fake_request(method, url, params=None, **kwargs):
+        requested.append(dict(params or {}))
+        records = state["records"]
+        if state["paginate"]:
+            skip, limit = params.get("skip", 0), params.get("limit")
+            records = records[skip : skip + limit]
+        return json_response(200, records)
+
+    monkeypatch.setattr(get_session(), "request", fake_request)
+    yield state, requested
+    close_session()
+
+
+def test_iter_all_pages_lazily(collection):
+    """Test that iter_all follows skip and limit with filters"""
+    state, requested = collection
+    records = Behavior.iter_all(page_size=10, status="active")
+
+    assert next(records) == {"id": "0"}
+    assert list(records) == state["records"][1:]
+    assert [(p["skip"], p["limit"]) for p in requested] == [(0, 10), (10, 10), (20, 10)]
+    assert all(p["status"] == "active" for p in requested)
+
+
+def test_all_is_built_on_iter_all(collection):
+    """Test that all pages through the collection unless a slice is requested"""
+    state, requested = collection
+
+    assert Behavior.all() == state["records"]
+    assert [p["skip"] for p in requested] == [0]
+    assert Behavior.all(skip=5, limit=2) == [{"id": "5"}, {"id": "6"}]
+    assert Behavior().first() == {"id": "0"}
+    assert requested[-1]["limit"] == 1
+
+
+def test_iter_all_stops_if_endpoint_does_not_paginate(collection):
+    """Test that a page longer than the limit is treated as the whole collection"""
+    state, requested = collection
+    state["paginate"] = False
+
+    assert list(Behavior.iter_all(page_size=10, prefetch=False)) == state["records"]
+    assert len(requested) == 1
+
+
+@pytest.mark.parametrize("prefetch", [True, False])
+def test_iter_all_stops_on_repeated_page(collection, prefetch):
+    """Test that a page repeating the previous IDs ends the iteration"""
+    state, requested = collection
+    state["paginate"] = False
+    state["records"] = state["records"][:10]
+
+    records = Behavior.iter_all(page_size=10, prefetch=prefetch)
+    assert list(records) == state["records"]
+    assert [p["skip"] for p in requested] == [0, 10]
+
+
+@pytest.mark.parametrize("prefetch", [True, False])
+def test_iter_all_stops_on_repeated_content(collection, prefetch):
+    """Test that a repeated page of records without IDs ends the iteration"""
+    state, requested = collection
+    state["paginate"] = False
+    state["records"] = [{"name": f"Behavior {i}"} for i in range(10)]
+
+    records = Behavior.iter_all(page_size=10, prefetch=prefetch)
+    assert list(records) == state["records"]
+    assert [p["skip"] for p in requested] == [0, 10]
+
+
+@pytest.mark.parametrize("prefetch", [True, False])
+def test_iter_all_max_pages_and_none_filters(collection, prefetch):
+    """Test that paging stops at max_pages and filters set to None are not sent"""
+    state, requested = collection
+
+    records = Behavior.iter_all(
+        page_size=5, prefetch=prefetch, max_pages=2, status=None
+    )
+    assert list(records) == state["records"][:10]
+    assert requested == [{"skip": 0, "limit": 5}, {"skip": 5, "limit": 5}]
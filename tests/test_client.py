@@ -0,0 +1,297 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+import requests
+from rhesis import client as client_module
+from rhesis.client import (
+    Client,
+    close_session,
+    configure_session,
+    get_session,
+    set_retry_policy,
+)
+from rhesis.retry import RetryPolicy, parse_retry_after
+
+
+class FakeResponse:
+    def __init__(self, status_code, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def client():
+    """Fixture that returns a client with a fresh shared session"""
+    close_session()
+    yield Client(api_key="test-key", base_url="http://localhost:8080/")
+    close_session()
+
+
+def test_clients_share_session(client):
+    """Test that all clients use the same pooled session"""
+    other = Client(api_key="other-key", base_url="http://localhost:8080")
+    assert client.session is other.session
+    assert client.session is get_session()
+
+
+def test_session_does_not_store_cookies(client):
+    """Test that cookies set by one client's responses are not sent by others"""
+
+    class CookieHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header("Set-Cookie", "session=secret; Path=/")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    server = HTTPServer(("127.0.0.1", 0), CookieHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        response = client.get(f"http://127.0.0.1:{server.server_port}/")
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert response.cookies["session"] == "secret"
+    assert len(client.session.cookies) == 0
+
+
+def test_session_is_recreated_after_fork(client, monkeypatch):
+    """Test that a child process does not reuse its parent's session"""
+    parent = client.session
+    monkeypatch.setattr(client_module.os, "getpid", lambda: -1)
+
+    assert client.session is not parent
+    assert client.session is client.session
+
+
+def test_configure_session_pool_size(client):
+    """Test that the shared session can be reconfigured"""
+    previous = client.session
+    session = configure_session(pool_connections=4, pool_maxsize=32, pool_block=True)
+
+    assert session is not previous
+    assert client.session is session
+    adapter = session.get_adapter("https://api.rhesis.ai")
+    assert adapter._pool_connections == 4
+    assert adapter._pool_maxsize == 32
+    assert adapter._pool_block is True
+
+
+def test_request_uses_shared_session(client, monkeypatch):
+    """Test that requests go through the shared session with default headers"""
+    calls = []
+
+    response = FakeResponse(200)
+
+    def fake_request(method, url, **kwargs):
+        calls.append((method, url, kwargs))
+        return response
+
+    monkeypatch.setattr(client.session, "request", fake_request)
+    result = client.get(client.get_url("/behaviors"), headers={"X-Extra": "1"})
+
+    assert result is response
+    method, url, kwargs = calls[0]
+    assert method == "GET"
+    assert url == "http://localhost:8080/behaviors"
+    assert kwargs["headers"]["Authorization"] == "Bearer test-key"
+    assert kwargs["headers"]["X-Extra"] == "1"
+    assert client_module._session is client.session
+
+
+@pytest.fixture
+def scripted(client, monkeypatch):
+    """Fixture that replays scripted responses and records retry delays"""
+    script = []
+    calls = []
+    delays = []
+
+    def fake_request(method, url, **kwargs):
+        calls.append(method)
+        outcome = script.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    monkeypatch.setattr(client.session, "request", fake_request)
+    monkeypatch.setattr(client_module.time, "sleep", delays.append)
+    set_retry_policy(RetryPolicy(max_attempts=4, jitter=False))
+    yield script, calls, delays
+    set_retry_policy(RetryPolicy())
+
+
+def test_retries_transient_errors_with_backoff(client, scripted):
+    """Test that idempotent requests are retried with exponential backoff"""
+    script, calls, delays = scripted
+    script += [FakeResponse(502), FakeResponse(504), FakeResponse(200)]
+
+    response = client.get(client.get_url("tests"))
+
+    assert response.status_code == 200
+    assert len(calls) == 3
+    assert delays == [0.5, 1.0]
+
+
+def test_honors_retry_after(client, scripted):
+    """Test that Retry-After overrides the computed backoff"""
+    script, calls, delays = scripted
+    script += [FakeResponse(429, {"Retry-After": "7"}), FakeResponse(200)]
+
+    assert client.post(client.get_url("test_sets/bulk")).status_code == 200
+    assert delays == [7.0]
+
+
+def test_post_is_not_retried_on_server_errors(client, scripted):
+    """Test that non-idempotent requests are only retried when unprocessed"""
+    script, calls, delays = scripted
+    script += [FakeResponse(500), FakeResponse(200)]
+    assert client.post(client.get_url("behaviors/")).status_code == 500
+
+    script.clear()
+    script += [FakeResponse(500), FakeResponse(200)]
+    response = client.post(client.get_url("services/chat/completions"), idempotent=True)
+    assert response.status_code == 200
+
+
+def test_gives_up_after_max_attempts(client, scripted):
+    """Test that the last response is returned once retries are exhausted"""
+    script, calls, delays = scripted
+    script += [FakeResponse(503)] * 4
+    assert client.get(client.get_url("tests")).status_code == 503
+    assert len(calls) == 4
+
+    script += [requests.exceptions.ReadTimeout("slow")] * 4
+    with pytest.raises(requests.exceptions.ReadTimeout):
+        client.get(client.get_url("tests"))
+
+
+def test_parse_retry_after():
+    """Test parsing Retry-After in seconds and as an HTTP date"""
+    assert parse_retry_after("3") == 3.0
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+    assert parse_retry_after("soon") is None
+
+
+def json_response(status_code, data=None, headers=None):
+    """Build a requests response with a JSON body"""
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = json.dumps(data).encode("utf-8") if data is not None else b""
+    response.headers.update(headers or {})
+    return response
+
+
+@pytest.fixture
+def conditional(client, monkeypatch):
+    """Fixture that serves an entity with an ETag, honoring If-None-Match"""
+    state = {"etag": '"v1"', "data": {"id": "1", "name": "Behavior"}}
+    seen = []
+
+    def fake_request(method, url, headers=None, **kwargs):
+        seen.append(headers)
+        if headers.get("If-None-Match") == state["etag"]:
+            return json_response(304)
+        return json_response(200, state["data"], {"ETag": state["etag"]})
+
+    client_module.get_response_cache().clear()
+    monkeypatch.setattr(client.session, "request", fake_request)
+    yield state, seen
+    client_module.get_response_cache().clear()
+
+
+def test_get_json_reuses_body_on_not_modified(client, conditional):
+    """Test that a 304 response is served from the cached body"""
+    state, seen = conditional
+    url = client.get_url("behaviors/1")
+
+    first = client.get_json(url)
+    first["name"] = "Changed locally"
+    second = client.get_json(url)
+
+    assert "If-None-Match" not in seen[0]
+    assert seen[1]["If-None-Match"] == '"v1"'
+    assert second == {"id": "1", "name": "Behavior"}
+
+    state.update(etag='"v2"', data={"id": "1", "name": "Renamed"})
+    assert client.get_json(url)["name"] == "Renamed"
+    assert client.get_json(url)["name"] == "Renamed"
+    assert seen[-1]["If-None-Match"] == '"v2"'
+
+
+def test_get_json_keys_by_params_and_api_key(client, conditional):
+    """Test that other query parameters and users do not share entries"""
+    _, seen = conditional
+    url = client.get_url("behaviors")
+
+    client.get_json(url, params={"skip": 0})
+    client.get_json(url, params={"skip": 10})
+    Client(api_key="other-key", base_url=client.base_url).get_json(
+        url, params={"skip": 0}
+    )
+
+    assert all("If-None-Match" not in headers for headers in seen)
+
+
+def test_updated_at_is_sent_as_if_modified_since(client, monkeypatch):
+    """Test that updated_at is used when the server sends no validators"""
+    seen = []
+
+    def fake_request(method, url, headers=None, **kwargs):
+        seen.append(headers)
+        return json_response(200, {"id": "1", "updated_at": "2024-03-01T12:30:00"})
+
+    client_module.get_response_cache().clear()
+    monkeypatch.setattr(client.session, "request", fake_request)
+    client.get_json(client.get_url("topics/1"))
+    client.get_json(client.get_url("topics/1"))
+    client_module.get_response_cache().clear()
+
+    assert seen[1]["If-Modified-Since"] == "Fri, 01 Mar 2024 12:30:00 GMT"
+
+
+def test_response_cache_is_bounded_by_bytes():
+    """Test that the cache evicts by total size and skips large bodies"""
+    cache = client_module.ResponseCache(
+        max_entries=10, max_size_bytes=100, max_body_bytes=60
+    )
+    body = {"id": "1", "text": "x" * 20}
+    size = len(json.dumps(body))
+    for key in ["a", "b", "c"]:
+        cache.set(key, json_response(200, body, {"ETag": '"v1"'}), body)
+
+    assert len(cache) == 100 // size
+    assert cache.get("a") is None
+    assert cache.size_bytes == len(cache) * size
+
+    large = {"id": "2", "text": "x" * 60}
+    cache.set("c", json_response(200, large, {"ETag": '"v2"'}), large)
+    assert cache.get("c") is None
+    assert cache.size_bytes == len(cache) * size
+
+
+def test_test_set_tests_skip_response_cache(client, conditional, monkeypatch):
+    """Test that test set tests only use the response cache when asked to"""
+    from rhesis.entities import TestSet
+
+    state, seen = conditional
+    state["data"] = [{"id": "1"}]
+    monkeypatch.setenv("RHESIS_API_KEY", "test-key")
+    monkeypatch.setenv("RHESIS_BASE_URL", "http://localhost:8080")
+
+    TestSet(id="ts").get_tests()
+    assert len(client_module.get_response_cache()) == 0
+
+    TestSet(id="ts").get_tests(use_cache=True)
+    assert TestSet(id="ts").get_tests(use_cache=True) == [{"id": "1"}]
+    assert seen[-1]["If-None-Match"] == '"v1"'
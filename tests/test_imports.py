@@ -0,0 +1,64 @@
+import json
+import subprocess
+import sys
+
+import pytest
+
+HEAVY_MODULES = ["pandas", "pyarrow", "tiktoken", "jinja2", "tqdm", "httpx"]
+
+
+def imported_modules(statement):
+    """Run an import in a fresh interpreter and return the modules it loaded"""
+    code = f"{statement}\nimport json, sys\nprint(json.dumps(sorted(sys.modules)))"
+    output = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    ).stdout
+    return set(json.loads(output.splitlines()[-1]))
+
+
+@pytest.mark.parametrize(
+    "statement",
+    [
+        "import rhesis",
+        "import rhesis.entities",
+        "from rhesis.entities import TestSet",
+        "from rhesis.synthesizers import PromptSynthesizer",
+        "import rhesis.cli",
+    ],
+)
+def test_import_defers_heavy_dependencies(statement):
+    """Test that importing the SDK does not load pandas, tiktoken, jinja2, ..."""
+    modules = imported_modules(statement)
+    if "synthesizers" in statement:
+        # Synthesizers render templates and show progress, so they need these
+        allowed = {"jinja2", "tqdm"}
+    else:
+        allowed = set()
+    loaded = {m for m in HEAVY_MODULES if m in modules} - allowed
+    assert not loaded, f"{statement!r} imported {sorted(loaded)}"
+
+
+def test_lazy_attributes_resolve():
+    """Test that lazily imported names behave like regular attributes"""
+    import rhesis
+    import rhesis.entities
+    from rhesis.entities.test_set import TestSet
+
+    assert rhesis.entities.TestSet is TestSet
+    assert "TestSet" in dir(rhesis.entities)
+    assert isinstance(rhesis.__version__, str)
+    with pytest.raises(AttributeError):
+        rhesis.entities.Missing
+
+
+def test_cli_looks_up_version_on_demand():
+    """Test that the CLI reads the package metadata only for --version"""
+    assert "importlib.metadata" not in imported_modules("import rhesis.cli")
+
+    output = subprocess.run(
+        [sys.executable, "-m", "rhesis.cli", "--version"],
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    assert output.startswith("rhesis-sdk ")
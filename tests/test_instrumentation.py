@@ -0,0 +1,140 @@
+import json
+
+import pytest
+import requests
+from rhesis import client as client_module
+from rhesis.client import (
+    Client,
+    add_request_hooks,
+    close_session,
+    get_request_hooks,
+    remove_request_hooks,
+)
+from rhesis.instrumentation import (
+    MetricsCollector,
+    RequestHooks,
+    endpoint_template,
+)
+from rhesis.retry import RetryPolicy
+
+
+def json_response(status_code, data):
+    """Build a requests response with a JSON body"""
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = json.dumps(data).encode("utf-8")
+    return response
+
+
+class RecordingHooks(RequestHooks):
+    def __init__(self):
+        self.calls = []
+
+    def on_request_start(self, event):
+        self.calls.append(("start", event.endpoint, event.attempt))
+
+    def on_request_end(self, event):
+        self.calls.append(("end", event.status_code, event.bytes_received))
+
+    def on_retry(self, event):
+        self.calls.append(("retry", event.attempt, event.retry_delay))
+
+    def on_error(self, event):
+        self.calls.append(("error", type(event.error).__name__))
+
+
+@pytest.fixture
+def scripted(monkeypatch):
+    """Fixture that replays scripted outcomes for a client without backoff"""
+    close_session()
+    script = []
+    client = Client(
+        api_key="test-key",
+        base_url="http://localhost:8080/",
+        retry_policy=RetryPolicy(max_attempts=3, jitter=False),
+    )
+
+    def fake_request(method, url, **kwargs):
+        outcome = script.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    monkeypatch.setattr(client.session, "request", fake_request)
+    monkeypatch.setattr(client_module.time, "sleep", lambda delay: None)
+    yield client, script
+    close_session()
+
+
+def test_endpoint_template():
+    """Test that record IDs are replaced so endpoints can be aggregated"""
+    uuid = "0b5c3e1a-8d2f-4c4e-9a1b-2f6d7e8c9a0b"
+    assert endpoint_template(f"/test_sets/{uuid}/tests/") == "test_sets/{id}/tests"
+    assert endpoint_template("behaviors/42?skip=0") == "behaviors/{id}"
+    assert endpoint_template("services/chat/completions") == "services/chat/completions"
+
+
+def test_hooks_see_attempts_retries_and_errors(scripted):
+    """Test that hooks are called for every attempt with its outcome"""
+    client, script = scripted
+    hooks = RecordingHooks()
+    client.hooks.append(hooks)
+    script += [
+        requests.exceptions.ConnectionError("reset"),
+        json_response(503, {}),
+        json_response(200, {"id": "1"}),
+    ]
+
+    assert client.get(client.get_url("behaviors/1")).status_code == 200
+    assert hooks.calls == [
+        ("start", "behaviors/{id}", 1),
+        ("error", "ConnectionError"),
+        ("retry", 1, 0.5),
+        ("start", "behaviors/{id}", 2),
+        ("end", 503, 2),
+        ("retry", 2, 1.0),
+        ("start", "behaviors/{id}", 3),
+        ("end", 200, 11),
+    ]
+
+
+def test_failing_hook_does_not_fail_request(scripted):
+    """Test that exceptions raised by hooks are logged and ignored"""
+    client, script = scripted
+
+    class BrokenHooks(RequestHooks):
+        def on_request_end(self, event):
+            raise RuntimeError("broken")
+
+    client.hooks.append(BrokenHooks())
+    script.append(json_response(200, {}))
+    assert client.get(client.get_url("behaviors")).status_code == 200
+
+
+def test_metrics_collector(scripted):
+    """Test that the collector aggregates latencies per method and endpoint"""
+    client, script = scripted
+    metrics = MetricsCollector()
+    add_request_hooks(metrics)
+    try:
+        assert get_request_hooks() == (metrics,)
+        script += [json_response(200, {"id": str(i)}) for i in range(10)]
+        script += [json_response(503, {}), json_response(404, {})]
+        for i in range(10):
+            client.get(client.get_url(f"behaviors/{i}"))
+        client.post(client.get_url("test_sets/bulk"))
+    finally:
+        remove_request_hooks(metrics)
+    assert get_request_hooks() == ()
+
+    summary = metrics.summary()
+    fetches = summary["GET behaviors/{id}"]
+    assert fetches["count"] == 10
+    assert fetches["errors"] == 0
+    assert fetches["bytes_received"] == sum(len(f'{{"id": "{i}"}}') for i in range(10))
+    assert 0 <= fetches["p50"] <= fetches["p95"] <= fetches["p99"]
+    uploads = summary["POST test_sets/bulk"]
+    assert (uploads["count"], uploads["errors"], uploads["retries"]) == (2, 2, 1)
+
+    metrics.reset()
+    assert metrics.summary() == {}
@@ -0,0 +1,134 @@
+import json
+
+import pytest
+
+from rhesis.services import LLMCache, LLMService
+from rhesis.services import cache as cache_module
+
+
+class FakeResponse:
+    def __init__(self, payload):
+        self.payload = payload
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self.payload
+
+
+@pytest.fixture
+def cache(tmp_path):
+    """Fixture that returns a cache in a temporary directory"""
+    cache = LLMCache(path=tmp_path / "cache.sqlite3")
+    yield cache
+    cache.close()
+
+
+@pytest.fixture
+def llm_service(cache, monkeypatch):
+    """Fixture that returns a cached LLM service counting API calls"""
+    monkeypatch.setenv("RHESIS_API_KEY", "test-key")
+    service = LLMService(cache=cache)
+    service.calls = 0
+
+    def post(url, **kwargs):
+        service.calls += 1
+        content = json.dumps({"call": service.calls})
+        return FakeResponse({"choices": [{"message": {"content": content}}]})
+
+    monkeypatch.setattr(service.client, "post", post)
+    return service
+
+
+def test_identical_requests_are_cached_across_services(llm_service, cache, monkeypatch):
+    """Test that a new service replays cached responses in request order"""
+    first = [llm_service.run("prompt") for _ in range(2)]
+    assert first == [{"call": 1}, {"call": 2}]
+    assert llm_service.calls == 2
+
+    replay = LLMService(cache=cache)
+    monkeypatch.setattr(replay.client, "post", pytest.fail)
+    assert [replay.run("prompt") for _ in range(2)] == first
+
+
+def test_bypass_and_parameters_change_key(llm_service):
+    """Test that bypassing or changing parameters calls the API"""
+    llm_service.run("prompt")
+    llm_service.reset_cache_occurrences()
+
+    assert llm_service.run("prompt") == {"call": 1}
+    assert llm_service.run("prompt", temperature=0.1) == {"call": 2}
+    llm_service.reset_cache_occurrences()
+    assert llm_service.run("prompt", bypass_cache=True) == {"call": 3}
+    assert llm_service.calls == 3
+
+
+def test_occurrences_are_bounded(llm_service, monkeypatch):
+    """Test that only the most recent distinct requests keep their occurrence"""
+    monkeypatch.setattr(LLMService, "MAX_TRACKED_REQUESTS", 2)
+    for prompt in ["a", "b", "a", "c"]:
+        llm_service.run(prompt)
+    assert list(llm_service._cache_occurrences.values()) == [2, 1]
+
+    # "b" was forgotten, so it replays its first response
+    assert llm_service.run("b") == {"call": 2}
+    assert llm_service.calls == 4
+
+
+def test_eviction_by_entries_and_ttl(tmp_path):
+    """Test least-recently-used eviction and expiry"""
+    cache = LLMCache(path=tmp_path / "lru.sqlite3", max_entries=2, memory_entries=0)
+    for key in ["a", "b", "c"]:
+        cache.set(key, {"key": key})
+    assert len(cache) == 2
+    assert cache.get("a") is None
+    assert cache.get("c") == {"key": "c"}
+    cache.close()
+
+    expired = LLMCache(path=tmp_path / "ttl.sqlite3", ttl=-1)
+    expired.set("a", {"key": "a"})
+    assert expired.get("a") is None
+    expired.close()
+
+
+def test_memory_hits_keep_entries_recently_used(tmp_path, monkeypatch):
+    """Test that in-memory hits count as uses when entries are evicted"""
+    clock = iter(range(1, 100))
+    monkeypatch.setattr(cache_module.time, "time", lambda: float(next(clock)))
+    cache = LLMCache(path=tmp_path / "lru.sqlite3", max_entries=2)
+    cache.set("a", {"key": "a"})
+    cache.set("b", {"key": "b"})
+    assert cache.get("a") == {"key": "a"}  # served from memory
+    cache.set("c", {"key": "c"})
+
+    assert cache.get("b") is None
+    assert cache.get("a") == {"key": "a"}
+    cache.close()
+
+
+def test_eviction_by_size_tracks_total(tmp_path):
+    """Test that size eviction keeps the running total and memory in sync"""
+    value_size = len(json.dumps({"key": "a"}, separators=(",", ":")))
+    cache = LLMCache(path=tmp_path / "size.sqlite3", max_size_bytes=2 * value_size)
+    for key in ["a", "b", "b", "c"]:
+        cache.set(key, {"key": key})
+
+    assert len(cache) == 2
+    assert cache._size == 2 * value_size
+    assert list(cache._memory) == ["b", "c"]
+    assert cache.get("a") is None
+    cache.close()
+
+    # The total is read from the database when the cache is reopened
+    reopened = LLMCache(path=tmp_path / "size.sqlite3")
+    assert reopened._size == 2 * value_size
+    reopened.close()
+
+
+def test_key_is_content_addressed():
+    """Test that keys ignore dict ordering but not content"""
+    first = LLMCache.make_key("u", {"a": 1, "b": [1, 2]})
+    assert first == LLMCache.make_key("u", json.loads('{"b": [1, 2], "a": 1}'))
+    assert first != LLMCache.make_key("u", {"a": 1, "b": [2, 1]})
+    assert first != LLMCache.make_key("u", {"a": 1, "b": [1, 2]}, occurrence=1)
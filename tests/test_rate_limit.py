@@ -0,0 +1,145 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from rhesis import rate_limit as rate_limit_module
+from rhesis.client import Client, close_session, get_session
+from rhesis.rate_limit import AdaptiveConcurrencyLimiter, RateLimiter, TokenBucket
+
+
+def test_token_bucket_overdraw_waits_for_refill():
+    """Test that reservations beyond the capacity wait for the deficit"""
+    bucket = TokenBucket(rate=10, capacity=10)
+    assert bucket.reserve(10) == 0.0
+    assert bucket.reserve(5) == pytest.approx(0.5, abs=0.01)
+
+    bucket.refund(100)
+    assert bucket.reserve(10) == 0.0
+
+
+def test_aimd_increases_on_success_and_halves_on_429():
+    """Test additive increase and multiplicative decrease of the limit"""
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=4, cooldown=0)
+    for _ in range(4):
+        limiter.acquire()
+        limiter.release(200, 0.1)
+    assert limiter.limit == pytest.approx(5, abs=0.1)
+
+    limiter.acquire()
+    limiter.release(429, 0.1)
+    assert limiter.limit == pytest.approx(2.5, abs=0.1)
+
+
+def test_aimd_reacts_to_latency():
+    """Test that slow responses count as congestion"""
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=8, latency_threshold=1.0)
+    limiter.acquire()
+    limiter.release(200, 5.0)
+    assert limiter.limit == 4
+
+
+def test_concurrency_limit_is_shared_across_threads():
+    """Test that a shared limiter caps in-flight requests"""
+    limiter = RateLimiter(
+        concurrency=AdaptiveConcurrencyLimiter(initial_limit=2, max_limit=2)
+    )
+    peak = []
+    lock = threading.Lock()
+
+    def worker():
+        limiter.acquire()
+        with lock:
+            peak.append(limiter.concurrency.in_flight)
+        time.sleep(0.01)
+        limiter.release(200, 0.01)
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert max(peak) == 2
+    assert limiter.concurrency.in_flight == 0
+
+
+def test_token_budget_reconciles_usage():
+    """Test that overestimated token reservations are refunded"""
+    limiter = RateLimiter(tokens_per_minute=600)
+    limiter.acquire(600)
+    limiter.release(200, 0.1)
+    assert limiter.tokens.reserve(1) > 0
+
+    limiter.record_usage(estimated_tokens=600, actual_tokens=100)
+    assert limiter.tokens.reserve(400) == 0.0
+
+
+def test_budget_wait_does_not_hold_a_slot(monkeypatch):
+    """Test that a request waiting for budget does not take a concurrency slot"""
+    limiter = RateLimiter(requests_per_second=1)
+    slept = []
+    monkeypatch.setattr(
+        rate_limit_module.time,
+        "sleep",
+        lambda seconds: slept.append(limiter.concurrency.in_flight),
+    )
+    limiter.acquire()
+    limiter.acquire()
+
+    assert slept == [1]
+    assert limiter.concurrency.in_flight == 2
+
+
+def test_streamed_response_holds_slot_until_closed(monkeypatch):
+    """Test that the slot of a streamed response is released when it is closed"""
+    close_session()
+    limiter = RateLimiter()
+    closed = []
+
+    class FakeResponse:
+        status_code = 200
+        headers = {}
+
+        def close(self):
+            closed.append(True)
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            self.close()
+
+    monkeypatch.setattr(
+        get_session(), "request", lambda method, url, **kwargs: FakeResponse()
+    )
+    client = Client(api_key="test-key", base_url="http://testserver")
+
+    response = client.post("http://testserver/", stream=True, rate_limiter=limiter)
+    assert limiter.concurrency.in_flight == 1
+    with response:
+        pass
+    response.close()
+    assert closed == [True, True]
+    assert limiter.concurrency.in_flight == 0
+
+    client.post("http://testserver/", rate_limiter=limiter)
+    assert limiter.concurrency.in_flight == 0
+    close_session()
+
+
+def test_async_acquire_waits_for_release():
+    """Test that a waiting coroutine is woken by a release from another thread"""
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=1, max_limit=1)
+    limiter.acquire()
+
+    async def acquire():
+        waiting = asyncio.ensure_future(limiter.acquire_async())
+        await asyncio.sleep(0)
+        assert not waiting.done()
+        threading.Timer(0.05, limiter.release, args=(200, 0.01)).start()
+        await asyncio.wait_for(waiting, timeout=5)
+
+    asyncio.run(acquire())
+    assert limiter.in_flight == 1
+    assert limiter._async_waiters == []
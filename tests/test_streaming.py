@@ -0,0 +1,128 @@
+import io
+import json
+
+import pytest
+import requests
+
+from rhesis.client import close_session, get_session
+from rhesis.entities import test_set as test_set_module
+from rhesis.services import LLMService
+from rhesis.services.streaming import IncrementalJSONArrayParser, iter_sse_data
+from rhesis.synthesizers import PromptSynthesizer
+
+
+@pytest.fixture(autouse=True)
+def offline(monkeypatch):
+    """Fixture that provides credentials and a fresh shared session"""
+    monkeypatch.setenv("RHESIS_API_KEY", "test-key")
+    monkeypatch.setenv("RHESIS_BASE_URL", "http://testserver")
+    close_session()
+    yield
+    close_session()
+
+
+def sse_response(deltas):
+    """Build a streamed completion response from content deltas"""
+    events = [
+        "data: " + json.dumps({"choices": [{"delta": {"content": delta}}]}) + "\n\n"
+        for delta in deltas
+    ]
+    response = requests.Response()
+    response.status_code = 200
+    response.headers["Content-Type"] = "text/event-stream"
+    response.raw = io.BytesIO(("".join(events) + "data: [DONE]\n\n").encode())
+    return response
+
+
+def test_parser_emits_elements_across_chunks():
+    """Test that elements are emitted as soon as they are complete"""
+    document = json.dumps(
+        {
+            "meta": {"tests": ["not", "this"]},
+            "tests": [
+                {"prompt": {"content": 'a "quoted", [bracketed] {prompt}'}},
+                {"prompt": {"content": "b\\"}},
+                [1, 2],
+                3,
+            ],
+            "after": 1,
+        }
+    )
+    parser = IncrementalJSONArrayParser(key="tests")
+    elements = []
+    for char in document:
+        elements.extend(parser.feed(char))
+
+    assert elements == json.loads(document)["tests"]
+    assert parser.done
+
+
+def test_parser_top_level_array():
+    """Test parsing a bare top-level array"""
+    parser = IncrementalJSONArrayParser(key=None)
+    assert parser.feed('[{"a": 1}, {"b"') == [{"a": 1}]
+    assert parser.feed(": 2}]") == [{"b": 2}]
+    assert parser.feed("trailing") == []
+
+
+def test_iter_sse_data():
+    """Test that SSE events are joined and stop at [DONE]"""
+    lines = [": keep-alive", "data: one", "", "data: two", "data: lines", ""]
+    lines += ["data: [DONE]", "", "data: ignored", ""]
+    assert list(iter_sse_data(lines)) == ["one", "two\nlines"]
+
+
+def test_stream_items(monkeypatch):
+    """Test that stream_items yields tests from a streamed completion"""
+    sent = []
+
+    def fake_request(method, url, **kwargs):
+        sent.append(kwargs)
+        return sse_response(['{"tests": [{"prompt"', ': "a"}, {"prompt": "b"}', "]}"])
+
+    monkeypatch.setattr(get_session(), "request", fake_request)
+    items = list(LLMService().stream_items("Generate tests"))
+
+    assert items == [{"prompt": "a"}, {"prompt": "b"}]
+    assert sent[0]["stream"] is True
+    assert sent[0]["json"]["stream"] is True
+    assert sent[0]["json"]["response_format"] == "json_object"
+
+
+def test_prompt_synthesizer_stream(monkeypatch):
+    """Test that streamed generation deduplicates and tops up"""
+    monkeypatch.setattr(
+        test_set_module.TestSet, "set_properties", lambda self, llm_service=None: None
+    )
+    synthesizer = PromptSynthesizer("Insurance chatbot", batch_size=3)
+    calls = iter(range(100))
+
+    def stream_items(prompt, key="tests"):
+        call = next(calls)
+        yield {"prompt": {"content": "duplicate"}}
+        yield {"prompt": {"content": f"test {call}"}}
+        yield {"prompt": {"content": f"other {call}"}}
+
+    synthesizer.llm_service.stream_items = stream_items
+    tests = list(synthesizer.stream(num_tests=6))
+
+    contents = [t["prompt"]["content"] for t in tests]
+    assert contents == [
+        "duplicate",
+        "test 0",
+        "other 0",
+        "test 1",
+        "other 1",
+        "test 2",
+    ]
+    assert all(t["metadata"]["generated_by"] == "PromptSynthesizer" for t in tests)
+
+
+def test_prompt_synthesizer_stream_nothing():
+    """Test that streaming no tests makes no calls and batch_size is validated"""
+    synthesizer = PromptSynthesizer("Insurance chatbot")
+    synthesizer.llm_service.stream_items = pytest.fail
+
+    assert list(synthesizer.stream(num_tests=0)) == []
+    with pytest.raises(ValueError, match="batch_size"):
+        PromptSynthesizer("Insurance chatbot", batch_size=0)
@@ -0,0 +1,212 @@
+import json
+import random
+import threading
+import time
+
+import pytest
+
+from rhesis.entities import test_set as test_set_module
+from rhesis.synthesizers import ParaphrasingSynthesizer, PromptSynthesizer, Tracer
+
+
+@pytest.fixture(autouse=True)
+def offline(monkeypatch):
+    """Fixture that keeps synthesizers from calling the API for properties"""
+    monkeypatch.setenv("RHESIS_API_KEY", "test-key")
+    monkeypatch.setattr(
+        test_set_module.TestSet, "set_properties", lambda self, llm_service=None: None
+    )
+
+
+def paraphrase_stub(delay=0.0):
+    """Create a fake LLM run function that paraphrases the original prompt"""
+    state = {"active": 0, "peak": 0}
+    lock = threading.Lock()
+
+    def run(prompt, **kwargs):
+        original = prompt.split("for this prompt:\n", 1)[1].split("\n", 1)[0]
+        with lock:
+            state["active"] += 1
+            state["peak"] = max(state["peak"], state["active"])
+        time.sleep(random.uniform(0, delay))
+        with lock:
+            state["active"] -= 1
+        return {
+            "tests": [{"prompt": {"content": f"{original} v{i}"}} for i in range(2)]
+        }
+
+    return run, state
+
+
+def make_test_set(count):
+    return test_set_module.TestSet(
+        tests=[
+            {"id": str(i), "prompt": {"content": f"prompt {i}"}} for i in range(count)
+        ]
+    )
+
+
+def test_concurrent_paraphrasing_preserves_order():
+    """Test that concurrent paraphrasing keeps originals followed by paraphrases"""
+    synthesizer = ParaphrasingSynthesizer(make_test_set(12), max_concurrency=4)
+    run, state = paraphrase_stub(delay=0.01)
+    synthesizer.llm_service.run = run
+
+    result = synthesizer.generate(num_paraphrases=2)
+
+    contents = [t["prompt"]["content"] for t in result.tests]
+    expected = []
+    for i in range(12):
+        expected += [f"prompt {i}", f"prompt {i} v0", f"prompt {i} v1"]
+    assert contents == expected
+    assert 1 < state["peak"] <= 4
+
+
+def test_sequential_paraphrasing_by_default():
+    """Test that paraphrasing is sequential unless concurrency is requested"""
+    synthesizer = ParaphrasingSynthesizer(make_test_set(3))
+    run, state = paraphrase_stub()
+    synthesizer.llm_service.run = run
+
+    result = synthesizer.generate(num_paraphrases=2)
+
+    assert len(result.tests) == 9
+    assert state["peak"] == 1
+
+
+def test_prompt_synthesizer_batches_and_deduplicates():
+    """Test that generation is split into batches, deduplicated and trimmed"""
+    synthesizer = PromptSynthesizer(
+        "Insurance chatbot", batch_size=5, max_concurrency=4
+    )
+    counter = iter(range(10_000))
+    batch_sizes = []
+    lock = threading.Lock()
+
+    def run(prompt, **kwargs):
+        num_tests = int(prompt.split("Generate EXACTLY ", 1)[1].split(" ", 1)[0])
+        with lock:
+            batch_sizes.append(num_tests)
+            ids = [next(counter) for _ in range(num_tests)]
+        # Every batch repeats one prompt that was already generated
+        contents = ["duplicate"] + [f"test {i}" for i in ids[1:]]
+        return {"tests": [{"prompt": {"content": c}} for c in contents]}
+
+    synthesizer.llm_service.run = run
+    result = synthesizer.generate(num_tests=23)
+
+    contents = [t["prompt"]["content"] for t in result.tests]
+    assert len(contents) == 23
+    assert len(set(contents)) == 23
+    assert max(batch_sizes) == 5
+    assert sorted(batch_sizes[:5]) == [3, 5, 5, 5, 5]
+
+
+def test_prompt_synthesizer_tops_up_short_batches():
+    """Test that a batch that stays short is topped up instead of failing"""
+    synthesizer = PromptSynthesizer(
+        "Insurance chatbot", batch_size=5, max_concurrency=1
+    )
+    counter = iter(range(10_000))
+    calls = []
+
+    def run(prompt, **kwargs):
+        num_tests = int(prompt.split("Generate EXACTLY ", 1)[1].split(" ", 1)[0])
+        calls.append(num_tests)
+        # The first batch and both of its retries come back with one test
+        count = 1 if len(calls) <= 3 else num_tests
+        return {
+            "tests": [
+                {"prompt": {"content": f"test {next(counter)}"}} for _ in range(count)
+            ]
+        }
+
+    synthesizer.llm_service.run = run
+    result = synthesizer.generate(num_tests=10)
+
+    assert len({t["prompt"]["content"] for t in result.tests}) == 10
+    assert calls == [5, 5, 5, 5, 5]
+
+    # Without any useful answers, generation fails once the top-ups run out
+    synthesizer.llm_service.run = lambda prompt, **kwargs: {"tests": []}
+    with pytest.raises(ValueError, match="0 unique test cases, expected 10"):
+        synthesizer.generate(num_tests=10)
+
+
+def test_packed_paraphrasing_maps_and_tops_up():
+    """Test that packed requests map paraphrases by index and top up shortfalls"""
+    synthesizer = ParaphrasingSynthesizer(make_test_set(7), batch_size=3, packed=True)
+    single_run, _ = paraphrase_stub()
+    calls = []
+
+    def run(prompt, **kwargs):
+        if "for this prompt:" in prompt:
+            calls.append("single")
+            return single_run(prompt)
+        calls.append("packed")
+        lines = [line for line in prompt.splitlines() if line.startswith("[")]
+        tests = []
+        # Answer out of order and leave the last original one paraphrase short
+        for line in reversed(lines):
+            index, original = line[1:].split("] ", 1)
+            count = 1 if line == lines[-1] else 2
+            tests += [
+                {
+                    "original_index": int(index),
+                    "prompt": {"content": f"{original} v{i}"},
+                }
+                for i in range(count)
+            ]
+        return {"tests": tests}
+
+    synthesizer.llm_service.run = run
+    result = synthesizer.generate(num_paraphrases=2)
+
+    contents = [t["prompt"]["content"] for t in result.tests]
+    assert len(contents) == 21
+    for i in range(7):
+        original, *paraphrases = contents[3 * i : 3 * i + 3]
+        assert original == f"prompt {i}"
+        assert all(c.startswith(f"prompt {i} v") for c in paraphrases)
+    assert calls.count("packed") == 3
+    assert calls.count("single") == 3
+
+
+def test_tracer_records_stages(tmp_path):
+    """Test that a tracer records each stage, including top-ups, as a Chrome trace"""
+    tracer = Tracer()
+    synthesizer = ParaphrasingSynthesizer(
+        make_test_set(3), max_concurrency=2, tracer=tracer
+    )
+    single_run, _ = paraphrase_stub()
+    calls = []
+
+    def run(prompt, **kwargs):
+        calls.append(prompt)
+        # The first answer for each original comes back one paraphrase short
+        response = single_run(prompt)
+        if calls.count(prompt) == 1:
+            response["tests"] = response["tests"][:1]
+        return response
+
+    synthesizer.llm_service.run = run
+    synthesizer.generate(num_paraphrases=2)
+
+    summary = tracer.summary()
+    assert summary["generate"]["count"] == 1
+    assert summary["render"]["count"] == 3
+    assert summary["llm_call"]["count"] == 6
+    assert summary["parse"]["count"] == 6
+    assert summary["top_up"]["count"] == 3
+    assert summary["metadata"]["count"] == 3
+    assert summary["set_properties"]["count"] == 1
+
+    trace = json.loads(tracer.save(tmp_path / "trace.json").read_text())
+    spans = [e for e in trace["traceEvents"] if e["ph"] == "X"]
+    assert {e["cat"] for e in spans} == {"ParaphrasingSynthesizer"}
+    (root,) = [e for e in spans if e["name"] == "generate"]
+    assert all(
+        root["ts"] <= e["ts"] and e["ts"] + e["dur"] <= root["ts"] + root["dur"]
+        for e in spans
+    )
+    assert any(e["name"] == "thread_name" for e in trace["traceEvents"])
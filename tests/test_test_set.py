@@ -0,0 +1,342 @@
+import hashlib
+import json
+import threading
+
+import pytest
+import requests
+
+from rhesis.client import close_session, get_session
+from rhesis.entities import test_set as test_set_module
+from rhesis.entities.base_entity import iter_pages
+
+
+class FakeResponse:
+    def __init__(self, data, status_code=200):
+        self.data = data
+        self.status_code = status_code
+        self.headers = {}
+
+    def json(self):
+        return self.data
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.exceptions.HTTPError(response=self)
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def server(monkeypatch):
+    """Fixture that serves a paginated list of tests from the shared session"""
+    monkeypatch.setenv("RHESIS_API_KEY", "test-key")
+    monkeypatch.setenv("RHESIS_BASE_URL", "http://testserver")
+    close_session()
+    tests = [
+        {
+            "id": str(i),
+            "content": f"prompt {i}",
+            "category": f"category {i % 3}",
+            "topic": f"topic {i % 2}",
+        }
+        for i in range(25)
+    ]
+    requested = []
+
+    def fake_request(method, url, params=None, **kwargs):
+        requested.append(dict(params or {}))
+        skip, limit = params["skip"], params["limit"]
+        return FakeResponse(tests[skip : skip + limit])
+
+    monkeypatch.setattr(get_session(), "request", fake_request)
+    yield tests, requested
+    close_session()
+
+
+def test_iter_tests_pages_through_endpoint(server):
+    """Test that iter_tests pages with skip and limit until a short page"""
+    tests, requested = server
+    test_set = test_set_module.TestSet(id="ts")
+
+    assert list(test_set.iter_tests(page_size=10)) == tests
+    assert [(p["skip"], p["limit"]) for p in requested] == [(0, 10), (10, 10), (20, 10)]
+    assert test_set.tests is None
+
+
+@pytest.mark.parametrize("prefetch", [True, False])
+def test_iter_tests_stops_when_pagination_is_ignored(server, monkeypatch, prefetch):
+    """Test that iter_tests terminates if the endpoint ignores skip and limit"""
+    tests, requested = server
+    test_set = test_set_module.TestSet(id="ts")
+
+    # Everything at once: a page longer than page_size is the last one
+    monkeypatch.setattr(
+        get_session(), "request", lambda method, url, **kwargs: FakeResponse(tests)
+    )
+    assert list(test_set.iter_tests(page_size=10, prefetch=prefetch)) == tests
+
+    # Always the first page: a page repeating the previous IDs is dropped
+    monkeypatch.setattr(
+        get_session(),
+        "request",
+        lambda method, url, **kwargs: FakeResponse(tests[:10]),
+    )
+    assert list(test_set.iter_tests(page_size=10, prefetch=prefetch)) == tests[:10]
+
+
+def test_iter_pages_prefetches_next_page():
+    """Test that the next page is requested while the current one is consumed"""
+    fetched = []
+    released = threading.Event()
+
+    def fetch_page(skip, limit):
+        fetched.append(skip)
+        if skip == 2:
+            released.set()
+        return list(range(skip, min(skip + limit, 5)))
+
+    pages = iter_pages(fetch_page, page_size=2)
+    assert next(pages) == [0, 1]
+    assert released.wait(timeout=5)
+    assert list(pages) == [[2, 3], [4]]
+    assert fetched == [0, 2, 4]
+
+
+def test_chunked_consumers(server, monkeypatch):
+    """Test that to_pandas, get_properties and count_tokens stream pages"""
+    tests, requested = server
+    monkeypatch.setattr(
+        test_set_module,
+        "count_tokens_batch",
+        lambda texts, encoding, method: [len(text.split()) for text in texts],
+    )
+    test_set = test_set_module.TestSet(id="ts")
+
+    df = test_set.to_pandas(page_size=10)
+    assert list(df["id"]) == [t["id"] for t in tests]
+
+    properties = test_set.get_properties(page_size=7)
+    assert properties["test_count"] == 25
+    assert properties["categories"] == ["category 0", "category 1", "category 2"]
+    assert properties["topics"] == ["topic 0", "topic 1"]
+
+    stats = test_set.count_tokens(page_size=10)
+    assert stats == {"total": 50, "average": 2, "max": 2, "min": 2, "test_count": 25}
+    assert test_set.tests is None
+
+
+class FakeStreamResponse(FakeResponse):
+    def __init__(self, body, status_code=200, fail_after=None, headers=None):
+        super().__init__(None, status_code)
+        self.body = body
+        self.fail_after = fail_after
+        self.headers = headers or {}
+
+    def iter_content(self, chunk_size):
+        for start in range(0, len(self.body), 4):
+            if self.fail_after is not None and start >= self.fail_after:
+                raise requests.exceptions.ChunkedEncodingError("connection dropped")
+            yield self.body[start : start + 4]
+
+
+def test_download_resumes_interrupted_transfer(tmp_path, monkeypatch):
+    """Test that a dropped download resumes with a Range request"""
+    monkeypatch.setenv("RHESIS_API_KEY", "test-key")
+    close_session()
+    body = b"id,prompt\n1,hello\n2,world\n"
+    sent = []
+
+    def fake_request(method, url, headers=None, **kwargs):
+        sent.append(dict(headers))
+        assert kwargs["stream"] is True
+        if len(sent) == 1:
+            return FakeStreamResponse(body, fail_after=8, headers={"ETag": '"v1"'})
+        offset = int(headers["Range"].split("=")[1].rstrip("-"))
+        return FakeStreamResponse(body[offset:], status_code=206)
+
+    monkeypatch.setattr(get_session(), "request", fake_request)
+    test_set = test_set_module.TestSet(id="ts")
+    checksum = "sha256:" + hashlib.sha256(body).hexdigest()
+
+    assert test_set.download(path=str(tmp_path), checksum=checksum) is True
+    assert (tmp_path / "test_set_ts.csv").read_bytes() == body
+    assert not (tmp_path / "test_set_ts.csv.part").exists()
+    assert "Range" not in sent[0]
+    assert sent[1]["Range"] == "bytes=8-"
+    assert sent[1]["If-Range"] == '"v1"'
+    close_session()
+
+
+def test_download_restarts_if_file_changed(tmp_path, monkeypatch):
+    """Test that a partial file is only resumed if the remote file is unchanged"""
+    monkeypatch.setenv("RHESIS_API_KEY", "test-key")
+    close_session()
+    remote = {"body": b"id,prompt\n1,hello\n2,world\n", "etag": '"v1"'}
+    sent = []
+
+    def fake_request(method, url, headers=None, **kwargs):
+        sent.append(dict(headers))
+        body, etag = remote["body"], remote["etag"]
+        if "Range" in headers and headers["If-Range"] == etag:
+            offset = int(headers["Range"].split("=")[1].rstrip("-"))
+            return FakeStreamResponse(body[offset:], status_code=206)
+        return FakeStreamResponse(body, fail_after=8, headers={"ETag": etag})
+
+    monkeypatch.setattr(get_session(), "request", fake_request)
+    test_set = test_set_module.TestSet(id="ts")
+    part_path = tmp_path / "test_set_ts.csv.part"
+
+    with pytest.raises(requests.exceptions.ChunkedEncodingError):
+        test_set.download(path=str(tmp_path), max_resumes=0)
+    assert part_path.read_bytes() == remote["body"][:8]
+    assert (tmp_path / "test_set_ts.csv.part.meta").read_text() == '"v1"'
+
+    # The file changes before the next attempt, so it is fetched again in full
+    remote.update(body=b"id,prompt\n1,changed\n", etag='"v2"')
+    with pytest.raises(requests.exceptions.ChunkedEncodingError):
+        test_set.download(path=str(tmp_path), max_resumes=0)
+    assert (sent[1]["Range"], sent[1]["If-Range"]) == ("bytes=8-", '"v1"')
+    assert part_path.read_bytes() == remote["body"][:8]
+
+    # A partial file without a saved validator is not resumed
+    (tmp_path / "test_set_ts.csv.part.meta").unlink()
+    with pytest.raises(requests.exceptions.ChunkedEncodingError):
+        test_set.download(path=str(tmp_path), max_resumes=0)
+    assert "Range" not in sent[2]
+
+    assert test_set.download(path=str(tmp_path)) is True
+    assert (tmp_path / "test_set_ts.csv").read_bytes() == remote["body"]
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["test_set_ts.csv"]
+    close_session()
+
+
+def test_download_rejects_checksum_mismatch(tmp_path, monkeypatch):
+    """Test that a download failing verification is not moved into place"""
+    monkeypatch.setenv("RHESIS_API_KEY", "test-key")
+    close_session()
+    monkeypatch.setattr(
+        get_session(),
+        "request",
+        lambda method, url, **kwargs: FakeStreamResponse(b"tampered"),
+    )
+    test_set = test_set_module.TestSet(id="ts")
+
+    with pytest.raises(ValueError, match="Checksum mismatch"):
+        test_set.download(path=str(tmp_path), checksum="0" * 64)
+    assert list(tmp_path.iterdir()) == []
+    close_session()
+
+
+def test_chunked_upload_resumes_failed_chunks(tmp_path, monkeypatch):
+    """Test that a retried upload only sends the chunks that failed"""
+    monkeypatch.setenv("RHESIS_API_KEY", "test-key")
+    monkeypatch.setenv("RHESIS_BASE_URL", "http://testserver")
+    close_session()
+    sent = []
+    fail = {"count": 1}
+    lock = threading.Lock()
+
+    def fake_request(method, url, data=None, **kwargs):
+        body = json.loads(b"".join(data))
+        with lock:
+            sent.append((url, [t["id"] for t in body["tests"]]))
+            if body["tests"][0]["id"] == "4" and fail["count"]:
+                fail["count"] -= 1
+                return FakeResponse({"message": "boom"}, status_code=500)
+        if url.endswith("/test_sets/bulk"):
+            assert body["name"] == "Large"
+            return FakeResponse({"id": "new", "name": "Large"})
+        return FakeResponse({})
+
+    monkeypatch.setattr(get_session(), "request", fake_request)
+    test_set = test_set_module.TestSet(
+        name="Large", tests=[{"id": str(i)} for i in range(10)]
+    )
+    journal = tmp_path / "journal.json"
+    upload = dict(
+        chunk_size=2, max_concurrency=3, resume=True, journal_path=str(journal)
+    )
+
+    with pytest.raises(requests.exceptions.HTTPError):
+        test_set.upload(**upload)
+    assert journal.exists()
+    assert test_set.id == "new"
+
+    sent.clear()
+    test_set.upload(**upload)
+
+    assert sent == [("http://testserver/test_sets/new/tests", ["4", "5"])]
+    assert not journal.exists()
+    close_session()
+
+
+def test_chunked_upload_deletes_partial_test_set(tmp_path, monkeypatch):
+    """Test that a failed chunked upload removes the test set it created"""
+    monkeypatch.setenv("RHESIS_API_KEY", "test-key")
+    monkeypatch.setenv("RHESIS_BASE_URL", "http://testserver")
+    monkeypatch.setenv("RHESIS_CACHE_DIR", str(tmp_path))
+    close_session()
+    sent = []
+
+    def fake_request(method, url, data=None, **kwargs):
+        sent.append((method, url))
+        if method == "DELETE":
+            return FakeResponse({}, status_code=204)
+        if url.endswith("/test_sets/bulk"):
+            return FakeResponse({"id": "new", "name": "Large"})
+        return FakeResponse({"message": "boom"}, status_code=500)
+
+    monkeypatch.setattr(get_session(), "request", fake_request)
+    test_set = test_set_module.TestSet(
+        name="Large", tests=[{"id": str(i)} for i in range(4)]
+    )
+
+    with pytest.raises(requests.exceptions.HTTPError):
+        test_set.upload(chunk_size=2)
+    assert sent[-1] == ("DELETE", "http://testserver/test_sets/new/")
+    assert test_set.id is None
+    assert not list(tmp_path.rglob("*.json"))
+    close_session()
+
+
+def test_upload_sends_one_request_by_default(monkeypatch):
+    """Test that upload is single-shot unless chunk_size is given"""
+    import tqdm
+
+    monkeypatch.setenv("RHESIS_API_KEY", "test-key")
+    monkeypatch.setenv("RHESIS_BASE_URL", "http://testserver")
+    close_session()
+    sent = []
+    progress = []
+
+    class FakeProgress:
+        def __init__(self, total, initial, **kwargs):
+            progress.append((total, initial))
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+        def update(self, n):
+            progress.append(n)
+
+    def fake_request(method, url, data=None, **kwargs):
+        body = b"".join(data)
+        sent.append((url, len(json.loads(body)["tests"]), len(body)))
+        return FakeResponse({"id": "new", "name": "Small"})
+
+    monkeypatch.setattr(get_session(), "request", fake_request)
+    monkeypatch.setattr(tqdm, "tqdm", FakeProgress)
+    test_set = test_set_module.TestSet(
+        name="Small", tests=[{"id": str(i)} for i in range(5)]
+    )
+
+    test_set.upload()
+    [(url, count, size)] = sent
+    assert (url, count) == ("http://testserver/test_sets/bulk", 5)
+    # Progress counts the bytes of the body as it is read
+    assert progress == [(size, 0), size]
+    close_session()
@@ -0,0 +1,118 @@
+import json
+import os
+
+import pytest
+
+from rhesis.client import close_session, get_session
+from rhesis.entities import columnar
+from rhesis.entities import test_set as test_set_module
+from rhesis.entities import test_set_cache
+
+
+class FakeResponse:
+    def __init__(self, data):
+        self.data = data
+        self.content = json.dumps(data).encode("utf-8")
+        self.status_code = 200
+        self.headers = {}
+
+    def json(self):
+        return self.data
+
+    def raise_for_status(self):
+        pass
+
+
+@pytest.fixture
+def server(monkeypatch):
+    """Fixture that serves a test set and its paginated tests"""
+    monkeypatch.setenv("RHESIS_API_KEY", "test-key")
+    monkeypatch.setenv("RHESIS_BASE_URL", "http://testserver")
+    close_session()
+    state = {
+        "test_set": {"id": "ts", "name": "Cached", "updated_at": "2024-01-01T00:00"},
+        "tests": [
+            {"id": str(i), "prompt": {"content": f"prompt {i}"}, "topic": "Claims"}
+            for i in range(5)
+        ],
+    }
+    requested = []
+
+    def fake_request(method, url, params=None, **kwargs):
+        requested.append(url)
+        if url.endswith("/tests"):
+            params = params or {}
+            skip, limit = params.get("skip", 0), params.get("limit")
+            return FakeResponse(state["tests"][skip:][:limit])
+        return FakeResponse(state["test_set"])
+
+    monkeypatch.setattr(get_session(), "request", fake_request)
+    yield state, requested
+    close_session()
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return test_set_cache.TestSetCache(path=tmp_path / "test_sets")
+
+
+def test_load_reads_cached_tests(server, cache):
+    """Test that a second load reads the tests from the cache"""
+    state, requested = server
+
+    first = test_set_module.TestSet(id="ts").load(format="dict", cache=cache)
+    fetched = len([url for url in requested if url.endswith("/tests")])
+    test_set = test_set_module.TestSet(id="ts")
+    second = test_set.load(format="dict", cache=cache)
+
+    assert first == second == state["tests"]
+    assert fetched == 1
+    assert len([url for url in requested if url.endswith("/tests")]) == 1
+    assert test_set.tests is None
+    assert test_set.table.num_rows == 5
+    assert len(test_set.load(cache=cache)) == 5
+
+
+def test_updated_test_set_is_refetched(server, cache):
+    """Test that a changed updated_at misses and replaces the old version"""
+    state, requested = server
+    test_set_module.TestSet(id="ts").load(format="arrow", cache=cache)
+
+    state["test_set"]["updated_at"] = "2024-02-01T00:00"
+    state["tests"] = state["tests"][:2]
+    table = test_set_module.TestSet(id="ts").load(format="arrow", cache=cache)
+
+    assert table.num_rows == 2
+    assert len(cache) == 1
+    assert cache.file_path("ts", "2024-02-01T00:00").exists()
+
+
+def test_test_sets_without_updated_at_are_not_cached(server, cache):
+    """Test that test sets that cannot be validated bypass the cache"""
+    state, _ = server
+    del state["test_set"]["updated_at"]
+
+    tests = test_set_module.TestSet(id="ts").load(format="dict", cache=cache)
+    assert tests == state["tests"]
+    assert len(cache) == 0
+
+
+def test_least_recently_used_test_sets_are_evicted(tmp_path):
+    """Test that the least recently used files are removed beyond max_size_bytes"""
+    table = columnar.tests_to_table([{"prompt": {"content": "x" * 1000}}])
+    cache = test_set_cache.TestSetCache(path=tmp_path)
+    cache.set("a", 1, table)
+    size = cache.size_bytes()
+    cache.max_size_bytes = 2 * size
+
+    cache.set("b", 1, table)
+    # Make "a" older than "b", then use it again
+    os.utime(cache.file_path("a", 1), (0, 0))
+    os.utime(cache.file_path("b", 1), (1, 1))
+    assert cache.get("a", 1).num_rows == 1
+    cache.set("c", 1, table)
+
+    assert cache.get("b", 1) is None
+    assert cache.get("a", 1) is not None
+    assert cache.get("c", 1) is not None
+    assert cache.size_bytes() <= cache.max_size_bytes
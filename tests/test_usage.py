@@ -0,0 +1,168 @@
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from rhesis.entities import test_set as test_set_module
+from rhesis.services import LLMCache, LLMService, TokenUsage
+from rhesis.synthesizers import ParaphrasingSynthesizer, PromptSynthesizer
+from rhesis.synthesizers.base import TestSetSynthesizer
+
+
+class FakeResponse:
+    def __init__(self, payload):
+        self.payload = payload
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self.payload
+
+
+@pytest.fixture
+def offline(monkeypatch):
+    """Fixture that keeps services from calling the API"""
+    monkeypatch.setenv("RHESIS_API_KEY", "test-key")
+    monkeypatch.setattr(
+        test_set_module.TestSet, "set_properties", lambda self, llm_service=None: None
+    )
+
+
+def reply_with_usage(service, monkeypatch, content):
+    """Make a service answer every completion with content and its usage"""
+
+    def post(url, json=None, **kwargs):
+        prompt = json["messages"][-1]["content"]
+        return FakeResponse(
+            {
+                "choices": [{"message": {"content": content(prompt)}}],
+                "usage": {"prompt_tokens": 100, "completion_tokens": 20},
+            }
+        )
+
+    monkeypatch.setattr(service.client, "post", post)
+
+
+def test_usage_is_recorded_per_call(offline, monkeypatch, tmp_path):
+    """Test that usage is summed, with cached responses counted separately"""
+    cache = LLMCache(path=tmp_path / "cache.sqlite3")
+    service = LLMService(cache=cache)
+    reply_with_usage(service, monkeypatch, lambda prompt: '{"ok": true}')
+    before = service.usage.snapshot()
+
+    service.run("first")
+    service.run("second")
+    service.run("third")
+    replay = LLMService(cache=cache)
+    replay.run("first")
+    cache.close()
+
+    usage = service.usage.snapshot() - before
+    assert usage.to_dict() == {
+        "calls": 3,
+        "cached_calls": 0,
+        "calls_without_usage": 0,
+        "prompt_tokens": 300,
+        "completion_tokens": 60,
+        "total_tokens": 360,
+    }
+    assert (replay.usage.calls, replay.usage.cached_calls) == (1, 1)
+    assert replay.usage.total_tokens == 0
+
+
+def test_token_usage_cost():
+    """Test that cost is computed from per-million-token prices"""
+    usage = TokenUsage(prompt_tokens=2_000_000, completion_tokens=500_000)
+    assert usage.cost(0.5, 2.0) == pytest.approx(2.0)
+    assert usage.cost(1.0) == pytest.approx(2.5)
+
+    usage.record({"choices": []})
+    assert (usage.calls, usage.calls_without_usage) == (1, 1)
+
+
+def test_synthesizer_attaches_run_usage(offline, monkeypatch):
+    """Test that generate adds the token usage of its run to the metadata"""
+    synthesizer = PromptSynthesizer("Insurance chatbot", batch_size=5)
+    counter = iter(range(1000))
+
+    def content(prompt):
+        tests = [{"prompt": {"content": f"test {next(counter)}"}} for _ in range(5)]
+        return json.dumps({"tests": tests})
+
+    reply_with_usage(synthesizer.llm_service, monkeypatch, content)
+    synthesizer.generate(num_tests=10)
+    test_set = synthesizer.generate(num_tests=15)
+
+    assert test_set.metadata["usage"]["calls"] == 3
+    assert test_set.metadata["usage"]["total_tokens"] == 360
+    assert test_set.metadata["synthesizer"] == "PromptSynthesizer"
+
+
+def test_concurrent_runs_on_shared_service(offline, monkeypatch):
+    """Test that runs sharing a service are only charged for their own calls"""
+    service = LLMService()
+    synthesizers = [
+        PromptSynthesizer(topic, batch_size=5, llm_service=service)
+        for topic in ("Insurance chatbot", "Banking chatbot")
+    ]
+    # Both runs are in their first call at the same time
+    overlap = threading.Barrier(2, timeout=5)
+    calls, counter = iter(range(1000)), iter(range(1000))
+    lock = threading.Lock()
+
+    def content(prompt):
+        with lock:
+            first_calls = next(calls) < 2
+            numbers = [next(counter) for _ in range(5)]
+        if first_calls:
+            overlap.wait()
+        return json.dumps({"tests": [{"prompt": f"test {n}"} for n in numbers]})
+
+    reply_with_usage(service, monkeypatch, content)
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        runs = [
+            executor.submit(synthesizer.generate, num_tests=num_tests)
+            for synthesizer, num_tests in zip(synthesizers, [10, 15])
+        ]
+        test_sets = [run.result() for run in runs]
+
+    assert [t.metadata["usage"]["calls"] for t in test_sets] == [2, 3]
+    assert [t.metadata["usage"]["total_tokens"] for t in test_sets] == [240, 360]
+    assert service.usage.calls == 5
+
+
+def test_estimate_usage(offline):
+    """Test that usage is estimated from the rendered prompts of planned calls"""
+    tests = [{"id": str(i), "prompt": {"content": f"prompt {i}"}} for i in range(7)]
+    test_set = test_set_module.TestSet(tests=tests)
+
+    single = ParaphrasingSynthesizer(test_set).estimate_usage(num_paraphrases=2)
+    packed = ParaphrasingSynthesizer(
+        test_set, batch_size=3, packed=True
+    ).estimate_usage(num_paraphrases=2, prompt_price=1.0, max_tokens=1000)
+
+    assert single["calls"] == 7
+    assert packed["calls"] == 3
+    assert 0 < packed["prompt_tokens"] < single["prompt_tokens"]
+    assert packed["largest_prompt_tokens"] > single["largest_prompt_tokens"]
+    assert packed["max_completion_tokens"] == 3000
+    assert packed["max_cost"] == pytest.approx(
+        (packed["prompt_tokens"] + 3000) / 1_000_000
+    )
+    assert "max_cost" not in single
+
+    prompt = PromptSynthesizer("Insurance chatbot", batch_size=5)
+    assert prompt.estimate_usage(num_tests=23)["calls"] == 5
+
+
+def test_estimate_usage_is_optional(offline, monkeypatch):
+    """Test that synthesizers without planned prompts work but cannot estimate"""
+    monkeypatch.setattr(
+        PromptSynthesizer, "_planned_prompts", TestSetSynthesizer._planned_prompts
+    )
+
+    synthesizer = PromptSynthesizer("Insurance chatbot")
+    with pytest.raises(NotImplementedError):
+        synthesizer.estimate_usage(num_tests=5)
@@ -0,0 +1,169 @@
+import os
+
+import pytest
+import tiktoken
+
+from rhesis import cli, config, utils
+from rhesis.entities import test_set as test_set_module
+
+
+class FakeEncoding:
+    """Encoding that splits on whitespace"""
+
+    def __init__(self):
+        self.cache_dir = os.environ.get("TIKTOKEN_CACHE_DIR")
+
+    def encode_ordinary(self, text):
+        return text.split()
+
+    def encode_ordinary_batch(self, texts, num_threads=8):
+        return [text.split() for text in texts]
+
+
+@pytest.fixture(autouse=True)
+def tokenizer_cache(tmp_path, monkeypatch):
+    """Fixture that points the tokenizer cache at a temporary directory"""
+    monkeypatch.setenv("TIKTOKEN_CACHE_DIR", str(tmp_path / "tiktoken"))
+    monkeypatch.setattr(utils, "_unavailable_encodings", set())
+    monkeypatch.setattr(utils, "_encoding_failures", {})
+    utils._load_encoding.cache_clear()
+    yield tmp_path / "tiktoken"
+    utils._load_encoding.cache_clear()
+
+
+@pytest.fixture
+def loads(monkeypatch):
+    """Fixture that replaces tiktoken's encoding loader and counts its calls"""
+    calls = []
+
+    def get_encoding(name):
+        calls.append(name)
+        return FakeEncoding()
+
+    monkeypatch.setattr(tiktoken, "get_encoding", get_encoding)
+    return calls
+
+
+@pytest.fixture
+def offline(monkeypatch):
+    """Fixture where loading an encoding fails like it does without network"""
+    calls = []
+
+    def get_encoding(name):
+        calls.append(name)
+        raise ConnectionError("Name or service not known")
+
+    monkeypatch.setattr(tiktoken, "get_encoding", get_encoding)
+    return calls
+
+
+def test_encoding_is_loaded_once(loads):
+    """Test that repeated counts reuse the cached encoding"""
+    assert utils.count_tokens("one two three") == 3
+    assert utils.count_tokens("four") == 1
+    assert utils.count_tokens_batch(["a b", "c"]) == [2, 1]
+    assert loads == ["cl100k_base"]
+
+
+def test_count_tokens_batch_skips_non_strings(loads):
+    """Test that entries without text are not counted"""
+    assert utils.count_tokens_batch(["a b", None, 3, ""]) == [2, None, None, 0]
+    assert utils.count_tokens_batch([None]) == [None]
+
+
+def test_count_tokens_batch_returns_none_on_failure(offline):
+    """Test that encoding failures are logged instead of raised"""
+    assert utils.count_tokens_batch(["a", "b"]) == [None, None]
+
+
+def test_exact_method_remembers_load_failures(offline, monkeypatch):
+    """Test that a failed load is not retried on every count until it expires"""
+    now = {"time": 0.0}
+    monkeypatch.setattr(utils.time, "monotonic", lambda: now["time"])
+    assert utils.count_tokens("text") is None
+    assert utils.count_tokens_batch(["a", "b"]) == [None, None]
+    with pytest.raises(ConnectionError):
+        utils.get_encoding("cl100k_base")
+    assert offline == ["cl100k_base"]
+
+    now["time"] += utils.ENCODING_RETRY_SECONDS
+    assert utils.count_tokens("text") is None
+    assert utils.count_tokens("text") is None
+    assert offline == ["cl100k_base"] * 2
+
+    # Prewarming always tries again
+    with pytest.raises(ConnectionError):
+        utils.prewarm_encodings(["cl100k_base"])
+    assert len(offline) == 3
+
+
+def test_auto_method_falls_back_to_estimate(offline):
+    """Test that auto estimates when the encoding is unavailable, trying it once"""
+    text = "The quick brown fox jumps over the lazy dog"
+    assert utils.count_tokens(text, method="auto") == utils.estimate_tokens(text)
+    assert utils.count_tokens_batch([text, None], method="auto") == [
+        utils.estimate_tokens(text),
+        None,
+    ]
+    assert offline == ["cl100k_base"]
+    assert utils.count_tokens(text) is None
+
+
+def test_estimate_method_skips_tokenizer(offline):
+    """Test that the estimate method never loads an encoding"""
+    assert utils.count_tokens_batch(["Hello, world!", "", 3], method="estimate") == [
+        3,
+        0,
+        None,
+    ]
+    assert offline == []
+    with pytest.raises(ValueError):
+        utils.count_tokens("text", method="fast")
+
+
+def test_encodings_use_tokenizer_cache_dir(
+    loads, tokenizer_cache, tmp_path, monkeypatch
+):
+    """Test that encodings are loaded from the configured cache directory"""
+    monkeypatch.setattr(config, "tokenizer_cache_dir", str(tmp_path / "custom"))
+    encoding = utils.get_encoding("cl100k_base")
+    assert encoding.cache_dir == str(tmp_path / "custom")
+    assert (tmp_path / "custom").is_dir()
+    # The environment is only changed while loading
+    assert os.environ["TIKTOKEN_CACHE_DIR"] == str(tokenizer_cache)
+
+    # Encodings are cached per directory
+    assert utils.get_encoding("cl100k_base") is encoding
+    monkeypatch.setattr(config, "tokenizer_cache_dir", str(tmp_path / "other"))
+    assert utils.get_encoding("cl100k_base").cache_dir == str(tmp_path / "other")
+    assert loads == ["cl100k_base", "cl100k_base"]
+
+
+def test_cli_prewarm(loads, tmp_path, monkeypatch, capsys):
+    """Test that the prewarm command loads the requested encodings"""
+    monkeypatch.setattr(config, "tokenizer_cache_dir", None)
+    cli.main(["prewarm", "o200k_base", "--cache-dir", str(tmp_path / "cli")])
+
+    assert loads == ["o200k_base"]
+    assert utils.get_encoding("o200k_base").cache_dir == str(tmp_path / "cli")
+    assert str(tmp_path / "cli") in capsys.readouterr().out
+
+
+def test_test_set_counts_prompt_content(loads, monkeypatch):
+    """Test that TestSet.count_tokens counts the prompt content of each test"""
+    monkeypatch.setenv("RHESIS_API_KEY", "test-key")
+    test_set = test_set_module.TestSet(
+        tests=[
+            {"prompt": {"content": "one two"}},
+            {"prompt": {"content": "one two three four"}},
+            {"prompt": {"content": None}},
+            {"content": "legacy format"},
+        ]
+    )
+    assert test_set.count_tokens() == {
+        "total": 8,
+        "average": 3,
+        "max": 4,
+        "min": 2,
+        "test_count": 3,
+    }